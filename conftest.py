@@ -188,3 +188,7 @@ def MultipleInheritedClassFixture():
 @pytest.fixture
 def DefaultTypedBufferClassFixture():
     return DefaultTypedBufferClass
+
+@pytest.fixture
+def DefaultValueClassFixture():
+    return DefaultValueClass
@@ -1,3 +1,9 @@
 from binary_structs.utils import *
 from binary_structs.binary_struct import binary_struct
+from binary_structs.binary_union import binary_union
 from binary_structs.endianness import big_endian, little_endian
+from binary_structs.schema import make_struct
+from binary_structs.dispatcher import Dispatcher
+from binary_structs.pool import BufferPool
+from binary_structs.record_file import RecordFile
+from binary_structs.index import build_index, RecordIndex
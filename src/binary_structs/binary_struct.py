@@ -11,20 +11,65 @@ class BufferWithSize:
     buf: [uint8_t, 64]
 """
 
-import sys
 import logging
 import inspect
+import builtins
+import itertools
+import weakref
+import struct
+from ctypes import Array
 from typing import List, Tuple
 
-from binary_structs.utils import BufferField, new_binary_buffer, new_typed_buffer
+from binary_structs.utils import BufferField, PrimitiveTypeField, BitField, VarIntField, new_binary_buffer, \
+                                 new_typed_buffer, get_bits_storage
+from binary_structs.utils.binary_field.bit_fields import MAX_BITS
+from binary_structs.parser import StructParser, DEFAULT_BUFFER_SIZE
+from binary_structs.pool import BufferPool, recv_struct
+from binary_structs.records import scan_records, sort_records, group_records
+from binary_structs.parallel import deserialize_many
 
 from collections import OrderedDict
 
 
 LINE = '-' * 100
 
+# Buffers that are at least this big are not copied by iter_buffers
+MIN_ZERO_COPY_SIZE = 512
 
-def _create_fn(name, local_params: List[str], lines: List[str], globals: dict):
+# The maximum amount of released instances that are kept for each class
+FREE_LIST_SIZE = 64
+
+# Shared registry of the names that generated code uses to reference types.
+# Types are held weakly, so dynamically built classes can still be collected,
+# and names come from a counter, so they never collide like id() based names can.
+_type_names = weakref.WeakKeyDictionary()
+_type_counter = itertools.count()
+
+
+class _Namespace(dict):
+    """
+    The globals of the generated functions of a single class.
+
+    Only the objects that are referenced by the generated code are bound,
+    instead of copying the globals of the module the class was declared in.
+    """
+
+    def __init__(self):
+        super().__init__(__builtins__=builtins)
+
+    def add(self, obj: object, name: str = None) -> str:
+        """
+        Bind obj in the namespace, and return the name it was bound to.
+        Types are bound using their name from the shared registry.
+        """
+
+        name = name or _get_global_name(obj)
+        self[name] = obj
+
+        return name
+
+
+def _create_fn(name, local_params: List[str], lines: List[str], globals: _Namespace):
     """
     This function receives a name for the function, and returns a
     function with the given locals and globals
@@ -43,54 +88,79 @@ def _create_fn(name, local_params: List[str], lines: List[str], globals: dict):
     return ns[name]
 
 
-def _get_global_name(obj: object) -> str:
+def _get_global_name(kind: type) -> str:
     """
-    Returns a name of the obj in the global dict.
-    This formatting is necessary to avoid collisions.
+    Returns the name of a type in the generated functions namespace.
+    The name is taken from the shared registry, and created on first use.
     """
 
-    # obj might be an instance, get type name if it is
-    obj_name = getattr(obj, '__name__', getattr(type(obj), '__name__'))
+    name = _type_names.get(kind)
+    if name is None:
+        name = f'__bs_{kind.__name__}_{next(_type_counter)}'
+        _type_names[kind] = name
 
-    return f'__{hex(id(obj))}_{obj_name}'
+    return name
 
 
-def _init_binary_field(self: type, field_name: str, field_type: type, field_value):
+def _build_binary_field(field_type: type, field_value):
     """
-    Helper function for initializing binary Fields in a BinaryStruct
-    Initialization process is described below
+    Helper function for building binary Fields in a BinaryStruct
+    Returns the value of the field, build process is described below
     """
 
     # Default value initialization
     if field_value is None:
-        object.__setattr__(self, field_name, field_type())
+        return field_type()
 
     # Check if the correct type was passed
     elif isinstance(field_value, field_type):
-        object.__setattr__(self, field_name, field_value)
+        return field_value
 
     # Check if type is compatible
     elif _is_binary_struct(type(field_value)) and _is_binary_struct(field_type) and \
         type(field_value).binary_fields == field_type.binary_fields:
-        object.__setattr__(self, field_name, field_value)
+        return field_value
 
     # Check for nested args initialization
     elif isinstance(field_value, list):
-        object.__setattr__(self, field_name, field_type(*field_value))
+        return field_type(*field_value)
 
     # Check for nested kwargs initialization
     elif isinstance(field_value, dict):
-        object.__setattr__(self, field_name, field_type(**field_value))
+        return field_type(**field_value)
 
     # Try to init with convertable value
+    return field_type(field_value)
+
+
+def _init_binary_field(self: type, field_name: str, field_type: type, field_value):
+    """
+    Helper function for initializing binary Fields in a BinaryStruct
+    """
+
+    object.__setattr__(self, field_name, _build_binary_field(field_type, field_value))
+
+
+def _write_through(field, new_value):
+    """
+    Write new_value into the memory of field, which is a view
+    """
+
+    if _is_binary_struct(type(field)):
+        for name, value in new_value:
+            setattr(field, name, value)
+
     else:
-        object.__setattr__(self, field_name, field_type(field_value))
+        memoryview(field).cast('B')[:] = memoryview(new_value).cast('B')
 
 
 def _set_binary_attr(self: type, field_name: str, field_value):
     """
     Asserts that the type that is passed is defined, and passes
     it into init var
+
+    Fields of views (see view) write the new value through to their memory,
+    other fields are replaced.
     """
 
     if not hasattr(self, field_name):
@@ -98,38 +168,46 @@ def _set_binary_attr(self: type, field_name: str, field_value):
         object.__setattr__(self, field_name, field_value)
         return
 
-    field = getattr(self, field_name)
+    # Bitfields are properties, that write to their storage unit
+    if field_name in type(self)._bs_bit_names:
+        object.__setattr__(self, field_name, field_value)
+        return
 
+    field = getattr(self, field_name)
     if isinstance(field, BufferField):
-        new_buf = new_binary_buffer(field.element_type, len(field))(*field_value)
-
-        object.__setattr__(self, field_name, new_buf)
+        field_value = new_binary_buffer(field.element_type, len(field)).from_python(field_value)
 
     else:
-        self._init_binary_field(field_name, type(field), field_value)
+        field_value = _build_binary_field(type(field), field_value)
+
+    if '_bs_view' in self.__dict__ and field_name in type(self)._bs_static_fields:
+        _write_through(field, field_value)
+        return
+
+    # The field gets new memory, so the struct is no longer contiguous in the memory it was deserialized from
+    self.__dict__['_bs_detached'] = True
+    object.__setattr__(self, field_name, field_value)
 
 
-def _init_var(name: str, field_type: type, globals: dict, default_value: type) -> List[str]:
+def _init_var(name: str, field_type: type, globals: _Namespace, default_value: type) -> List[str]:
     """
     Helper function for _create_init_fn that helps to init a variable.
     Returns the python code that is required to init that variable.
     """
 
     # Don't allow these type names
-    if name in ('size_in_bytes', 'FORMAT'):
+    if name in ('size_in_bytes', 'FORMAT', 'offsets'):
         raise AttributeError(f'Can\'t set attribute name to {name}')
 
     # Add types to the global dict
-    default_value_name = _get_global_name(default_value)
-    globals[default_value_name] = default_value
-    new_type_name = _get_global_name(field_type)
-    globals[new_type_name] = field_type
+    default_value_name = globals.add(default_value, f'__bs_{name}_default')
+    new_type_name = globals.add(field_type)
 
     # Generate function text for the given type
     if issubclass(field_type, BufferField):
         # Check if the correct type or a binary buffer was passed, to avoid overhead
         init_var =  [f'if not isinstance({name}, {new_type_name}) and not "BinaryBuffer" in getattr(type({name}), "__name__", ""):']
-        init_var += [f'    {name} = {new_type_name}(*{name} or {default_value_name} or [])']
+        init_var += [f'    {name} = {new_type_name}.from_python({name} or {default_value_name} or [])']
         init_var += [f'object.__setattr__(self, "{name}", {name})']
 
         # If a buffer with an undertermined size was passed, update the type helper
@@ -143,11 +221,56 @@ def _init_var(name: str, field_type: type, globals: dict, default_value: type) -
     return init_var
 
 
-def _create_init_fn(binary_attrs: dict, globals: dict, bases: Tuple[type]) -> str:
+def _get_field_names(binary_fields: dict, bit_fields: dict) -> List[str]:
+    """
+    Returns the names of the fields as they were declared,
+    storage units of bitfields are replaced by their bitfields
+    """
+
+    names = []
+    for name in binary_fields:
+        names.extend(bit_fields.get(name, [name]))
+
+    return names
+
+
+def _get_bits_value(bit_group: dict, value_fmt: str) -> str:
+    """
+    Returns an expression that packs the bitfields of a storage unit into a single integer.
+    value_fmt is formatted with the name and the default value of each bitfield
+    """
+
+    parts = []
+    for name, (shift, width, default) in bit_group.items():
+        value = value_fmt.format(name=name, default=default)
+        parts.append(f'(({value}) & {(1 << width) - 1}) << {shift}')
+
+    return ' | '.join(parts)
+
+
+def _create_bit_field_property(storage_name: str, name: str, shift: int, width: int,
+                               globals: _Namespace) -> property:
+    """
+    Create a property for a bitfield, with a getter and a setter that shift and mask its storage unit
+    """
+
+    mask = (1 << width) - 1
+    clear_mask = ~(mask << shift) & ((1 << MAX_BITS) - 1)
+
+    getter = _create_fn(name, ['self'], [f'return (self.{storage_name}.value >> {shift}) & {mask}'], globals)
+    setter = _create_fn(name, ['self', 'value'],
+                        [f'self.{storage_name} = (self.{storage_name}.value & {clear_mask}) | '
+                         f'((getattr(value, "value", value) & {mask}) << {shift})'], globals)
+
+    return property(getter, setter)
+
+
+def _create_init_fn(binary_attrs: dict, globals: _Namespace, bases: Tuple[type], bit_fields: dict) -> str:
     """
     Create init function and return it.
 
     Each parameter has a default value of underlying_type()
+    Bitfields are parameters too, they are packed into their storage unit
     """
 
     init_txt = []
@@ -177,6 +300,12 @@ def _create_init_fn(binary_attrs: dict, globals: dict, bases: Tuple[type]) -> st
 
     # Init variables
     for name, (kind, default_value) in binary_attrs.items():
+        if name in bit_fields:
+            bits_value = _get_bits_value(bit_fields[name], "getattr({name}, 'value', {name})")
+            init_txt.append(f'object.__setattr__(self, "{name}", {globals.add(kind)}({bits_value}))')
+            init_kwargs.extend(f'{bit_name} = {default}' for bit_name, (_, _, default) in bit_fields[name].items())
+            continue
+
         init_var_code = _init_var(name, kind, globals, default_value)
         init_txt.extend(init_var_code)
         init_kwargs.append(f'{name} = None')
@@ -184,30 +313,30 @@ def _create_init_fn(binary_attrs: dict, globals: dict, bases: Tuple[type]) -> st
     return _create_fn('_bs_init', init_args + init_kwargs, init_txt or ['pass'], globals)
 
 
-def _create_bytes_fn(attributes: dict, globals: dict, bases: Tuple[type]) -> str:
+def _create_bytes_fn(attributes: dict, globals: _Namespace, bases: Tuple[type]) -> str:
     """
     Create bytes function and return it.
-    The created function will call bytes() on every class member
+    The created function will call bytes() on every class member, and join them with a single copy
     """
 
-    lines = ['buf = b""']
+    parts = []
 
     for parent in bases:
         if not _is_parent_fn_callable(parent, '__bytes__'):
             continue
 
-        lines += [f'buf += {_get_global_name(parent)}.__bytes__(self)']
+        parts.append(f'{_get_global_name(parent)}.__bytes__(self)')
 
     # For class attributes
     for attr in attributes.keys():
-        lines += [f'buf += bytes(self.{attr})']
+        parts.append(f'bytes(self.{attr})')
 
-    lines += ['return buf']
+    lines = [f'return b"".join(({", ".join(parts)}{"," if parts else ""}))']
 
     return _create_fn('_bs_bytes', ['self'], lines, globals)
 
 
-def _create_equal_fn(binary_fields: dict, globals: dict, bases: Tuple[type]) -> str:
+def _create_equal_fn(binary_fields: dict, globals: _Namespace, bases: Tuple[type]) -> str:
     """
     Create and __eq__ function for a BinaryStruct and return it as a string.
     This function will compare all fields that were declared in the annotations.
@@ -233,7 +362,7 @@ def _create_equal_fn(binary_fields: dict, globals: dict, bases: Tuple[type]) ->
     return _create_fn('_bs_eq', ['self, other'], lines, globals)
 
 
-def _create_string_fn(binary_fields: dict, globals: dict, bases: Tuple[type]) -> str:
+def _create_string_fn(binary_fields: dict, globals: _Namespace, bases: Tuple[type], bit_fields: dict) -> str:
     """
     Create a function that converts the struct into a string, for visual purposes
     """
@@ -248,7 +377,7 @@ def _create_string_fn(binary_fields: dict, globals: dict, bases: Tuple[type]) ->
         lines += [f'string += {_get_global_name(parent)}.__str__(self)']
 
     # Add class variables
-    for attr in binary_fields:
+    for attr in _get_field_names(binary_fields, bit_fields):
         lines += [f'attr_str = "\\n    " + "\\n    ".'
                   f'join(line for line in str(self.{attr}).split("\\n"))']
         lines += [f'string  += f"{attr}: {{attr_str}}\\n"']
@@ -258,7 +387,7 @@ def _create_string_fn(binary_fields: dict, globals: dict, bases: Tuple[type]) ->
     return _create_fn('_bs_str', ['self'], lines, globals)
 
 
-def _create_iter_fn(binary_fields: dict, globals: dict, bases: Tuple[type]):
+def _create_iter_fn(binary_fields: dict, globals: _Namespace, bases: Tuple[type], bit_fields: dict):
     """
     Creates the __iter__ function to allow dict conversion
     """
@@ -272,42 +401,141 @@ def _create_iter_fn(binary_fields: dict, globals: dict, bases: Tuple[type]):
         lines.append(f'for attr, value in {_get_global_name(parent)}.__iter__(self):')
         lines.append('    yield attr, value')
 
-    for name in binary_fields:
+    for name in _get_field_names(binary_fields, bit_fields):
         lines.append(f'yield "{name}", self.{name}')
 
     return _create_fn('_bs_iter', ['self'], lines or ['pass'], globals)
 
 
-def _create_deserialize_fn(binary_fields: dict, globals: dict, cls: type) -> str:
+def _create_deserialize_fn(binary_fields: dict, globals: _Namespace, bases: Tuple[type],
+                           record_size: int = None) -> classmethod:
     """
     Create a deserialize function for binary struct from a buffer
     The function will first deserialize parent classes, then the class attributes
+
+    The buffer is walked by offset, and each field is a view over the buffer's memory,
+    so nothing is copied. Only the record is copied from read-only memory, the rest of
+    the memory is copied too if the struct is dynamic (record_size is None).
     """
 
-    lines = ['init_dict = {}']
+    lines = [
+        'if not isinstance(buf, bytearray) and memoryview(buf).readonly:',
+        f'    buf = bytearray(memoryview(buf).cast("B")[offset:{f"offset + {record_size}" if record_size else ""}])',
+        '    offset = 0',
+        'new_instance = cls.__new__(cls)',
+        'instance_dict = new_instance.__dict__',
+        'start = offset'
+    ]
 
     # For this class bases
-    for parent in cls.__bases__:
+    for parent in bases:
         if not _is_parent_fn_callable(parent, 'deserialize'):
             continue
 
-        lines.append(f'init_dict.update(dict({_get_global_name(parent)}.deserialize(buf)))')
-        lines.append(f'buf = buf[{_get_global_name(parent)}.static_size:]')
+        parent_name = _get_global_name(parent)
+        lines.append(f'parent = {parent_name}.deserialize(buf, offset)')
+        lines.append(f'instance_dict.update(parent.__dict__)')
+
+        if _is_dynamic(parent):
+            lines.append(f'offset += {parent_name}._bs_size(parent)')
+
+        else:
+            lines.append(f'offset += {parent.static_size}')
 
     # For this class attributes
-    for name in binary_fields:
-        lines.append(f'init_dict["{name}"] = {_get_global_name(cls)}.{name}_type.deserialize(buf)')
+    for name, kind in binary_fields.items():
+        # Buffers with a count field get their size from the already deserialized field
+        count_field = getattr(kind, 'count_field', None)
+        count = f', instance_dict["{count_field}"].value' if count_field else ''
+
+        lines.append(f'instance_dict["{name}"] = value = {globals.add(kind)}.deserialize(buf, offset{count})')
+
+        # If a buffer with an undertermined size was deserialized, update the type helper
+        if 'TypedBuffer' in kind.__name__:
+            lines.append(f'instance_dict["{name}_type"] = type(value)')
+
+        if not _is_dynamic(kind):
+            lines.append(f'offset += {kind.static_size}')
 
-        lines.append(f'buf = buf[{_get_global_name(cls)}.{name}_type.static_size:]')
+        elif hasattr(kind, 'binary_fields'):
+            lines.append(f'offset += value._bs_size()')
+
+        else:
+            lines.append(f'offset += value.size_in_bytes')
+
+    # Remember the memory that the struct was deserialized from
+    lines.append('instance_dict["_bs_origin"] = (buf, start)')
 
-    lines.append(f'new_instance = {_get_global_name(cls)}.__new__({_get_global_name(cls)})')
-    lines.append(f'{_get_global_name(cls)}._bs_init(new_instance, **init_dict)')
     lines.append(f'return new_instance')
 
-    return _create_fn('deserialize', ['buf'], lines or ['pass'], globals)
+    # The class is passed as cls, so it is not referenced by the namespace
+    deserialize_fn = classmethod(_create_fn('deserialize', ['cls', 'buf', 'offset = 0'], lines, globals))
+    setattr(deserialize_fn, 'bs_generated_func', True)
+
+    return deserialize_fn
 
 
-def _create_size_fn(binary_fields: dict, globals: dict, bases: Tuple[type]) -> str:
+def _create_to_python_fn(binary_fields: dict, globals: _Namespace, bit_fields: dict) -> str:
+    """
+    Create a function that converts the struct into plain python objects in one pass.
+    Fields of parent classes are flattened into the same dict, just like __iter__ does
+    """
+
+    items = []
+
+    for name, kind in binary_fields.items():
+        if name in bit_fields:
+            for bit_name, (shift, width, _) in bit_fields[name].items():
+                items.append(f'"{bit_name}": (self.{name}.value >> {shift}) & {(1 << width) - 1}')
+
+        elif issubclass(kind, PrimitiveTypeField):
+            items.append(f'"{name}": self.{name}.value')
+
+        else:
+            items.append(f'"{name}": self.{name}.to_python()')
+
+    return _create_fn('to_python', ['self'], [f'return {{{", ".join(items)}}}'], globals)
+
+
+def _create_from_python_fn(binary_fields: dict, globals: _Namespace, bit_fields: dict) -> classmethod:
+    """
+    Create a function that builds the struct from plain python objects,
+    as returned by to_python. Missing fields get their default values.
+    """
+
+    keys_name = globals.add(frozenset(_get_field_names(binary_fields, bit_fields)), '__bs_from_python_keys')
+
+    lines = [
+        'new_instance = cls.__new__(cls)',
+
+        # Only init default values if some fields are missing
+        f'if not {keys_name} <= data.keys():',
+        '    cls._bs_init(new_instance)'
+    ]
+
+    for name, kind in binary_fields.items():
+        if name in bit_fields:
+            bits_value = _get_bits_value(bit_fields[name], "data.get('{name}', {default})")
+            lines.append(f'object.__setattr__(new_instance, "{name}", {globals.add(kind)}({bits_value}))')
+            continue
+
+        lines.append(f'if "{name}" in data:')
+        lines.append(f'    value = cls.{name}_type.from_python(data["{name}"])')
+        lines.append(f'    object.__setattr__(new_instance, "{name}", value)')
+
+        # Buffers with an undetermined size need to update the type helper
+        if 'TypedBuffer' in kind.__name__:
+            lines.append(f'    object.__setattr__(new_instance, "{name}_type", type(value))')
+
+    lines.append('return new_instance')
+
+    from_python_fn = classmethod(_create_fn('from_python', ['cls', 'data'], lines, globals))
+    setattr(from_python_fn, 'bs_generated_func', True)
+
+    return from_python_fn
+
+
+def _create_size_fn(binary_fields: dict, globals: _Namespace, bases: Tuple[type]) -> str:
     """
     Generates the size property and returns the function as a string
     Created function will search the size_in_bytes attribute of every derived class
@@ -339,24 +567,33 @@ def _is_binary_struct(cls: type):
     return hasattr(cls, f'_{cls.__name__}__is_binary_struct')
 
 
+def _is_dynamic(kind: type) -> bool:
+    """
+    Returns if the size of the given field type is only known after it is deserialized
+    """
+
+    return getattr(kind, 'is_dynamic', False)
+
+
 def _is_parent_fn_callable(parent: type, fn_name: str):
     fn = getattr(parent, fn_name, None)
 
     return inspect.isfunction(fn) or inspect.ismethod(fn)
 
 
-def _get_binary_fields_recursively(cls: type) -> OrderedDict:
+def _get_binary_fields_recursively(cls: type, attribute: str = 'binary_fields') -> OrderedDict:
     """
-    Returns an OrderedDict of all the binary fields in the class hierarchy
+    Returns an OrderedDict of all the binary fields in the class hierarchy.
+    Other field dicts of the hierarchy (e.g. bit_fields) can be collected using attribute
     """
 
     binary_fields = OrderedDict()
     for parent in cls.__bases__:
         if _is_binary_struct(parent):
-            binary_fields.update(_get_binary_fields_recursively(parent))
+            binary_fields.update(_get_binary_fields_recursively(parent, attribute))
 
     if _is_binary_struct(cls):
-        binary_fields.update(cls.binary_fields)
+        binary_fields.update(getattr(cls, attribute))
 
     return binary_fields
 
@@ -377,6 +614,52 @@ def _set_nested_classes_as_attributes(cls: type):
         setattr(cls, f'{attr_name}_type', attr_type)
 
 
+def _group_bit_fields(cls: type, annotations: dict) -> Tuple[OrderedDict, OrderedDict]:
+    """
+    Group consecutive bitfields into storage units.
+
+    Returns the annotations, with each group of bitfields replaced by its storage unit, and an OrderedDict
+    with the name of each storage unit as key, and an OrderedDict of its bitfields as value.
+    Each bitfield has a tuple of (shift, width, default_value)
+    """
+
+    # Default values are replaced by the bitfield properties, classes that are rebuilt keep them aside
+    previous_defaults = {name: bit_field[2] for bit_group in cls.__dict__.get('bit_fields', {}).values()
+                         for name, bit_field in bit_group.items()}
+
+    new_annotations = OrderedDict()
+    bit_fields = OrderedDict()
+    bit_group = None
+    group_width = 0
+
+    for name, annotation in annotations.items():
+        if not (isinstance(annotation, type) and issubclass(annotation, BitField)):
+            new_annotations[name] = annotation
+            bit_group = None
+            continue
+
+        # Start a new storage unit if the bitfield doesn't fit in the current one
+        if bit_group is None or group_width + annotation.bits > MAX_BITS or annotation.endianness != group_endianness:
+            storage_name = f'_{name}_bits'
+            bit_group = bit_fields[storage_name] = OrderedDict()
+            group_width = 0
+            group_endianness = annotation.endianness
+
+        default = cls.__dict__.get(name, previous_defaults.get(name, 0))
+        if isinstance(default, property):
+            default = previous_defaults.get(name, 0)
+
+        default = getattr(default, 'value', default)
+        if not isinstance(default, int):
+            raise TypeError(f'Default value of bitfield {name} must be an integer')
+
+        bit_group[name] = (group_width, annotation.bits, default)
+        group_width += annotation.bits
+        new_annotations[storage_name] = get_bits_storage(group_width, group_endianness)
+
+    return new_annotations, bit_fields
+
+
 def _parse_and_verify_annotations(annotations: dict) -> OrderedDict:
     """
     Create an OrderedDict from the annotations,
@@ -391,6 +674,9 @@ def _parse_and_verify_annotations(annotations: dict) -> OrderedDict:
             if len(annotation) == 1:
                 field = new_typed_buffer(annotation[0])
 
+            elif len(annotation) == 2 and isinstance(annotation[1], str):
+                field = new_typed_buffer(*annotation)
+
             elif len(annotation) == 2:
                 field = new_binary_buffer(*annotation)
 
@@ -406,6 +692,24 @@ def _parse_and_verify_annotations(annotations: dict) -> OrderedDict:
     return ordered_dict
 
 
+def _verify_count_fields(cls: type):
+    """
+    Makes sure that buffers with a count field reference a preceding
+    primitive field of the class hierarchy
+    """
+
+    preceding_fields = {}
+
+    for name, kind in _get_binary_fields_recursively(cls).items():
+        count_field = getattr(kind, 'count_field', None)
+
+        if count_field is not None and \
+            not issubclass(preceding_fields.get(count_field, type), (PrimitiveTypeField, VarIntField)):
+            raise TypeError(f'Count field {count_field} of {name} must be a preceding integer field!')
+
+        preceding_fields[name] = kind
+
+
 def _calc_static_size(cls: type) -> int:
     """
     Returns the static size of the class.
@@ -416,6 +720,312 @@ def _calc_static_size(cls: type) -> int:
                _get_binary_fields_recursively(cls).values())
 
 
+def _calc_offsets(cls: type) -> OrderedDict:
+    """
+    Returns an OrderedDict of the static offsets of the class fields, by their dotted path.
+    Fields of nested structs are included (e.g. 'hdr.seq'), fields after a dynamic field are not
+    """
+
+    offsets = OrderedDict()
+    offset = 0
+    for name, kind in _get_binary_fields_recursively(cls).items():
+        offsets[name] = (offset, kind)
+        for nested_name, (nested_offset, nested_kind) in getattr(kind, 'offsets', {}).items():
+            offsets[f'{name}.{nested_name}'] = (offset + nested_offset, nested_kind)
+
+        if _is_dynamic(kind):
+            break
+
+        offset += kind.static_size
+
+    return offsets
+
+
+def _create_field_codecs(offsets: OrderedDict) -> dict:
+    """
+    Precompile the struct formats of the fields that have one, they are used by peek and poke.
+    Each codec is a tuple of (struct.Struct, is_single_value)
+    """
+
+    codecs = {}
+    for path, (_, kind) in offsets.items():
+        if hasattr(kind, 'FORMAT'):
+            is_single_value = issubclass(kind, PrimitiveTypeField) or kind.FORMAT.endswith('s')
+            codecs[path] = (struct.Struct(kind.FORMAT), is_single_value)
+
+    return codecs
+
+
+def _get_offset(cls: type, path: str) -> Tuple[int, type]:
+    try:
+        return cls.offsets[path]
+
+    except KeyError:
+        raise KeyError(f'{cls.__name__} has no field with a static offset named {path}') from None
+
+
+def _peek(cls: type, buf, path: str):
+    """
+    Read a single field from a buffer without building an instance.
+    Primitive fields and buffers of primitives are returned as python objects
+    """
+
+    offset, kind = _get_offset(cls, path)
+    codec = cls._bs_codecs.get(path)
+    if codec is None:
+        return kind.deserialize(buf, offset)
+
+    packer, is_single_value = codec
+    values = packer.unpack_from(buf, offset)
+    return values[0] if is_single_value else list(values)
+
+
+def _poke(cls: type, buf, path: str, value):
+    """
+    Write a single field into a writable buffer without building an instance
+    """
+
+    offset, kind = _get_offset(cls, path)
+    codec = cls._bs_codecs.get(path)
+    if codec is not None and issubclass(kind, PrimitiveTypeField):
+        codec[0].pack_into(buf, offset, getattr(value, 'value', value))
+        return
+
+    if issubclass(kind, BufferField):
+        memory = bytes(kind.from_python(value))
+
+    else:
+        memory = bytes(_build_binary_field(kind, value))
+
+    memoryview(buf).cast('B')[offset:offset + len(memory)] = memory
+
+
+def _has_custom_bytes(cls: type) -> bool:
+    """
+    Returns if the struct or one of its parents has a custom implementation of __bytes__
+    """
+
+    return any('__bytes__' in klass.__dict__ and klass.__dict__['__bytes__'] is not klass.__dict__.get('_bs_bytes')
+               for klass in cls.__mro__ if _is_binary_struct(klass))
+
+
+def _iter_field_buffers(instance):
+    """
+    Yields the serialized parts of a struct.
+    Big buffers are yielded as memoryviews of their memory, other fields are serialized
+    """
+
+    # Custom implementations of bytes are respected, nested structs are checked when they are reached
+    if _has_custom_bytes(type(instance)):
+        yield bytes(instance)
+        return
+
+    for name in _get_binary_fields_recursively(type(instance)):
+        field = getattr(instance, name)
+
+        if _is_binary_struct(type(field)):
+            yield from _iter_field_buffers(field)
+
+        elif isinstance(field, Array) and field.size_in_bytes >= MIN_ZERO_COPY_SIZE:
+            yield memoryview(field).cast('B')
+
+        elif isinstance(field, list):
+            for element in field:
+                yield from _iter_field_buffers(element) if _is_binary_struct(type(element)) else [bytes(element)]
+
+        else:
+            yield bytes(field)
+
+
+def _iter_buffers(self):
+    """
+    Yields memoryviews that make up the serialized struct, for scatter-gather IO (e.g. socket.sendmsg).
+    Big buffers are not copied, the small fields between them are joined into a single buffer
+    """
+
+    small_parts = []
+    for part in _iter_field_buffers(self):
+        if isinstance(part, memoryview):
+            if small_parts:
+                yield memoryview(b''.join(small_parts))
+                small_parts = []
+
+            yield part
+
+        else:
+            small_parts.append(part)
+
+    if small_parts:
+        yield memoryview(b''.join(small_parts))
+
+
+def _is_contiguous(instance) -> bool:
+    """
+    Returns if the fields of a struct are views over the memory it was deserialized from.
+    They are not once one of them was replaced by an assignment, including fields of nested structs
+    """
+
+    instance_dict = instance.__dict__
+    return '_bs_origin' in instance_dict and '_bs_detached' not in instance_dict and \
+        all(_is_contiguous(getattr(instance, name)) for name in type(instance)._bs_struct_fields)
+
+
+def _as_memoryview(self) -> memoryview:
+    """
+    Returns a memoryview of the serialized struct.
+
+    Structs with a static size that were deserialized are exposed without copying the memory they were
+    deserialized from, as long as none of their fields were replaced. Other structs are serialized,
+    they are not modified just to be exposed.
+    """
+
+    cls = type(self)
+    if _has_custom_bytes(cls):
+        return memoryview(bytes(self))
+
+    if cls.is_dynamic or not _is_contiguous(self):
+        return memoryview(cls._bs_bytes(self))
+
+    buf, offset = self.__dict__['_bs_origin']
+    return memoryview(buf).cast('B')[offset:offset + cls.static_size]
+
+
+def _buffer(self, flags: int) -> memoryview:
+    """
+    Buffer protocol support, on python 3.12+ structs can be used wherever a bytes-like object is expected
+    """
+
+    return self.as_memoryview()
+
+
+def _mark_view(instance):
+    """
+    Mark a struct and its nested structs as views, so assigning to their fields writes to their memory
+    """
+
+    instance.__dict__['_bs_view'] = True
+    for name in type(instance)._bs_struct_fields:
+        _mark_view(getattr(instance, name))
+
+
+def _view(cls: type, buf, offset: int = 0):
+    """
+    Deserialize a struct that is a view over a writable buffer, assigning to its fields writes to the buffer.
+    Unlike deserialize, read-only buffers are not copied, and fields are not replaced when they are assigned to
+    """
+
+    if memoryview(buf).readonly:
+        raise TypeError(f'Views of {cls.__name__} need a writable buffer, got a read-only {type(buf).__name__}')
+
+    instance = cls.deserialize(buf, offset)
+    _mark_view(instance)
+
+    return instance
+
+
+def _detach(instance) -> memoryview:
+    """
+    Move the fields of an instance into new memory that it owns, its fields become views over that memory.
+    Returns a memoryview of the new memory
+    """
+
+    cls = type(instance)
+    memory = bytearray(cls._bs_bytes(instance))
+
+    instance_dict = instance.__dict__
+    instance_dict.pop('_bs_detached', None)
+    instance_dict.update(cls.view(memory).__dict__)
+    instance_dict['_bs_memory'] = memoryview(memory)
+
+    return instance_dict['_bs_memory']
+
+
+def _deserialize_into(cls: type, instance, buf, offset: int = 0):
+    """
+    Deserialize into an existing instance, by copying the data into its memory.
+    No new fields are created, so the instance can be reused for many records.
+
+    The first time, the instance is moved into memory of its own, so memory it was deserialized from
+    (or that was released to a pool) is never overwritten
+    """
+
+    if cls.is_dynamic:
+        raise TypeError(f'{cls.__name__} has a dynamic size, it can\'t be deserialized in place')
+
+    memory = instance.__dict__.get('_bs_memory')
+    if memory is None:
+        memory = _detach(instance)
+
+    memory[:] = memoryview(buf).cast('B')[offset:offset + cls.static_size]
+
+    return instance
+
+
+def _acquire(cls: type):
+    """
+    Returns a released instance of the class, or a new one if there is none
+    """
+
+    free_list = cls._bs_free_list
+    return free_list.pop() if free_list else cls()
+
+
+def _release(cls: type, instance):
+    """
+    Keep the instance in the class free list, to be returned by acquire
+    """
+
+    if type(instance) is not cls:
+        raise TypeError(f'Cannot release an instance of {type(instance).__name__} to {cls.__name__}')
+
+    if len(cls._bs_free_list) < FREE_LIST_SIZE:
+        cls._bs_free_list.append(instance)
+
+
+def _restore_struct(cls: type, data: bytes):
+    """
+    Unpickle a struct from its serialized bytes
+    """
+
+    return cls.deserialize(bytearray(data))
+
+
+def _reduce(self) -> tuple:
+    """
+    Structs are pickled as a reference to their class and their serialized bytes.
+    The generated serializer is used, since it has the layout that deserialize reads (unlike a custom __bytes__).
+
+    Instance attributes that are not fields are the state, so they are kept by pickle, copy and deepcopy
+    """
+
+    cls = type(self)
+    serialize = getattr(cls, '_bs_bytes', bytes)
+
+    state = None
+    field_names = getattr(cls, '_bs_field_names', None)
+    if field_names is not None:
+        state = {name: value for name, value in self.__dict__.items()
+                 if name not in field_names and not name.startswith('_bs_')} or None
+
+    return _restore_struct, (cls, serialize(self)), state
+
+
+def _recv(cls: type, sock, pool: BufferPool = None):
+    """
+    Receive an instance of the class from a socket, into a buffer from the pool
+    """
+
+    return recv_struct(cls, sock, pool)
+
+
+def _create_parser(cls: type, buffer_size: int = DEFAULT_BUFFER_SIZE) -> StructParser:
+    """
+    Returns an incremental parser, that parses instances of the class from fragments of data
+    """
+
+    return StructParser(cls, buffer_size)
+
+
 def _process_class(cls):
     """
     This function is the main logic unit, it parses the different parameters and
@@ -429,25 +1039,24 @@ def _process_class(cls):
     new_cls_dict = {key: value for key, value in cls.__dict__.items() if key not in ['__dict__', '__weakref__']}
     cls = type(cls.__name__, cls.__bases__, new_cls_dict)
 
-    # Get a copy of the globals from the scope of the defined class
-    globals = sys.modules[cls.__module__].__dict__.copy()
+    # The generated functions get their own compact namespace
+    globals = _Namespace()
 
-    annotations = cls.__dict__.get('__annotations__', {})
+    annotations, bit_fields = _group_bit_fields(cls, cls.__dict__.get('__annotations__', {}))
     binary_fields = _parse_and_verify_annotations(annotations)
     logging.debug(f'Found fields: {binary_fields}')
 
-    # Add the class to the globals
-    globals[_get_global_name(cls)] = cls
-
     # Add bases to global namepsace, they will be referenced
     # in the generated functions
     for parent in cls.__bases__:
-        globals[_get_global_name(parent)] = parent
+        globals.add(parent)
 
     # Mark the class as a binary_struct, add the binary_fields
     setattr(cls, '_is_binary_field', None)
     setattr(cls, f'_{cls.__name__}__is_binary_struct', None)
     setattr(cls, 'binary_fields', binary_fields)
+    setattr(cls, 'bit_fields', bit_fields)
+    _verify_count_fields(cls)
 
     # These will be used for creating the new class
     # They are the same as annotations, but they contain the default value too
@@ -459,10 +1068,10 @@ def _process_class(cls):
     # Generate functions
     generated_dunders = {
         'eq':       _create_equal_fn(binary_fields, globals, cls.__bases__),
-        'str':      _create_string_fn(binary_fields, globals, cls.__bases__),
+        'str':      _create_string_fn(binary_fields, globals, cls.__bases__, bit_fields),
         'bytes':    _create_bytes_fn(binary_fields, globals, cls.__bases__),
-        'iter':     _create_iter_fn(binary_fields, globals, cls.__bases__),
-        'init':     _create_init_fn(binary_attrs, globals, cls.__bases__)
+        'iter':     _create_iter_fn(binary_fields, globals, cls.__bases__, bit_fields),
+        'init':     _create_init_fn(binary_attrs, globals, cls.__bases__, bit_fields)
     }
 
     # Add the generated functions
@@ -477,19 +1086,66 @@ def _process_class(cls):
 
     # Add other attributes, these are non-overriding
     size_fn = _create_size_fn(binary_fields, globals, cls.__bases__)
+    full_binary_fields = _get_binary_fields_recursively(cls)
+    full_bit_fields = _get_binary_fields_recursively(cls, 'bit_fields')
+    static_size = _calc_static_size(cls)
+    is_dynamic = any(_is_dynamic(kind) for kind in full_binary_fields.values())
     other_attrs = {
-        'deserialize':          _create_deserialize_fn(binary_fields, globals, cls),
+        'deserialize':          _create_deserialize_fn(binary_fields, globals, cls.__bases__,
+                                                       None if is_dynamic else static_size),
         '__setattr__':          _set_binary_attr,
         '_init_binary_field':   _init_binary_field,
         '_bs_size':             size_fn,
         'size_in_bytes':        property(size_fn),
-        'static_size':          _calc_static_size(cls)
+        'static_size':          static_size,
+        'is_dynamic':           is_dynamic,
+        'to_python':            _create_to_python_fn(full_binary_fields, globals, full_bit_fields),
+        'from_python':          _create_from_python_fn(full_binary_fields, globals, full_bit_fields),
+        'peek':                 classmethod(_peek),
+        'poke':                 classmethod(_poke),
+        'parser':               classmethod(_create_parser),
+        'iter_buffers':         _iter_buffers,
+        'as_memoryview':        _as_memoryview,
+        '__buffer__':           _buffer,
+        'recv':                 classmethod(_recv),
+        'scan':                 classmethod(scan_records),
+        'sort_records':         classmethod(sort_records),
+        'group_records':        classmethod(group_records),
+        'deserialize_many':     classmethod(deserialize_many),
+        '__reduce__':           _reduce,
+        'view':                 classmethod(_view),
+        'deserialize_into':     classmethod(_deserialize_into),
+        'acquire':              classmethod(_acquire),
+        'release':              classmethod(_release)
     }
 
     for name, attr in other_attrs.items():
         if name not in cls.__dict__:
             setattr(cls, name, attr)
 
+    # Bitfields are accessed using properties, they are always recreated
+    for storage_name, bit_group in bit_fields.items():
+        for name, (shift, width, _) in bit_group.items():
+            setattr(cls, name, _create_bit_field_property(storage_name, name, shift, width, globals))
+
+    # Offsets depend on the field types, so they are always recalculated
+    offsets = _calc_offsets(cls)
+    setattr(cls, 'offsets', offsets)
+    setattr(cls, '_bs_codecs', _create_field_codecs(offsets))
+
+    # Names of the attributes that deserialize sets, the bitfields, fields that are written through in views,
+    # and nested structs that are views too
+    setattr(cls, '_bs_field_names', frozenset(itertools.chain(full_binary_fields,
+                                                              (f'{name}_type' for name in full_binary_fields))))
+    setattr(cls, '_bs_bit_names', frozenset(name for bit_group in full_bit_fields.values() for name in bit_group))
+    setattr(cls, '_bs_static_fields', frozenset(name for name, kind in full_binary_fields.items()
+                                                if not _is_dynamic(kind)))
+    setattr(cls, '_bs_struct_fields', tuple(name for name, kind in full_binary_fields.items()
+                                            if _is_binary_struct(kind)))
+
+    # Each class has its own free list of released instances
+    setattr(cls, '_bs_free_list', [])
+
     _set_nested_classes_as_attributes(cls)
 
     return cls
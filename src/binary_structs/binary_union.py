@@ -0,0 +1,246 @@
+"""
+This file has the code for the binary_union decorator.
+
+Binary union is a c-like union, all of its members share the same memory.
+The union is a block of memory with the size of its biggest member, and each member is
+a view over that block, that is created when the member is first accessed.
+
+Basic API:
+@binary_union
+class Payload:
+    raw: [uint8_t, 8]
+    words: [uint32_t, 2]
+    header: Header
+"""
+
+from ctypes import Array, c_uint8
+
+from binary_structs.utils import BufferField, PrimitiveTypeField
+from binary_structs.binary_struct import _parse_and_verify_annotations, _build_binary_field, _is_dynamic, \
+                                         _is_binary_struct, _create_field_codecs, _peek, _poke, _reduce
+
+from collections import OrderedDict
+
+
+def _init_union(self, *args, **kwargs):
+    """
+    Init the union from a single member.
+    A positional value inits the first member, without a value the default value is used
+    """
+
+    if len(args) + len(kwargs) > 1:
+        raise TypeError(f'{type(self).__name__} can only be initialized from a single member')
+
+    if args:
+        kwargs = {next(iter(self.binary_fields)): args[0]}
+
+    for name, value in (kwargs or self._bs_defaults).items():
+        if name not in self.binary_fields:
+            raise TypeError(f'{type(self).__name__} has no member named {name}')
+
+        setattr(self, name, value)
+
+
+def _get_union_member(self, name: str):
+    """
+    Create the view of a member on its first access,
+    the view is cached in the instance dict, so later accesses don't get here
+    """
+
+    kind = type(self).binary_fields.get(name)
+    if kind is None:
+        raise AttributeError(f'\'{type(self).__name__}\' object has no attribute \'{name}\'')
+
+    # Members that are structs are views, so assigning to their fields writes to the union
+    member = kind.view(self, 0) if _is_binary_struct(kind) else kind.deserialize(self, 0)
+    self.__dict__[name] = member
+
+    return member
+
+
+def _set_union_member(self, name: str, value):
+    """
+    Write the value of a member into the union memory.
+    Other attributes are set normally
+    """
+
+    kind = type(self).binary_fields.get(name)
+    if kind is None:
+        object.__setattr__(self, name, value)
+        return
+
+    if issubclass(kind, BufferField):
+        value = kind.from_python(value)
+
+    else:
+        value = _build_binary_field(kind, value)
+
+    memory = bytes(value)
+    memoryview(self).cast('B')[:len(memory)] = memory
+
+
+def _union_eq(self, other) -> bool:
+    if getattr(other, 'binary_fields', None) != self.binary_fields:
+        return False
+
+    return bytes(self) == bytes(other)
+
+
+def _union_str(self) -> str:
+    string = ''
+    for name, member in self:
+        member_str = '\n    ' + '\n    '.join(str(member).split('\n'))
+        string += f'{name}: {member_str}\n'
+
+    return string
+
+
+def _union_iter(self):
+    for name in self.binary_fields:
+        yield name, getattr(self, name)
+
+
+def _union_to_python(self) -> dict:
+    """
+    Converts every member of the union into plain python objects
+    """
+
+    return {name: member.value if isinstance(member, PrimitiveTypeField) else member.to_python()
+            for name, member in self}
+
+
+def _union_from_python(cls, data: dict):
+    """
+    Build the union from plain python objects, members are written in declaration order
+    """
+
+    new_instance = cls()
+    for name in cls.binary_fields:
+        if name in data:
+            setattr(new_instance, name, getattr(cls, f'{name}_type').from_python(data[name]))
+
+    return new_instance
+
+
+def _union_deserialize(cls, buf, offset: int = 0):
+    """
+    Returns a union that is a view over the buffer, read-only memory is copied
+    """
+
+    if memoryview(buf).readonly:
+        return cls.from_buffer_copy(buf, offset)
+
+    return cls.from_buffer(buf, offset)
+
+
+def _union_size(self) -> int:
+    return self.static_size
+
+
+def _is_binary_union(cls: type) -> bool:
+    """
+    Returns if the given class is a binary union
+    """
+
+    return hasattr(cls, f'_{cls.__name__}__is_binary_union')
+
+
+def _calc_union_offsets(binary_fields: OrderedDict) -> OrderedDict:
+    """
+    Returns the offsets of the union members, all of them start at the beginning of the union.
+    Fields of nested structs are included, just like in binary structs
+    """
+
+    offsets = OrderedDict()
+    for name, kind in binary_fields.items():
+        offsets[name] = (0, kind)
+        for nested_name, nested_offset in getattr(kind, 'offsets', {}).items():
+            offsets[f'{name}.{nested_name}'] = nested_offset
+
+    return offsets
+
+
+def _process_union(cls):
+    """
+    Build the union class from the annotations of the given class.
+    The new class is a ctypes array of bytes, sized as the biggest member
+    """
+
+    annotations = cls.__dict__.get('__annotations__', {})
+    binary_fields = _parse_and_verify_annotations(annotations)
+
+    if not binary_fields:
+        raise TypeError(f'Binary union {cls.__name__} has no members')
+
+    for name, kind in binary_fields.items():
+        if name in ('size_in_bytes', 'FORMAT', 'offsets', 'static_size', 'binary_fields'):
+            raise AttributeError(f'Can\'t set member name to {name}')
+
+        if _is_dynamic(kind):
+            raise TypeError(f'Union member {name} must have a static size')
+
+    # Default values would hide the members, they are kept aside
+    defaults = dict(cls.__dict__.get('_bs_defaults', {}))
+    defaults.update({name: cls.__dict__[name] for name in binary_fields if name in cls.__dict__})
+    if len(defaults) > 1:
+        raise TypeError(f'Only a single member of {cls.__name__} can have a default value')
+
+    size = max(kind.static_size for kind in binary_fields.values())
+    new_cls_dict = {key: value for key, value in cls.__dict__.items()
+                    if key not in ['__dict__', '__weakref__'] and key not in binary_fields}
+    bases = tuple(base for base in cls.__bases__ if base is not object and not issubclass(base, Array))
+    cls = type(cls.__name__, bases + (c_uint8 * size,), new_cls_dict)
+
+    # Mark the class as a binary_union, add the binary_fields
+    setattr(cls, '_is_binary_field', None)
+    setattr(cls, f'_{cls.__name__}__is_binary_union', None)
+    setattr(cls, 'binary_fields', binary_fields)
+    setattr(cls, 'static_size', size)
+    setattr(cls, '_bs_defaults', defaults)
+
+    offsets = _calc_union_offsets(binary_fields)
+    setattr(cls, 'offsets', offsets)
+    setattr(cls, '_bs_codecs', _create_field_codecs(offsets))
+
+    for name, kind in binary_fields.items():
+        setattr(cls, f'{name}_type', kind)
+
+    # Add other attributes, these are non-overriding
+    other_attrs = {
+        '__init__':         _init_union,
+        '__getattr__':      _get_union_member,
+        '__setattr__':      _set_union_member,
+        '__eq__':           _union_eq,
+        '__str__':          _union_str,
+        '__iter__':         _union_iter,
+        'deserialize':      classmethod(_union_deserialize),
+        '_bs_size':         _union_size,
+        'size_in_bytes':    property(_union_size),
+        'is_dynamic':       False,
+        'to_python':        _union_to_python,
+        'from_python':      classmethod(_union_from_python),
+        'peek':             classmethod(_peek),
+        'poke':             classmethod(_poke),
+        '__reduce__':       _reduce
+    }
+
+    for name, attr in other_attrs.items():
+        if name not in cls.__dict__:
+            setattr(cls, name, attr)
+
+    return cls
+
+
+def binary_union(cls: type = None):
+    """
+    Return a union class built from the annotations of the class that was passed,
+    all of its members share the same memory
+    """
+
+    def wrap(cls):
+        return _process_union(cls)
+
+    if cls is None:
+        return wrap
+
+    return wrap(cls)
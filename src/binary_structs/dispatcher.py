@@ -0,0 +1,89 @@
+"""
+This file exports Dispatcher, that demultiplexes a buffer of messages by a discriminator
+field in their header.
+
+Each message is a header struct that is followed by a body struct, the body type is chosen
+by the value of the header's key field.
+
+Basic API:
+dispatcher = Dispatcher(header=Header, key='opcode')
+dispatcher.register(1, Login)
+dispatcher.register(2, Logout)
+
+for header, body in dispatcher.iter_messages(buf):
+    ...
+"""
+
+import struct
+
+from typing import Iterator, Tuple
+
+from binary_structs.utils import PrimitiveTypeField
+
+
+class Dispatcher:
+    """
+    Parses messages that start with a common header, by the value of one of its fields.
+    The key is read directly from its static offset, and body types are looked up in a dict
+    """
+
+    def __init__(self, header: type, key: str):
+        if key not in header.offsets:
+            raise TypeError(f'{header.__name__} has no field with a static offset named {key}')
+
+        key_offset, key_type = header.offsets[key]
+        if not issubclass(key_type, PrimitiveTypeField):
+            raise TypeError(f'Key field {key} must be a primitive, got {key_type.__name__}')
+
+        self.header = header
+        self.key = key
+        self._key_offset = key_offset
+        self._key_codec = struct.Struct(key_type.FORMAT)
+        self._bodies = {}
+
+    def register(self, value, body: type) -> type:
+        """
+        Register the body type of messages with the given key value
+        """
+
+        value = getattr(value, 'value', value)
+        if value in self._bodies:
+            raise ValueError(f'Key {value} is already registered to {self._bodies[value].__name__}')
+
+        self._bodies[value] = body
+        return body
+
+    def parse_message(self, buf, offset: int = 0) -> Tuple[object, object, int]:
+        """
+        Parse a single message at the given offset.
+        Returns the header, the body and the offset of the next message
+        """
+
+        value = self._key_codec.unpack_from(buf, offset + self._key_offset)[0]
+        body_type = self._bodies.get(value)
+        if body_type is None:
+            raise KeyError(f'No body is registered for {self.key}={value}')
+
+        header = self.header.deserialize(buf, offset)
+        offset += self.header._bs_size(header) if self.header.is_dynamic else self.header.static_size
+
+        body = body_type.deserialize(buf, offset)
+        offset += body_type._bs_size(body) if body_type.is_dynamic else body_type.static_size
+
+        return header, body, offset
+
+    def iter_messages(self, buf, offset: int = 0) -> Iterator[Tuple[object, object]]:
+        """
+        Iterate over the (header, body) of the messages in the buffer.
+        Messages are views over the buffer, read-only buffers (bytes, read-only memoryviews and mmaps) are copied once
+        """
+
+        with memoryview(buf) as memory:
+            readonly, end = memory.readonly, memory.nbytes
+
+        if readonly:
+            buf = bytearray(buf)
+
+        while offset < end:
+            header, body, offset = self.parse_message(buf, offset)
+            yield header, body
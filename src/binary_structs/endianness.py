@@ -10,6 +10,7 @@ from typing import Tuple
 
 from binary_structs.utils import *
 from binary_structs.binary_struct import binary_struct, _is_binary_struct
+from binary_structs.binary_union import binary_union, _is_binary_union
 from binary_structs.utils.buffers.binary_buffer import BufferField
 
 
@@ -51,7 +52,7 @@ def _convert_buffer(buffer: type, endianness: Endianness) -> type:
         return new_binary_buffer(new_element_type, buffer.static_size)
 
     else:
-        return new_typed_buffer(new_element_type)
+        return new_typed_buffer(new_element_type, buffer.count_field)
 
 
 def _convert_class_annotations_endianness(cls, endianness: Endianness):
@@ -68,6 +69,13 @@ def _convert_class_annotations_endianness(cls, endianness: Endianness):
         if issubclass(kind, PrimitiveTypeField):
             new_kind = _convert_primitive_type_endianness(kind, endianness)
 
+        elif issubclass(kind, BitField):
+            new_kind = bits(kind.bits, endianness)
+
+        elif issubclass(kind, (StringField, VarIntField)):
+            # Strings and varints have no endianness
+            continue
+
         elif hasattr(kind, '_is_binary_field'):
             new_kind = _convert_parents_classes(kind, endianness)
 
@@ -83,7 +91,7 @@ def _convert_class_annotations_endianness(cls, endianness: Endianness):
             annotations[annotation_name] = new_kind
 
 
-def _convert_endianness(cls: type, new_bases: Tuple[type], endianness: Endianness):
+def _convert_endianness(cls: type, new_bases: Tuple[type], endianness: Endianness, decorator=binary_struct):
     """
     Convert the endianness of a single class to the given endianness.
     The class is being rebuilt in order to not destroy the old one.
@@ -107,7 +115,7 @@ def _convert_endianness(cls: type, new_bases: Tuple[type], endianness: Endiannes
     cls = type(cls.__name__, new_bases, new_dict)
     _convert_class_annotations_endianness(cls, endianness)
 
-    return binary_struct(cls)
+    return decorator(cls)
 
 
 def _convert_parents_classes(cls, endianness: Endianness = Endianness.HOST):
@@ -128,6 +136,11 @@ def _convert_parents_classes(cls, endianness: Endianness = Endianness.HOST):
     if _is_binary_struct(cls):
         return _convert_endianness(cls, tuple(new_bases) or (object,), endianness)
 
+    elif _is_binary_union(cls):
+        # The memory of the union is rebuilt from its new members
+        new_bases = [base for base in new_bases if not issubclass(base, ctypes.Array)]
+        return _convert_endianness(cls, tuple(new_bases) or (object,), endianness, binary_union)
+
     elif cls is not BufferField and issubclass(cls, BufferField):
         return _convert_buffer(cls, endianness)
 
@@ -137,7 +150,7 @@ def _convert_parents_classes(cls, endianness: Endianness = Endianness.HOST):
 
 
 def endian_decorator(cls, endianness: Endianness):
-    if not _is_binary_struct(cls):
+    if cls is not None and not _is_binary_struct(cls) and not _is_binary_union(cls):
         raise TypeError('Given class cannot be used in a binary struct!')
 
     def wrap(cls):
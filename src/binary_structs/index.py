@@ -0,0 +1,231 @@
+"""
+This file exports build_index and RecordIndex, a persistent index of a record file by one of its fields.
+
+The index is a companion file of fixed size entries of (key, record index), sorted by key.
+It is memory mapped, so a lookup is a binary search over the entries, and a single record is parsed.
+
+Basic API:
+index = build_index(Session, 'sessions.bin', key='session_id')
+session = index.lookup(1234)
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+
+from binary_structs.utils import StringField
+from binary_structs.utils.binary_field.string_fields import _encode
+from binary_structs.record_file import RecordFile
+from binary_structs.records import _open_records
+
+
+# Amount of records that are sorted in memory at once when building an index
+DEFAULT_CHUNK_RECORDS = 1 << 20
+
+
+def _get_index_path(path, key: str) -> str:
+    return f'{os.fspath(path)}.{key}.idx'
+
+
+def _is_fixed_string(kind: type) -> bool:
+    return issubclass(kind, StringField) and not kind.is_dynamic
+
+
+def _get_key_format(struct_type: type, key: str) -> str:
+    """
+    Returns the struct format of the key, with its byte order.
+    Primitives, buffers of bytes and fixed width strings (char[N]) can be used as keys
+    """
+
+    if key not in struct_type.offsets:
+        raise KeyError(f'{struct_type.__name__} has no field with a static offset named {key}')
+
+    kind = struct_type.offsets[key][1]
+    if _is_fixed_string(kind):
+        return f'<{kind.static_size}s'
+
+    codec = struct_type._bs_codecs.get(key)
+    if codec is None or not codec[1]:
+        raise TypeError(f'{key} can\'t be used as an index key, only primitives, buffers of bytes '
+                        f'and fixed width strings (char[N]) can')
+
+    return codec[0].format
+
+
+def _get_entry_struct(struct_type: type, key: str) -> struct.Struct:
+    """
+    Returns the struct of an index entry, the key is followed by the index of its record
+    """
+
+    return struct.Struct(f'<{_get_key_format(struct_type, key)[1:]}Q')
+
+
+def _read_keys(struct_type: type, key: str, memory: memoryview) -> list:
+    """
+    Returns the keys of the records in the memory.
+    Strings are cut at their first null byte, just like their value
+    """
+
+    key_format = _get_key_format(struct_type, key)
+    offset = struct_type.offsets[key][0]
+    end = offset + struct.calcsize(key_format)
+    packer = struct.Struct(f'{key_format[0]}{offset}x{key_format[1:]}{struct_type.static_size - end}x')
+
+    keys = [values[0] for values in packer.iter_unpack(memory)]
+    if _is_fixed_string(struct_type.offsets[key][1]):
+        keys = [value.split(b'\x00', 1)[0] for value in keys]
+
+    return keys
+
+
+def _write_sorted_chunk(file, entry: struct.Struct, keys: list, start: int):
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    file.write(b''.join(entry.pack(keys[index], start + index) for index in order))
+
+
+def _iter_run(run, entry: struct.Struct):
+    """
+    Yields the entries of a sorted run, that is read lazily from its file
+    """
+
+    run.seek(0)
+    while chunk := run.read(entry.size * 4096):
+        yield from entry.iter_unpack(chunk)
+
+
+def build_index(struct_type: type, path, key: str, index_path=None, chunk_records: int = DEFAULT_CHUNK_RECORDS):
+    """
+    Build a sorted index of the record file by the given field, and returns it as a RecordIndex.
+
+    The records are read in chunks of chunk_records, each chunk is sorted into a temporary run,
+    and the runs are merged into the index file, so memory is bounded by the size of a chunk
+    """
+
+    index_path = index_path or _get_index_path(path, key)
+    entry = _get_entry_struct(struct_type, key)
+    chunk_size = chunk_records * struct_type.static_size
+
+    runs = []
+    try:
+        with _open_records(struct_type, path) as memory:
+            for start in range(0, memory.nbytes, chunk_size):
+                with memory[start:start + chunk_size] as chunk:
+                    keys = _read_keys(struct_type, key, chunk)
+
+                run = tempfile.TemporaryFile()
+                _write_sorted_chunk(run, entry, keys, start // struct_type.static_size)
+                runs.append(run)
+
+        # Write to a temporary file first, so a failure doesn't leave a partial index
+        with open(f'{index_path}.tmp', 'wb') as index_file:
+            merged = heapq.merge(*(_iter_run(run, entry) for run in runs))
+            while batch := [entry.pack(*values) for _, values in zip(range(chunk_records), merged)]:
+                index_file.write(b''.join(batch))
+
+        os.replace(f'{index_path}.tmp', index_path)
+
+    finally:
+        for run in runs:
+            run.close()
+
+    return RecordIndex(struct_type, path, key, index_path)
+
+
+class RecordIndex:
+    """
+    A sorted index of a record file by one of its fields.
+    Lookups are a binary search over the memory mapped index, and parse only the records that match
+    """
+
+    def __init__(self, struct_type: type, path, key: str, index_path=None):
+        self.key = key
+        self.index_path = index_path or _get_index_path(path, key)
+        self._entry = _get_entry_struct(struct_type, key)
+        self._string_size = struct_type.offsets[key][1].static_size \
+            if _is_fixed_string(struct_type.offsets[key][1]) else None
+        self._records = RecordFile(struct_type, path)
+
+        with open(self.index_path, 'rb') as index_file:
+            size = os.fstat(index_file.fileno()).st_size
+            self._map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        if len(self) != len(self._records):
+            self.close()
+            raise ValueError(f'{self.index_path} has {len(self)} entries, but {path} has {len(self._records)} '
+                             f'records, the index must be built again')
+
+    def __len__(self) -> int:
+        return len(self._map) // self._entry.size
+
+    def _get_entry(self, position: int) -> tuple:
+        return self._entry.unpack_from(self._map, position * self._entry.size)
+
+    def _get_key(self, key):
+        """
+        Returns the key as it is stored in the entries, strings are encoded and padded with null bytes
+        """
+
+        key = getattr(key, 'value', key)
+        if self._string_size is not None:
+            key = _encode(key).ljust(self._string_size, b'\x00')
+
+        return key
+
+    def _find(self, key) -> int:
+        """
+        Returns the position of the first entry with the given key, or of the first bigger key
+        """
+
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_entry(middle)[0] < key:
+                low = middle + 1
+
+            else:
+                high = middle
+
+        return low
+
+    def lookup_all(self, key):
+        """
+        Yields all of the records with the given key, in the order of the file
+        """
+
+        key = self._get_key(key)
+        for position in range(self._find(key), len(self)):
+            entry_key, record_index = self._get_entry(position)
+            if entry_key != key:
+                break
+
+            yield self._records[record_index]
+
+    def lookup(self, key):
+        """
+        Returns the first record with the given key, raises KeyError if there is none
+        """
+
+        for record in self.lookup_all(key):
+            return record
+
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        key = self._get_key(key)
+        position = self._find(key)
+
+        return position < len(self) and self._get_entry(position)[0] == key
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+        self._records.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,103 @@
+"""
+This file exports deserialize_many, parallel deserialization of records with a static size using a process pool.
+
+The records are split into ranges, and each worker reads its ranges from the source memory directly:
+files are memory mapped by each worker, and buffers are copied once into a shared memory block.
+Workers return each range as compact bytes, so no struct is pickled, and the parent copies
+the ranges into a single array of structs, whose elements are deserialized only when they are accessed.
+
+Basic API:
+samples = Sample.deserialize_many('samples.bin', workers=8)
+"""
+
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from binary_structs.utils import new_binary_buffer
+from binary_structs.records import _open_records, _verify_records
+
+
+# Ranges per worker, smaller ranges balance the work between workers
+RANGES_PER_WORKER = 4
+
+
+def _read_range(struct_type: type, source, start: int, stop: int) -> bytes:
+    """
+    Returns the records in the given range of indices as bytes, in a worker.
+    The source is a path, or the name and size of a shared memory block
+    """
+
+    record_size = struct_type.static_size
+
+    if isinstance(source, (str, os.PathLike)):
+        with _open_records(struct_type, source) as memory:
+            return bytes(memory[start * record_size:stop * record_size])
+
+    name, _ = source
+    shared_memory = SharedMemory(name)
+
+    try:
+        with shared_memory.buf[start * record_size:stop * record_size] as memory:
+            return bytes(memory)
+
+    finally:
+        shared_memory.close()
+
+
+def _split(count: int, parts: int) -> list:
+    step = max(-(-count // parts), 1)
+    return [(start, min(start + step, count)) for start in range(0, count, step)]
+
+
+def deserialize_many(struct_type: type, source, workers: int = None):
+    """
+    Deserialize all of the records in a path or a buffer, using a pool of worker processes.
+    Returns an array of the structs that holds a copy of the records, in the order of the source
+    """
+
+    _verify_records(struct_type)
+    workers = workers or os.cpu_count()
+    record_size = struct_type.static_size
+
+    if workers == 1:
+        with _open_records(struct_type, source) as memory:
+            return new_binary_buffer(struct_type, memory.nbytes // record_size).from_buffer_copy(memory)
+
+    shared_memory = None
+    if isinstance(source, (str, os.PathLike)):
+        size = os.stat(source).st_size
+        worker_source = source
+
+        if size % record_size:
+            raise ValueError(f'Size of {source} is not a multiple of {struct_type.__name__} '
+                             f'({size} % {record_size})')
+
+    else:
+        with _open_records(struct_type, source) as memory:
+            size = memory.nbytes
+            if size:
+                shared_memory = SharedMemory(create=True, size=size)
+                shared_memory.buf[:size] = memory
+
+        worker_source = (shared_memory.name, size) if shared_memory else None
+
+    try:
+        records = bytearray(size)
+        ranges = _split(size // record_size, workers * RANGES_PER_WORKER)
+
+        if ranges:
+            with ProcessPoolExecutor(workers) as executor:
+                results = executor.map(_read_range, *zip(*((struct_type, worker_source, start, stop)
+                                                           for start, stop in ranges)))
+
+                for (start, stop), result in zip(ranges, results):
+                    records[start * record_size:stop * record_size] = result
+
+        return new_binary_buffer(struct_type, size // record_size).from_buffer(records)
+
+    finally:
+        if shared_memory is not None:
+            shared_memory.close()
+            shared_memory.unlink()
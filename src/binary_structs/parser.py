@@ -0,0 +1,130 @@
+"""
+This file exports StructParser, an incremental parser of binary structs from a stream of data.
+
+The parser does no IO, data is fed into it as it arrives, in fragments of any size,
+and complete instances are taken out of it.
+
+Basic API:
+parser = BufferWithSize.parser()
+
+parser.feed(sock.recv(4096))
+for buf in parser:
+    ...
+"""
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Errors that deserializing a message that was not fully received can raise
+INCOMPLETE_ERRORS = (ValueError, AssertionError, IndexError)
+
+
+def _get_all_binary_fields(kind: type) -> list:
+    """
+    Returns the binary fields of a struct and of its parents
+    """
+
+    return [field for klass in reversed(kind.__mro__)
+            for field in klass.__dict__.get('binary_fields', {}).values()]
+
+
+def _is_self_delimiting(kind: type) -> bool:
+    """
+    Returns if the size of the type can be found from its own data.
+    Buffers without a size or a count field take the rest of the data, so they can't be used in a stream
+    """
+
+    if not getattr(kind, 'is_dynamic', False):
+        return True
+
+    if hasattr(kind, 'count_field') and kind.count_field is None:
+        return False
+
+    if hasattr(kind, 'element_type'):
+        return _is_self_delimiting(kind.element_type)
+
+    return all(_is_self_delimiting(field) for field in _get_all_binary_fields(kind))
+
+
+class StructParser:
+    """
+    Parses instances of a binary struct from fragments of data.
+
+    Data is appended to a single buffer with a read cursor, and instances are parsed from it by offset.
+    Parsed instances are views over the buffer, so the buffer is never modified in place. When it is full,
+    the unread data is moved into a new buffer, that is at least twice as big as the unread data.
+    """
+
+    def __init__(self, struct_type: type, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        if not _is_self_delimiting(struct_type):
+            raise TypeError(f'The size of {struct_type.__name__} cannot be found from its data')
+
+        if not struct_type.is_dynamic and struct_type.static_size == 0:
+            raise TypeError(f'{struct_type.__name__} has no size')
+
+        self.struct_type = struct_type
+        self._buffer = bytearray(max(buffer_size, struct_type.static_size))
+        self._start = 0
+        self._end = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        The amount of bytes that were fed, but not parsed yet
+        """
+
+        return self._end - self._start
+
+    def feed(self, data):
+        """
+        Append data to the buffer
+        """
+
+        data = memoryview(data).cast('B')
+        size = data.nbytes
+
+        if self._end + size > len(self._buffer):
+            pending = self.pending
+            new_buffer = bytearray(max(len(self._buffer), 2 * (pending + size)))
+            new_buffer[:pending] = memoryview(self._buffer)[self._start:self._end]
+
+            self._buffer = new_buffer
+            self._start = 0
+            self._end = pending
+
+        self._buffer[self._end:self._end + size] = data
+        self._end += size
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        Returns the next complete instance.
+        Iteration stops when there is no complete instance, it can be resumed after feeding more data
+        """
+
+        struct_type = self.struct_type
+
+        if struct_type.is_dynamic:
+            # The buffer after the fed data is zeroed, so a message that was not fully
+            # received is either too big or raises
+            try:
+                instance = struct_type.deserialize(self._buffer, self._start)
+
+            except INCOMPLETE_ERRORS:
+                raise StopIteration from None
+
+            size = struct_type._bs_size(instance)
+            if size > self.pending:
+                raise StopIteration
+
+        else:
+            size = struct_type.static_size
+            if size > self.pending:
+                raise StopIteration
+
+            instance = struct_type.deserialize(self._buffer, self._start)
+
+        self._start += size
+        return instance
@@ -0,0 +1,131 @@
+"""
+This file exports BufferPool, a pool of preallocated buffers, and the receive function of binary structs.
+
+Structs are received directly into a buffer from the pool using recv_into, and deserialized as views over it,
+so no intermediate bytes objects are created.
+
+Basic API:
+pool = BufferPool.for_struct(Sample)
+
+sample = Sample.recv(sock, pool=pool)
+...
+pool.release(sample)
+"""
+
+import socket
+
+
+MAX_DATAGRAM_SIZE = 64 * 1024
+DEFAULT_CAPACITY = 64
+
+
+class BufferPool:
+    """
+    A pool of preallocated buffers (slabs) with a fixed size.
+    Released slabs are handed out again, up to capacity slabs are kept
+    """
+
+    def __init__(self, slab_size: int, capacity: int = DEFAULT_CAPACITY):
+        self.slab_size = slab_size
+        self.capacity = capacity
+        self._free = [bytearray(slab_size) for _ in range(capacity)]
+        # Ids of the free slabs, to catch a slab that is released twice
+        self._free_ids = {id(slab) for slab in self._free}
+
+    @classmethod
+    def for_struct(cls, struct_type: type, capacity: int = DEFAULT_CAPACITY):
+        """
+        Create a pool with slabs that fit the given struct.
+        Dynamic structs can only be received from datagrams, so their slabs fit a whole datagram
+        """
+
+        slab_size = MAX_DATAGRAM_SIZE if struct_type.is_dynamic else struct_type.static_size
+        return cls(slab_size, capacity)
+
+    @property
+    def available(self) -> int:
+        return len(self._free)
+
+    def acquire(self) -> bytearray:
+        """
+        Hand out a slab, a new one is allocated if the pool is empty
+        """
+
+        if not self._free:
+            return bytearray(self.slab_size)
+
+        slab = self._free.pop()
+        self._free_ids.discard(id(slab))
+
+        return slab
+
+    def release(self, slab):
+        """
+        Reclaim a slab. A struct that was received into a slab can be passed instead of the slab,
+        it must not be used after it was released
+        """
+
+        # Get the memory that a struct was deserialized from
+        slab = getattr(slab, '__dict__', {}).get('_bs_origin', (slab, ))[0]
+        if isinstance(slab, memoryview):
+            slab = slab.obj
+
+        if not isinstance(slab, bytearray) or len(slab) != self.slab_size:
+            raise ValueError('Given buffer does not belong to the pool')
+
+        if id(slab) in self._free_ids:
+            raise ValueError('Given buffer was already released')
+
+        if len(self._free) < self.capacity:
+            self._free.append(slab)
+            self._free_ids.add(id(slab))
+
+
+def recv_struct(struct_type: type, sock: socket.socket, pool: BufferPool = None):
+    """
+    Receive a struct from a socket.
+
+    Stream sockets are read until the whole struct was received, datagram sockets
+    receive a single datagram. Structs with a dynamic size can only be received from datagrams
+    """
+
+    is_datagram = sock.type == socket.SOCK_DGRAM
+    size = struct_type.static_size
+
+    if struct_type.is_dynamic and not is_datagram:
+        raise TypeError(f'{struct_type.__name__} has a dynamic size, use {struct_type.__name__}.parser() '
+                        f'to receive it from a stream')
+
+    slab = pool.acquire() if pool is not None else \
+        bytearray(MAX_DATAGRAM_SIZE if struct_type.is_dynamic else size)
+
+    memory = memoryview(slab)
+
+    try:
+        if len(slab) < size:
+            raise ValueError(f'Buffers of {len(slab)} bytes are too small for {struct_type.__name__}')
+
+        if is_datagram:
+            received = sock.recv_into(memory)
+            if received < size:
+                raise ValueError(f'Received {received} bytes, {struct_type.__name__} is {size} bytes long')
+
+        else:
+            received = 0
+            while received < size:
+                count = sock.recv_into(memory[received:size])
+                if count == 0:
+                    raise ConnectionError(f'Connection was closed after {received} bytes of {size}')
+
+                received += count
+
+        if struct_type.is_dynamic:
+            return struct_type.deserialize(memory[:received])
+
+        return struct_type.deserialize(slab)
+
+    except BaseException:
+        if pool is not None:
+            pool.release(slab)
+
+        raise
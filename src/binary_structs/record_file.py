@@ -0,0 +1,143 @@
+"""
+This file exports RecordFile, random access to a file of fixed size records.
+
+The file is memory mapped, and records are deserialized as views over the mapping only when they are accessed,
+so reading a sparse subset of a huge file doesn't read the rest of it.
+
+Basic API:
+with RecordFile(Sample, 'samples.bin') as samples:
+    first = samples[0]
+    last_ten = samples[-10:]
+"""
+
+import io
+import mmap
+import os
+
+
+MODES = ('r', 'r+')
+
+
+class RecordFile:
+    """
+    A memory mapped file of records of a struct with a static size.
+
+    In 'r' mode the mapping is copy-on-write, records can be modified but the changes are not written to the file.
+    In 'r+' mode records are views over the file, assigning to their fields writes to the file.
+    """
+
+    def __init__(self, struct_type: type, path, mode: str = 'r'):
+        if mode not in MODES:
+            raise ValueError(f'Invalid mode {mode!r}, expected one of {MODES}')
+
+        if struct_type.is_dynamic or struct_type.static_size == 0:
+            raise TypeError(f'{struct_type.__name__} must have a static size to be stored in a record file')
+
+        self.struct_type = struct_type
+        self.path = path
+        self.mode = mode
+        self._record_size = struct_type.static_size
+        self._file = open(path, f'{mode}b')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._map = None
+
+        if self._size % self._record_size:
+            self._file.close()
+            raise ValueError(f'Size of {path} is not a multiple of {struct_type.__name__} '
+                             f'({self._size} % {self._record_size})')
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == 'r+'
+
+    def _get_map(self) -> mmap.mmap:
+        """
+        Returns a mapping of the whole file, the file is mapped again after records were appended.
+        The old mapping stays alive as long as records that were read from it are used
+        """
+
+        if self._map is None or len(self._map) != self._size:
+            # Appended records must reach the file before it is mapped
+            self._file.flush()
+            access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_COPY
+            self._map = mmap.mmap(self._file.fileno(), self._size, access=access)
+
+        return self._map
+
+    def __len__(self) -> int:
+        return self._size // self._record_size
+
+    def __getitem__(self, index):
+        """
+        Returns the record at the given index, or a list of records for a slice.
+        Records are deserialized from the mapped file, in 'r+' mode they are views that write to it
+        """
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        length = len(self)
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError(f'Record index out of range ({index})')
+
+        if self.writable:
+            return self.struct_type.view(self._get_map(), index * self._record_size)
+
+        return self.struct_type.deserialize(self._get_map(), index * self._record_size)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, record):
+        """
+        Write a record at the end of the file
+        """
+
+        if not self.writable:
+            raise io.UnsupportedOperation('RecordFile was not opened for writing')
+
+        if type(record) is not self.struct_type:
+            raise TypeError(f'Expected {self.struct_type.__name__}, got {type(record).__name__}')
+
+        self._file.seek(self._size)
+        self._file.write(self.struct_type._bs_bytes(record))
+        self._size += self._record_size
+
+    def flush(self):
+        """
+        Write the changes to the mapped records and the appended records to the file
+        """
+
+        if not self.writable:
+            return
+
+        self._file.flush()
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self.flush()
+        if self._map is not None:
+            try:
+                self._map.close()
+
+            except BufferError:
+                # Records that are still used keep the mapping alive
+                pass
+
+            self._map = None
+
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,226 @@
+"""
+This file has the functions that work on buffers of fixed size records, without building an instance per record.
+
+Fields are read by their static offsets, using a single struct format per byte order that unpacks only the
+requested fields of a record, and skips the rest of it.
+
+Basic API:
+for packet in Packet.scan('capture.bin', where={'hdr.opcode': 7}, fields=['seq', 'ts']):
+    ...
+"""
+
+import mmap
+import os
+import struct
+
+from contextlib import contextmanager
+from itertools import repeat
+from typing import Iterable, List, Tuple
+
+
+def _verify_records(struct_type: type):
+    if struct_type.is_dynamic or struct_type.static_size == 0:
+        raise TypeError(f'{struct_type.__name__} must have a static size to be read as records')
+
+
+@contextmanager
+def _open_records(struct_type: type, source, writable: bool = False):
+    """
+    Returns a memoryview of the records in the source.
+    The source can be a bytes-like object, an mmap, a path or a file object, files are memory mapped.
+    A writable memory is private: files are mapped as copy-on-write, and read-only buffers are copied
+    """
+
+    _verify_records(struct_type)
+
+    memory_map = None
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, 'fileno'):
+        file = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else None
+        fileno = (file or source).fileno()
+
+        if os.fstat(fileno).st_size:
+            memory_map = mmap.mmap(fileno, 0, access=mmap.ACCESS_COPY if writable else mmap.ACCESS_READ)
+
+        memory = memoryview(memory_map if memory_map is not None else b'')
+
+    else:
+        file = None
+        memory = memoryview(source).cast('B')
+
+        if writable and memory.readonly:
+            memory = memoryview(bytearray(memory))
+
+    try:
+        if memory.nbytes % struct_type.static_size:
+            raise ValueError(f'Size of the records is not a multiple of {struct_type.__name__} '
+                             f'({memory.nbytes} % {struct_type.static_size})')
+
+        yield memory
+
+    finally:
+        memory.release()
+        if memory_map is not None:
+            try:
+                memory_map.close()
+
+            except BufferError:
+                # Records that are still used keep the mapping alive
+                pass
+
+        if file is not None:
+            file.close()
+
+
+def _compile_fields(struct_type: type, paths: Iterable[str]) -> Tuple[List[struct.Struct], dict]:
+    """
+    Build a struct for each byte order of the given fields, that unpacks only these fields from a record.
+    Fields that overlap (e.g. members of a union) are unpacked by another struct.
+    Returns the structs, and the location of each field in their values as (struct index, start, end, is_single_value)
+    """
+
+    fields = []
+    for path in dict.fromkeys(paths):
+        if path not in struct_type.offsets:
+            raise KeyError(f'{struct_type.__name__} has no field with a static offset named {path}')
+
+        codec = struct_type._bs_codecs.get(path)
+        if codec is None:
+            raise TypeError(f'{path} has no struct format, only primitives and buffers of primitives can be read')
+
+        packer, is_single_value = codec
+        fields.append((struct_type.offsets[path][0], path, packer, is_single_value))
+
+    # Each group is [byte order, format, end of the last field, amount of values]
+    groups = []
+    locations = {}
+    for offset, path, packer, is_single_value in sorted(fields):
+        byte_order = packer.format[0]
+        group = next((group for group in groups if group[0] == byte_order and group[2] <= offset), None)
+        if group is None:
+            group = [byte_order, byte_order, 0, 0]
+            groups.append(group)
+
+        count = len(packer.unpack(bytes(packer.size)))
+        locations[path] = (groups.index(group), group[3], group[3] + count, is_single_value)
+
+        group[1] += f'{offset - group[2]}x{packer.format[1:]}'
+        group[2] = offset + packer.size
+        group[3] += count
+
+    packers = [struct.Struct(f'{record_format}{struct_type.static_size - end}x')
+               for _, record_format, end, _ in groups]
+
+    return packers, locations
+
+
+def _iter_rows(memory: memoryview, packers: List[struct.Struct], record_size: int):
+    """
+    Yields the values of each record, as a tuple of the values that were unpacked by each struct
+    """
+
+    if not packers:
+        yield from repeat((), memory.nbytes // record_size)
+
+    elif len(packers) == 1:
+        for values in packers[0].iter_unpack(memory):
+            yield (values, )
+
+    else:
+        yield from zip(*(packer.iter_unpack(memory) for packer in packers))
+
+
+def _get_value(row: tuple, location: tuple):
+    packer_index, start, end, is_single_value = location
+    values = row[packer_index]
+
+    return values[start] if is_single_value else list(values[start:end])
+
+
+def _create_predicate(condition):
+    """
+    Conditions can be a value, a set or range of values, or a function that gets the value
+    """
+
+    if callable(condition):
+        return condition
+
+    if isinstance(condition, (set, frozenset, range)):
+        return condition.__contains__
+
+    condition = getattr(condition, 'value', condition)
+    return lambda value: value == condition
+
+
+def _scan_memory(struct_type: type, memory: memoryview, where: dict, fields: list):
+    packers, locations = _compile_fields(struct_type, list(where) + list(fields or []))
+    predicates = [(locations[path], _create_predicate(condition)) for path, condition in where.items()]
+    record_size = struct_type.static_size
+
+    for index, row in enumerate(_iter_rows(memory, packers, record_size)):
+        if not all(predicate(_get_value(row, location)) for location, predicate in predicates):
+            continue
+
+        if fields is not None:
+            yield {path: _get_value(row, locations[path]) for path in fields}
+
+        elif memory.readonly:
+            offset = index * record_size
+            yield struct_type.deserialize(bytearray(memory[offset:offset + record_size]))
+
+        else:
+            yield struct_type.deserialize(memory, index * record_size)
+
+
+def scan_records(struct_type: type, source, where: dict = None, fields: List[str] = None):
+    """
+    Yields the records of the source that match all of the conditions in where.
+
+    Only the fields that are filtered by or requested are unpacked from each record. If fields are given,
+    a dict of them is yielded for each matching record, otherwise the whole record is deserialized
+    """
+
+    with _open_records(struct_type, source) as memory:
+        yield from _scan_memory(struct_type, memory, where or {}, fields)
+
+
+def _read_keys(struct_type: type, memory: memoryview, key: str) -> list:
+    """
+    Returns the value of the key field of each record
+    """
+
+    packers, locations = _compile_fields(struct_type, [key])
+    location = locations[key]
+
+    return [_get_value(row, location) for row in _iter_rows(memory, packers, struct_type.static_size)]
+
+
+def sort_records(struct_type: type, source, key: str, reverse: bool = False) -> bytearray:
+    """
+    Returns a new buffer with the records of the source sorted by the given field.
+    Records with equal keys keep their order
+    """
+
+    record_size = struct_type.static_size
+
+    with _open_records(struct_type, source) as memory:
+        keys = _read_keys(struct_type, memory, key)
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+        # The records are gathered with a single copy, slices of the memory don't copy them
+        return bytearray().join([memory[index * record_size:(index + 1) * record_size] for index in order])
+
+
+def group_records(struct_type: type, source, key: str) -> dict:
+    """
+    Returns a dict of the indices of the records in the source, by the value of the given field.
+    Groups are ordered by their first record, buffer keys are grouped by a tuple of their values
+    """
+
+    with _open_records(struct_type, source) as memory:
+        keys = _read_keys(struct_type, memory, key)
+
+    groups = {}
+    for index, value in enumerate(keys):
+        groups.setdefault(tuple(value) if isinstance(value, list) else value, []).append(index)
+
+    return groups
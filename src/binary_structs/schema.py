@@ -0,0 +1,170 @@
+"""
+This file exports make_struct, that builds binary structs from a plain schema description.
+
+Built classes are cached by a structural fingerprint, so identical schemas share
+a single class and its generated code. The cache holds weak references, so classes
+that are no longer used are freed.
+
+Built classes are registered under a unique name in this module, so pickle can find them by reference.
+Instances of classes with a picklable schema are pickled with their schema, so they can be restored
+in another process too.
+
+Basic API:
+BufferWithSize = make_struct('BufferWithSize', [('size', 'uint32_t'), ('buf', ['uint8_t', 64])])
+"""
+
+import itertools
+import pickle
+import binary_structs.utils as fields
+
+from typing import Iterable, Tuple
+from weakref import WeakValueDictionary
+
+from binary_structs.utils import Endianness
+from binary_structs.binary_struct import binary_struct, _reduce, _restore_struct
+from binary_structs.endianness import big_endian, little_endian
+
+
+_struct_cache = WeakValueDictionary()
+
+
+class _Registry:
+    """
+    The built classes by a unique name. The qualified name of a built class points into the registry,
+    so the class can be found by pickle. Classes are held weakly, just like in the cache
+    """
+
+    def __init__(self):
+        self._classes = WeakValueDictionary()
+        self._counter = itertools.count()
+
+    def add(self, cls: type):
+        name = f'{cls.__name__}_{next(self._counter)}'
+        self._classes[name] = cls
+
+        cls.__module__ = __name__
+        cls.__qualname__ = f'_structs.{name}'
+
+    def __getattr__(self, name: str) -> type:
+        try:
+            return self._classes[name]
+
+        except KeyError:
+            raise AttributeError(f'No struct named {name} was built') from None
+
+
+_structs = _Registry()
+
+
+def _resolve_kind(kind):
+    """
+    Resolve a field type from the schema.
+    Types can be given as types, or by their name (e.g. 'uint32_t')
+    """
+
+    if isinstance(kind, list):
+        return [_resolve_kind(kind[0])] + kind[1:]
+
+    if isinstance(kind, str):
+        if not hasattr(fields, kind):
+            raise TypeError(f'Unknown field type {kind}')
+
+        return getattr(fields, kind)
+
+    return kind
+
+
+def _freeze(value):
+    """
+    Returns a hashable version of the given value, for the fingerprint.
+    Values are tagged with their type, so equal values of different types (e.g. [1] and (1,), or 1 and 1.0)
+    have different fingerprints
+    """
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(element) for element in value))
+
+    if isinstance(value, dict):
+        return (type(value), tuple((key, _freeze(element)) for key, element in value.items()))
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return (type(value), bytes(value))
+
+    if hasattr(value, '_is_binary_field') and not isinstance(value, type):
+        return (type(value), bytes(value))
+
+    return (type(value), value)
+
+
+def _get_fingerprint(name: str, schema: Tuple[tuple], bases: Tuple[type], endian: Endianness) -> tuple:
+    """
+    Returns the structural fingerprint of a schema
+    """
+
+    return (name, _freeze(schema), bases, endian)
+
+
+def _restore_schema_struct(arguments: tuple, data: bytes):
+    """
+    Unpickle a struct by building its class from the schema, the class is taken from the cache if it exists
+    """
+
+    return _restore_struct(make_struct(*arguments), data)
+
+
+def _reduce_schema_struct(self) -> tuple:
+    """
+    Structs are pickled with the schema of their class instead of a reference to it
+    """
+
+    _, (cls, data), state = _reduce(self)
+
+    return _restore_schema_struct, (cls._bs_schema, data), state
+
+
+def _is_picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+
+    return True
+
+
+def make_struct(name: str, schema: Iterable[tuple], bases: Tuple[type] = (), endian: Endianness = None) -> type:
+    """
+    Build a binary struct from a schema.
+
+    The schema is a list of (field_name, field_type) or (field_name, field_type, default_value).
+    Classes are cached, so calling make_struct with an identical schema will return the same class.
+    """
+
+    arguments = (name, tuple(tuple(field) for field in schema), tuple(bases), endian)
+    name, schema, bases, endian = arguments
+
+    schema = tuple((field[0], _resolve_kind(field[1])) + tuple(field[2:]) for field in schema)
+
+    fingerprint = _get_fingerprint(name, schema, bases, endian)
+    cls = _struct_cache.get(fingerprint)
+
+    if cls is None:
+        cls_dict = {'__annotations__': {field[0]: field[1] for field in schema}}
+        cls_dict.update({field[0]: field[2] for field in schema if len(field) == 3})
+
+        cls = binary_struct(type(name, bases, cls_dict))
+
+        if endian == Endianness.BIG:
+            cls = big_endian(cls)
+
+        elif endian == Endianness.LITTLE:
+            cls = little_endian(cls)
+
+        _structs.add(cls)
+        if _is_picklable(arguments):
+            cls._bs_schema = arguments
+            cls.__reduce__ = _reduce_schema_struct
+
+        _struct_cache[fingerprint] = cls
+
+    return cls
@@ -7,6 +7,11 @@ from binary_structs.utils.binary_field.base_fields import       \
     le_int8_t, le_int16_t, le_int32_t, le_int64_t,              \
     le_uint8_t, le_uint16_t, le_uint32_t, le_uint64_t
 
+from binary_structs.utils.binary_field.bit_fields import BitField, bits, get_bits_storage
+from binary_structs.utils.binary_field.string_fields import StringField, char, cstring, new_fixed_string
+from binary_structs.utils.binary_field.varint_fields import VarIntField, varint, svarint, encode_varint, \
+                                                            decode_varints
+
 
 byte        = le_uint8_t
 uint8_t     = le_uint8_t
@@ -9,6 +9,7 @@ from ctypes import c_int8, c_uint8, c_int16, c_uint16, c_int32, c_uint32, c_int6
 from enum import Enum
 
 INT_RE_EXPR = re.compile('(le|be)_(u*)int([0-9]+)_t')
+OPERATIONS = ('and', 'or', 'xor', 'add', 'sub', 'mul', 'floordiv', 'mod', 'lshift', 'rshift')
 
 
 class Endianness(Enum):
@@ -43,35 +44,39 @@ def _generate_integer_class(cls):
         return self.value == getattr(other, 'value', other)
 
 
-    def __bitwise_operation(op1, op2, operation) -> bytes:
-        op1_bytes = bytes(op1.memory)
-        op2_bytes = bytes(op2.memory)
+    def __operation(operation: str):
+        """
+        Create an operator function, that operates on the whole integer value.
+        The result has the type of self, and wraps around just like the c type would.
+        """
 
-        bigger_buf_len = max(len(op1_bytes), len(op2_bytes))
+        def operation_fn(self, other):
+            other_value = getattr(other, 'value', other)
+            if not isinstance(other_value, int):
+                return NotImplemented
 
-        op1_bytes = op1_bytes + b'\x00' * (bigger_buf_len - len(op1_bytes))
-        op2_bytes = op2_bytes + b'\x00' * (bigger_buf_len - len(op2_bytes))
+            return type(self)(getattr(int, operation)(self.value, other_value))
 
-        return bytes(getattr(int, operation)(a, b) for (a, b) in zip(op1_bytes, op2_bytes))
+        operation_fn.__name__ = operation
 
+        return operation_fn
 
-    def __and__(self, other) -> bytes:
-        return __bitwise_operation(self, other, '__and__')
 
+    def __invert__(self):
+        return type(self)(~self.value)
 
-    def __or__(self, other) -> bytes:
-        return __bitwise_operation(self, other, '__or__')
 
+    def __str__(self) -> str:
+        return str(self.value)
 
-    def __xor__(self, other) -> bytes:
-        return __bitwise_operation(self, other, '__xor__')
 
+    def to_python(self) -> int:
+        return self.value
 
-    def __invert__(self) -> bytes:
-        return bytes(~x & 0xff for x in self.memory)
 
-    def __str__(self) -> str:
-        return str(self.value)
+    @classmethod
+    def from_python(cls, value: int):
+        return cls(value)
 
 
     @property
@@ -89,19 +94,27 @@ def _generate_integer_class(cls):
 
         # Functions
         '__eq__': __eq__,
-        '__and__': __and__,
-        '__or__': __or__,
-        '__xor__': __xor__,
         '__invert__': __invert__,
         '__str__': __str__,
+        'to_python': to_python,
+        'from_python': from_python,
     }
 
+    # Bitwise and arithmetic operators, with their reflected versions
+    for operation in OPERATIONS:
+        int_dict[f'__{operation}__'] = __operation(f'__{operation}__')
+        int_dict[f'__r{operation}__'] = __operation(f'__r{operation}__')
+
     new_cls = type(cls.__name__, (ctypes_class, PrimitiveTypeField, ), int_dict)
     # Set an alias for deserialize for all class implementations
     setattr(new_cls,                'deserialize', new_cls.from_buffer)
     setattr(new_cls.__ctype_le__,   'deserialize', new_cls.__ctype_le__.from_buffer)
     setattr(new_cls.__ctype_be__,   'deserialize', new_cls.__ctype_be__.from_buffer)
 
+    # The struct module format of each implementation, e.g. '>I'
+    for kind in (new_cls, new_cls.__ctype_le__, new_cls.__ctype_be__):
+        setattr(kind, 'FORMAT', memoryview(kind()).format)
+
     # From the python source code:
     # "Each *simple* type that supports different byte orders has an
     # __ctype_be__ attribute that specifies the same type in BIG ENDIAN
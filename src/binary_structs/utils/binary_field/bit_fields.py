@@ -0,0 +1,61 @@
+"""
+This file include the bits annotation, used for declaring bitfields inside of a binary struct.
+
+Consecutive bitfields are packed into a single storage unit, an unsigned integer that is big enough
+to hold all of them. The first bitfield takes the least significant bits of the storage unit.
+"""
+
+from functools import lru_cache
+
+from binary_structs.utils.binary_field.base_fields import Endianness, le_uint8_t, le_uint16_t, le_uint32_t, \
+                                                     le_uint64_t, be_uint16_t, be_uint32_t, be_uint64_t
+
+
+MAX_BITS = 64
+
+# Storage units by endianness, from the smallest to the biggest. Single bytes have no endianness
+BITS_STORAGE = {
+    Endianness.LITTLE:  ((8, le_uint8_t), (16, le_uint16_t), (32, le_uint32_t), (64, le_uint64_t)),
+    Endianness.BIG:     ((8, le_uint8_t), (16, be_uint16_t), (32, be_uint32_t), (64, be_uint64_t))
+}
+
+
+class BitField:
+    """
+    Marks a bitfield annotation, it has the width of the field and the endianness of its storage unit
+    """
+
+    bits = 0
+    endianness = Endianness.LITTLE
+
+
+@lru_cache(maxsize=None)
+def bits(width: int, endianness: Endianness = Endianness.LITTLE) -> type:
+    """
+    Returns the annotation of a bitfield with the given width
+    """
+
+    if not 0 < width <= MAX_BITS:
+        raise ValueError(f'Bitfield width must be between 1 and {MAX_BITS}, got {width}')
+
+    return type(f'{endianness.value}_bits_{width}', (BitField, ), {'bits': width, 'endianness': endianness})
+
+
+def get_bits_storage(width: int, endianness: Endianness) -> type:
+    """
+    Returns the smallest unsigned integer type that can store the given amount of bits.
+    Bitfields without an endianness are stored in the host byte order
+    """
+
+    if endianness is Endianness.NONE:
+        endianness = Endianness.HOST
+
+    if endianness not in BITS_STORAGE:
+        raise ValueError(f'Bitfields cannot be stored with {endianness} endianness')
+
+    if not 0 < width <= MAX_BITS:
+        raise ValueError(f'Bitfields must be stored in 1 to {MAX_BITS} bits, got {width}')
+
+    for size, storage in BITS_STORAGE[endianness]:
+        if width <= size:
+            return storage
@@ -0,0 +1,209 @@
+"""
+This file include the string types that can be used inside of a binary struct.
+
+char[N] is a fixed width string, it is padded with null bytes.
+cstring is a null terminated string, its size is known only after it is deserialized.
+
+Both types are decoded into a str only when it is requested, and the decoded str is cached.
+"""
+
+from ctypes import c_char
+from functools import lru_cache
+
+
+ENCODING = 'utf-8'
+
+# Size of the first chunk that is searched for a terminator, in buffers that can't be searched directly
+FIND_CHUNK_SIZE = 64
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, str):
+        return value.encode(ENCODING, 'surrogateescape')
+
+    return bytes(value)
+
+
+def _decode(value: bytes) -> str:
+    return value.decode(ENCODING, 'surrogateescape')
+
+
+def _find_terminator(buf, offset: int) -> int:
+    """
+    Returns the offset of the first null byte after offset, or -1.
+    Buffers without find are searched in growing chunks, so only the string itself is copied
+    """
+
+    if hasattr(buf, 'find'):
+        return buf.find(b'\x00', offset)
+
+    memory = memoryview(buf).cast('B')
+    chunk_size = FIND_CHUNK_SIZE
+    while offset < len(memory):
+        index = bytes(memory[offset:offset + chunk_size]).find(b'\x00')
+        if index >= 0:
+            return offset + index
+
+        offset += chunk_size
+        chunk_size *= 2
+
+    return -1
+
+
+class StringField:
+    """
+    Base class of the string types, strings have no endianness
+    """
+
+
+@lru_cache(maxsize=None)
+def new_fixed_string(size: int) -> type:
+    """
+    Create a new fixed width string type, with the given size in bytes
+    """
+
+    class FixedString(c_char * size, StringField):
+        _is_binary_field = True
+        static_size = size
+        size_in_bytes = size
+        is_dynamic = False
+
+        def __init__(self, value=b''):
+            super().__init__()
+            self.value = _encode(value)
+
+        @property
+        def string(self) -> str:
+            """
+            The string up to the first null byte, it is decoded only when it changes
+            """
+
+            value = self.value
+            cached = self.__dict__.get('_string')
+            if cached is None or cached[0] != value:
+                cached = self.__dict__['_string'] = (value, _decode(value))
+
+            return cached[1]
+
+        def __str__(self) -> str:
+            return self.string
+
+        def __eq__(self, other) -> bool:
+            if isinstance(other, str):
+                return self.string == other
+
+            return self.value == getattr(other, 'value', other)
+
+        def __reduce__(self) -> tuple:
+            return _restore_fixed_string, (size, self.raw)
+
+        def to_python(self) -> str:
+            return self.string
+
+        @classmethod
+        def from_python(cls, value: str):
+            return cls(value)
+
+        @classmethod
+        def deserialize(cls, buf, offset: int = 0):
+            # Read-only buffers are copied
+            if memoryview(buf).readonly:
+                return cls.from_buffer_copy(buf, offset)
+
+            return cls.from_buffer(buf, offset)
+
+    FixedString.__name__ = f'char_{size}'
+    return FixedString
+
+
+def _restore_fixed_string(size: int, data: bytes):
+    return new_fixed_string(size).from_buffer_copy(data)
+
+
+class char:
+    """
+    Fixed width strings are declared using char[size]
+    """
+
+    def __class_getitem__(cls, size: int) -> type:
+        return new_fixed_string(size)
+
+
+class cstring(StringField):
+    """
+    A null terminated string.
+    The raw bytes don't include the terminator, it is added when serializing
+    """
+
+    __slots__ = ('raw', '_string')
+
+    _is_binary_field = True
+    static_size = 0
+    is_dynamic = True
+
+    def __init__(self, value=b''):
+        raw = _encode(value)
+        if b'\x00' in raw:
+            raise ValueError('cstring cannot contain a null byte')
+
+        self.raw = raw
+        self._string = value if isinstance(value, str) else None
+
+    @property
+    def string(self) -> str:
+        """
+        The decoded string, it is decoded on first access
+        """
+
+        if self._string is None:
+            self._string = _decode(self.raw)
+
+        return self._string
+
+    @property
+    def size_in_bytes(self) -> int:
+        return len(self.raw) + 1
+
+    def _bs_size(self) -> int:
+        return len(self.raw) + 1
+
+    def __bytes__(self) -> bytes:
+        return self.raw + b'\x00'
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __str__(self) -> str:
+        return self.string
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, str):
+            return self.string == other
+
+        return self.raw == getattr(other, 'raw', other)
+
+    def __hash__(self) -> int:
+        return hash(self.raw)
+
+    def to_python(self) -> str:
+        return self.string
+
+    @classmethod
+    def from_python(cls, value: str):
+        return cls(value)
+
+    @classmethod
+    def deserialize(cls, buf, offset: int = 0):
+        """
+        Find the terminator with a single search, and copy the string once
+        """
+
+        end = _find_terminator(buf, offset)
+        if end < 0:
+            raise ValueError(f'No null terminator was found after offset {offset}')
+
+        new_instance = cls.__new__(cls)
+        new_instance.raw = bytes(memoryview(buf)[offset:end])
+        new_instance._string = None
+
+        return new_instance
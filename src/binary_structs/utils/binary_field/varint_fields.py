@@ -0,0 +1,219 @@
+"""
+This file include the LEB128 variable length integer types that can be used inside of a binary struct.
+
+varint is an unsigned LEB128 integer, svarint is a signed LEB128 integer.
+Their size is only known after they are deserialized, so they make the struct dynamic.
+
+Runs of varints can be decoded at once using decode_varints.
+"""
+
+import re
+
+from typing import List, Tuple
+
+
+# A varint is a run of bytes with the continuation bit set, and a byte without it
+VARINT_RE = re.compile(rb'[\x80-\xff]*[\x00-\x7f]')
+MASK_TABLE = bytes(byte & 0x7f for byte in range(256))
+
+# Masks for packing the 7 bit groups of up to 16 bytes, lanes are doubled on each step
+PACK_STEPS = [
+    (sum(0x7f << (16 * lane) for lane in range(8)), 8, 1),
+    (sum(0x3fff << (32 * lane) for lane in range(4)), 16, 2),
+    (sum(0xfffffff << (64 * lane) for lane in range(2)), 32, 4),
+    ((1 << 56) - 1, 64, 8)
+]
+MAX_PACKED_SIZE = 16
+
+
+def _pack_groups(raw: bytes) -> int:
+    """
+    Returns the unsigned value of an encoded varint.
+    The 7 bit groups are packed with a constant amount of int operations, instead of one per byte
+    """
+
+    if len(raw) == 1:
+        return raw[0]
+
+    if len(raw) > MAX_PACKED_SIZE:
+        return sum((byte & 0x7f) << (7 * index) for index, byte in enumerate(raw))
+
+    value = int.from_bytes(raw.translate(MASK_TABLE), 'little')
+    for mask, lane_shift, shift in PACK_STEPS:
+        value = (value & mask) | ((value & (mask << lane_shift)) >> shift)
+
+    return value
+
+
+def _to_signed(value: int, size: int) -> int:
+    """
+    Sign extend a decoded varint of the given size in bytes
+    """
+
+    bits = 7 * size
+    if value >> (bits - 1):
+        value -= 1 << bits
+
+    return value
+
+
+def encode_varint(value: int, signed: bool = False) -> bytes:
+    """
+    Encode an integer as LEB128
+    """
+
+    if value < 0 and not signed:
+        raise ValueError(f'Unsigned varint cannot hold a negative value ({value})')
+
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+
+        if signed:
+            is_last = (value == 0 and not byte & 0x40) or (value == -1 and byte & 0x40)
+
+        else:
+            is_last = value == 0
+
+        if is_last:
+            encoded.append(byte)
+            return bytes(encoded)
+
+        encoded.append(byte | 0x80)
+
+
+def decode_varints(buf, offset: int = 0, count: int = None, signed: bool = False) -> Tuple[List[int], int]:
+    """
+    Decode a run of varints from the buffer, until count varints were decoded or the buffer ended.
+    The varints are found using a single regex scan, returns the values and the offset after them
+    """
+
+    values = []
+    for match in VARINT_RE.finditer(buf, offset):
+        if match.start() != offset or len(values) == count:
+            break
+
+        raw = match.group()
+        value = _pack_groups(raw)
+        values.append(_to_signed(value, len(raw)) if signed else value)
+        offset = match.end()
+
+    if count is not None and len(values) != count:
+        raise ValueError(f'Expected {count} varints, found {len(values)} before offset {offset}')
+
+    if count is None and offset != memoryview(buf).nbytes:
+        raise ValueError(f'Unterminated varint at offset {offset}')
+
+    return values, offset
+
+
+class VarIntField:
+    """
+    Base class of the LEB128 integer types
+    """
+
+    __slots__ = ('_value', '_size')
+
+    _is_binary_field = True
+    static_size = 0
+    is_dynamic = True
+    signed = False
+
+    def __init__(self, value: int = 0):
+        self.value = getattr(value, 'value', value)
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @value.setter
+    def value(self, value: int):
+        if value < 0 and not self.signed:
+            raise ValueError(f'Unsigned varint cannot hold a negative value ({value})')
+
+        self._value = value
+        self._size = None
+
+    @property
+    def size_in_bytes(self) -> int:
+        if self._size is None:
+            self._size = len(bytes(self))
+
+        return self._size
+
+    def _bs_size(self) -> int:
+        return self.size_in_bytes
+
+    def __bytes__(self) -> bytes:
+        return encode_varint(self._value, self.signed)
+
+    def __int__(self) -> int:
+        return self._value
+
+    __index__ = __int__
+
+    def __eq__(self, other) -> bool:
+        return self._value == getattr(other, 'value', other)
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __str__(self) -> str:
+        return str(self._value)
+
+    def to_python(self) -> int:
+        return self._value
+
+    @classmethod
+    def from_python(cls, value: int):
+        return cls(value)
+
+    @classmethod
+    def _from_decoded(cls, value: int, size: int):
+        new_instance = cls.__new__(cls)
+        new_instance._value = value
+        new_instance._size = size
+
+        return new_instance
+
+    @classmethod
+    def deserialize(cls, buf, offset: int = 0):
+        match = VARINT_RE.match(buf, offset)
+        if match is None:
+            raise ValueError(f'Unterminated varint at offset {offset}')
+
+        raw = match.group()
+        value = _pack_groups(raw)
+
+        return cls._from_decoded(_to_signed(value, len(raw)) if cls.signed else value, len(raw))
+
+    @classmethod
+    def deserialize_run(cls, buf, offset: int = 0, count: int = None) -> Tuple[list, int]:
+        """
+        Deserialize a run of varints at once, returns the instances and the offset after them
+        """
+
+        start = offset
+        values, end = decode_varints(buf, offset, count, cls.signed)
+
+        # Sizes are computed lazily, unless the run is made of single bytes
+        size = 1 if end - start == len(values) else None
+        return [cls._from_decoded(value, size) for value in values], end
+
+
+class varint(VarIntField):
+    """
+    An unsigned LEB128 integer
+    """
+
+    __slots__ = ()
+
+
+class svarint(VarIntField):
+    """
+    A signed LEB128 integer
+    """
+
+    __slots__ = ()
+    signed = True
@@ -4,87 +4,269 @@ This file implements BinaryBuffer class.
 The BinaryBuffer expands the API of ctypes's buffers.
 """
 
+import sys
+import struct
+
+from ctypes import c_uint8, _SimpleCData
 from functools import lru_cache
 from typing import Iterable
 
 
+NATIVE_BYTEORDER = '<' if sys.byteorder == 'little' else '>'
+INTEGER_FORMATS = 'bBhHiIlLqQnN'
+
+
 class BufferField:
     """
     Deperecated, used for backwards-compatibility
     """
 
 
-@lru_cache
-def new_binary_buffer(underlying_type: type, size: int):
+def _get_memory_layout(format: str, itemsize: int) -> tuple:
     """
-    Generate a new binary buffer.
-    A binary buffer is a wrapper to ctypes buffers
+    Returns the byte order and item size of an integer memoryview format.
+    Returns None for formats that are not integers.
     """
 
-    if hasattr(underlying_type, f'_{underlying_type.__name__}__is_binary_struct'):
-        # PATCH, return a tuple with empty instances in order to support a list of binary structs API
-        class BinaryTuple(tuple):
-            _is_binary_field = True
-            element_type = underlying_type
-            static_size = size * underlying_type.static_size
-            size_in_bytes = size * underlying_type.static_size
+    if format.lstrip('@=<>!') not in INTEGER_FORMATS:
+        return None
+
+    # Byte order is meaningless for single bytes
+    if itemsize == 1:
+        return ('', 1)
+
+    byteorder = {'<': '<', '>': '>', '!': '>'}.get(format[0], NATIVE_BYTEORDER)
+
+    return (byteorder, itemsize)
+
+
+def _is_raw_compatible(value, underlying_type: type) -> bool:
+    """
+    Returns if value exposes memory with the same layout as a buffer of underlying_type,
+    meaning that it can be copied as is, without converting each element.
+    For example, bytes for a buffer of uint8_t, or a buffer of the same element type.
+    """
+
+    if isinstance(value, (list, tuple, range, _SimpleCData)) or not hasattr(underlying_type, 'FORMAT'):
+        return False
+
+    try:
+        memory = memoryview(value)
+
+    except TypeError:
+        return False
+
+    layout = _get_memory_layout(memory.format, memory.itemsize)
 
-            def __new__(cls, *iterable, **kwargs):
-                init_arr = []
+    return layout is not None and \
+           layout == _get_memory_layout(underlying_type.FORMAT, underlying_type.static_size)
 
-                for element in iterable:
-                    if isinstance(element, underlying_type):
-                        init_arr.append(element)
 
-                    elif getattr(type(element), 'binary_fields', {}) == underlying_type.binary_fields:
-                        init_arr.append(element)
+def _build_struct_element(underlying_type: type, element):
+    """
+    Build an element for a buffer of binary structs
+    """
+
+    if isinstance(element, underlying_type):
+        return element
+
+    elif getattr(type(element), 'binary_fields', None) == getattr(underlying_type, 'binary_fields', {}):
+        return element
+
+    # Support args initialization
+    elif isinstance(element, list):
+        return underlying_type(*element)
 
-                    # Support args initialization
-                    elif isinstance(element, list):
-                        init_arr.append(underlying_type(*element))
+    # Support kwargs initialization
+    elif isinstance(element, dict):
+        return underlying_type(**element)
 
-                    # Support kwargs initialization
-                    elif isinstance(element, dict):
-                        init_arr.append(underlying_type(**element))
+    # Try to build new element
+    return underlying_type(element)
 
-                    else:
-                        # Try to build new element
-                        init_arr.append(underlying_type(element))
 
-                # Fill the rest of the buffer with empty instances, by calling _bs_init
-                for _ in range(len(init_arr), size):
-                    new_instance = underlying_type.__new__(underlying_type)
-                    new_instance._bs_init()
-                    init_arr.append(new_instance)
+def _deserialize_buffer(cls: type, buf, offset: int = 0):
+    """
+    Returns a buffer that is a view over the given memory, read-only memory is copied
+    """
+
+    if memoryview(buf).readonly:
+        return cls.from_buffer_copy(buf, offset)
 
-                return super().__new__(cls, init_arr)
+    return cls.from_buffer(buf, offset)
 
 
-            def __bytes__(self) -> bytes:
-                return b''.join(bytes(x) for x in self)
+def _restore_binary_buffer(underlying_type: type, size: int, data: bytes):
+    """
+    Unpickle a binary buffer from its element type, length and memory
+    """
 
+    return new_binary_buffer(underlying_type, size).from_buffer_copy(data)
+
+
+def _new_struct_array(underlying_type: type, size: int):
+    """
+    Generate a new array of binary structs.
+    The array is backed by a single contiguous memory block, and its elements are
+    views over that memory, which are created on first access.
+    """
+
+    element_size = underlying_type.static_size
+
+    # Memory of an element with default values, used to fill the array
+    default_element = underlying_type.__new__(underlying_type)
+    default_element._bs_init()
+    default_memory = underlying_type._bs_bytes(default_element)
+
+    class StructArray(c_uint8 * (size * element_size)):
+        _is_binary_field = True
+        element_type = underlying_type
+        static_size = size * element_size
+        size_in_bytes = size * element_size
 
-            def __str__(self) -> str:
-                return str(bytes(self))
+        def __init__(self, *elements):
+            if len(elements) > size:
+                raise IndexError('too many initializers')
 
+            memory = memoryview(self).cast('B')
+            for index, element in enumerate(elements):
+                memory[index * element_size:(index + 1) * element_size] = \
+                    underlying_type._bs_bytes(_build_struct_element(underlying_type, element))
+
+            # Fill the rest of the array with empty instances at once
+            memory[len(elements) * element_size:] = default_memory * (size - len(elements))
+
+
+        def __len__(self) -> int:
+            return size
+
+
+        def __iter__(self):
+            for index in range(size):
+                yield self[index]
+
+
+        def __getitem__(self, index_or_slice):
+            """
+            Elements are views over the array's memory.
+            Slices are arrays that share the memory of this array
+            """
+
+            if isinstance(index_or_slice, slice):
+                start, stop, step = index_or_slice.indices(size)
+
+                if step == 1:
+                    slice_type = new_binary_buffer(underlying_type, max(stop - start, 0))
+
+                    return slice_type.from_buffer(self, start * element_size)
+
+                return [self[index] for index in range(start, stop, step)]
+
+            index = range(size)[index_or_slice]
+            elements = self.__dict__.setdefault('_elements', {})
+
+            if index not in elements:
+                elements[index] = underlying_type.view(self, index * element_size)
+
+            return elements[index]
+
+
+        def __setitem__(self, index_or_slice, element):
+            """
+            Write the elements into the array's memory, views of the elements see the new values.
+            A slice must be assigned with the same amount of elements
+            """
+
+            if isinstance(index_or_slice, slice):
+                indices = range(*index_or_slice.indices(size))
+                elements = list(element)
+
+                if len(elements) != len(indices):
+                    raise ValueError(f'Can only assign {len(indices)} elements to the slice, got {len(elements)}')
+
+                for index, element in zip(indices, elements):
+                    self[index] = element
+
+                return
+
+            index = range(size)[index_or_slice]
+
+            memoryview(self).cast('B')[index * element_size:(index + 1) * element_size] = \
+                underlying_type._bs_bytes(_build_struct_element(underlying_type, element))
+
+
+        def __eq__(self, other) -> bool:
+            if isinstance(other, StructArray):
+                return memoryview(self) == memoryview(other)
+
+            other = list(other)
+
+            return len(other) == size and all(element == other_element
+                                              for element, other_element in zip(self, other))
+
+
+        def __str__(self) -> str:
+            return str(bytes(self))
 
-            @classmethod
-            def deserialize(cls, buf: bytearray):
-                assert len(buf) >= BinaryTuple.static_size, 'Given buffer is too small!'
 
-                init_arr = []
-                for element_index in range(0, BinaryTuple.static_size, underlying_type.static_size):
-                    init_arr.append(underlying_type.deserialize(buf[element_index:]))
+        def __reduce__(self) -> tuple:
+            return _restore_binary_buffer, (underlying_type, size, bytes(self))
 
-                return cls.__new__(cls, *init_arr)
 
-        return BinaryTuple
+        def to_python(self) -> list:
+            return [element.to_python() for element in self]
+
+
+        @classmethod
+        def from_python(cls, value: Iterable):
+            return cls(*(underlying_type.from_python(element) for element in value))
+
+
+        @classmethod
+        def deserialize(cls, buf: bytearray, offset: int = 0):
+            assert memoryview(buf).nbytes - offset >= StructArray.static_size, 'Given buffer is too small!'
+
+            return _deserialize_buffer(cls, buf, offset)
+
+    return StructArray
+
+
+@lru_cache
+def new_binary_buffer(underlying_type: type, size: int):
+    """
+    Generate a new binary buffer.
+    A binary buffer is a wrapper to ctypes buffers
+    """
+
+    if hasattr(underlying_type, f'_{underlying_type.__name__}__is_binary_struct'):
+        return _new_struct_array(underlying_type, size)
 
     class BinaryBuffer(BufferField, underlying_type * size):
         _is_binary_field = True
         element_type = underlying_type
         static_size = size * underlying_type.static_size
         size_in_bytes = size * underlying_type.static_size
+        # Buffers of bytes are packed as a bytes object
+        FORMAT = underlying_type.FORMAT[0] + str(size) + \
+                 ('s' if underlying_type.FORMAT[1:] == 'B' else underlying_type.FORMAT[1:])
+
+
+        def __init__(self, *args):
+            """
+            Init the buffer with the given elements.
+            A single bytes-like argument with the same memory layout is copied directly
+            """
+
+            if len(args) == 1 and _is_raw_compatible(args[0], underlying_type):
+                memory = memoryview(args[0]).cast('B')
+
+                if len(memory) > BinaryBuffer.static_size:
+                    raise IndexError('too many initializers')
+
+                memoryview(self).cast('B')[:len(memory)] = memory
+
+            else:
+                super().__init__(*args)
 
 
         def __eq__(self, iterable: Iterable) -> bool:
@@ -102,9 +284,17 @@ def new_binary_buffer(underlying_type: type, size: int):
         def __getitem__(self, index_or_slice):
             """
             Return a slice as a binary buffer instead of a list.
+            Contiguous slices are views that share the memory of this buffer
             """
 
             if isinstance(index_or_slice, slice):
+                start, stop, step = index_or_slice.indices(size)
+
+                if step == 1:
+                    slice_type = new_binary_buffer(underlying_type, max(stop - start, 0))
+
+                    return slice_type.from_buffer(self, start * underlying_type.static_size)
+
                 as_list = super().__getitem__(index_or_slice)
 
                 return new_binary_buffer(underlying_type, len(as_list))(*as_list)
@@ -112,10 +302,110 @@ def new_binary_buffer(underlying_type: type, size: int):
             return super().__getitem__(index_or_slice)
 
 
+        def __setitem__(self, index_or_slice, value):
+            """
+            Assign to a contiguous slice by copying the memory of bytes-like values directly
+            """
+
+            if isinstance(index_or_slice, slice) and _is_raw_compatible(value, underlying_type):
+                start, stop, step = index_or_slice.indices(size)
+
+                if step == 1:
+                    element_size = underlying_type.static_size
+                    memoryview(self).cast('B')[start * element_size:max(stop, start) * element_size] = \
+                        memoryview(value).cast('B')
+
+                    return
+
+            super().__setitem__(index_or_slice, value)
+
+
         def __str__(self) -> str:
             return str(bytes(self))
 
 
-    BinaryBuffer.deserialize = BinaryBuffer.from_buffer
+        def __reduce__(self) -> tuple:
+            """
+            Buffer classes are generated, so buffers are pickled as their element type, length and memory
+            """
+
+            return _restore_binary_buffer, (underlying_type, size, bytes(self))
+
+
+        def _bitwise_operation(self, other, operation: str):
+            """
+            Apply a bitwise operation on the whole buffer in place.
+            The buffer is converted into a single integer, so no python loop runs per element.
+
+            other can be an integer, that is applied on each element, or a buffer with the same size in bytes
+            """
+
+            memory = memoryview(self).cast('B')
+            other_value = getattr(other, 'value', other)
+
+            if isinstance(other_value, int):
+                other_memory = bytes(underlying_type(other_value)) * size
+
+            else:
+                other_memory = memoryview(other).cast('B')
+
+            if len(other_memory) != len(memory):
+                raise ValueError(f'Expected a buffer of {len(memory)} bytes, got {len(other_memory)} bytes')
+
+            result = getattr(int, operation)(int.from_bytes(memory, 'little'), int.from_bytes(other_memory, 'little'))
+            memory[:] = result.to_bytes(len(memory), 'little')
+
+            return self
+
+
+        def __iand__(self, other):
+            return self._bitwise_operation(other, '__and__')
+
+
+        def __ior__(self, other):
+            return self._bitwise_operation(other, '__or__')
+
+
+        def __ixor__(self, other):
+            return self._bitwise_operation(other, '__xor__')
+
+
+        def __and__(self, other):
+            return type(self).from_buffer_copy(self)._bitwise_operation(other, '__and__')
+
+
+        def __or__(self, other):
+            return type(self).from_buffer_copy(self)._bitwise_operation(other, '__or__')
+
+
+        def __xor__(self, other):
+            return type(self).from_buffer_copy(self)._bitwise_operation(other, '__xor__')
+
+
+        def __invert__(self):
+            return type(self).from_buffer_copy(self)._bitwise_operation(b'\xff' * BinaryBuffer.static_size, '__xor__')
+
+
+        def to_python(self):
+            """
+            Convert the buffer to bytes for unsigned bytes, or to a list of ints otherwise.
+            The conversion is done in bulk, elements are not accessed one by one.
+            """
+
+            if BinaryBuffer.FORMAT[-1] == 's':
+                return bytes(self)
+
+            return list(struct.unpack_from(BinaryBuffer.FORMAT, self))
+
+
+        @classmethod
+        def from_python(cls, value: Iterable):
+            if _is_raw_compatible(value, underlying_type):
+                return cls(value)
+
+            return cls(*value)
+
+
+    BinaryBuffer.deserialize = classmethod(_deserialize_buffer)
 
     return BinaryBuffer
@@ -1,40 +1,162 @@
 """
 A typed buffer, is a binary buffer that it's size is determined on initialization
+
+When deserializing, the number of elements is taken from a preceding count field if one was given,
+or from the remaining length of the buffer.
 """
 
-from binary_structs.utils.buffers.binary_buffer import BufferField, new_binary_buffer
+from functools import lru_cache
+from typing import Iterable
+
+from binary_structs.utils.buffers.binary_buffer import BufferField, new_binary_buffer, \
+                                                      _is_raw_compatible, _build_struct_element
+
+
+@lru_cache
+def _new_sized_typed_buffer(underlying_type: type, size: int) -> type:
+    """
+    Returns the TypedBuffer type for the given size.
+    The types are cached, to avoid building a new class for every instance
+    """
 
+    return type(f'TypedBuffer_{underlying_type.__name__}_{size}',
+                (new_binary_buffer(underlying_type, size), ),
+                {'__reduce__': _reduce_typed_buffer})
 
-def new_typed_buffer(underlying_type: type) -> type:
+
+def _reduce_typed_buffer(self) -> tuple:
+    """
+    Typed buffers are pickled as their element type, length and memory
+    """
+
+    return _restore_typed_buffer, (self.element_type, len(self), bytes(self))
+
+
+def _restore_typed_buffer(underlying_type: type, size: int, data: bytes):
+    """
+    Unpickle a typed buffer from its element type, length and memory
+    """
+
+    return _new_sized_typed_buffer(underlying_type, size).from_buffer_copy(data)
+
+
+def _restore_struct_list(underlying_type: type, count_field: str, elements: list):
+    return _new_struct_list(underlying_type, count_field)(*elements)
+
+
+def _new_struct_list(underlying_type: type, count_field: str = None) -> type:
+    """
+    Creates a new list of binary structs, whose sizes are only known after they are deserialized.
+    Deserialization walks the buffer once, by offset
+    """
+
+    class StructList(list):
+        _is_binary_field = True
+        element_type = underlying_type
+        static_size = 0
+        is_dynamic = True
+
+        def __init__(self, *elements):
+            super().__init__(_build_struct_element(underlying_type, element) for element in elements)
+
+
+        def __bytes__(self) -> bytes:
+            return b''.join(bytes(element) for element in self)
+
+
+        def __str__(self) -> str:
+            return str(bytes(self))
+
+
+        def __reduce__(self) -> tuple:
+            return _restore_struct_list, (underlying_type, self.count_field, list(self))
+
+
+        @property
+        def size_in_bytes(self) -> int:
+            return sum(element.size_in_bytes for element in self)
+
+
+        def to_python(self) -> list:
+            return [element.to_python() for element in self]
+
+
+        @classmethod
+        def from_python(cls, value: Iterable):
+            return cls(*(underlying_type.from_python(element) for element in value))
+
+
+        @classmethod
+        def deserialize(cls, buf, offset: int = 0, count: int = None):
+            new_instance = cls.__new__(cls)
+
+            # Some types can deserialize a whole run of elements at once
+            if hasattr(underlying_type, 'deserialize_run'):
+                elements, _ = underlying_type.deserialize_run(buf, offset, count)
+                new_instance.extend(elements)
+                return new_instance
+
+            buf_size = memoryview(buf).nbytes
+
+            while len(new_instance) != count and (count is not None or offset < buf_size):
+                element = underlying_type.deserialize(buf, offset)
+                offset += underlying_type._bs_size(element)
+                new_instance.append(element)
+
+            return new_instance
+
+
+    StructList.count_field = count_field
+
+    return StructList
+
+
+def new_typed_buffer(underlying_type: type, count_field: str = None) -> type:
     """
     Creates a new typed buffer with the given element
+
+    If count_field is given, it is the name of a preceding field in the struct,
+    that holds the number of elements in the buffer.
     """
 
+    # Binary structs with a dynamic size can't be placed in a contiguous array
+    if getattr(underlying_type, 'is_dynamic', False):
+        return _new_struct_list(underlying_type, count_field)
+
     class TypedBuffer(BufferField):
         _is_binary_field = True
         element_type = underlying_type
         static_size = 0
+        is_dynamic = True
 
         def __new__(self, *args):
             """
             Create a new binary buffer using the given iterable in *args
+            A single bytes-like argument is copied directly, see BinaryBuffer
             """
 
-            new_cls = type(f'TypedBuffer_{underlying_type.__name__}_{len(args)}',
-                        (new_binary_buffer(underlying_type, len(args)), ),
-                        {})
+            if len(args) == 1 and _is_raw_compatible(args[0], underlying_type):
+                num_of_elements = memoryview(args[0]).nbytes // underlying_type.static_size
+
+                return _new_sized_typed_buffer(underlying_type, num_of_elements)(args[0])
+
+            return _new_sized_typed_buffer(underlying_type, len(args))(*args)
+
+        @classmethod
+        def from_python(cls, value) -> type:
+            if _is_raw_compatible(value, underlying_type):
+                return cls(value)
 
-            return new_cls(*args)
+            return cls(*value)
 
         @classmethod
-        def deserialize(cls, buf) -> type:
-            num_of_elements = len(buf) // underlying_type.static_size
+        def deserialize(cls, buf, offset: int = 0, count: int = None) -> type:
+            if count is None:
+                count = (memoryview(buf).nbytes - offset) // underlying_type.static_size
 
-            new_cls = type(f'TypedBuffer_{underlying_type.__name__}_{num_of_elements}',
-                        (new_binary_buffer(underlying_type, num_of_elements), ),
-                        {})
+            return _new_sized_typed_buffer(underlying_type, count).deserialize(buf, offset)
 
-            return new_cls.deserialize(buf)
 
+    TypedBuffer.count_field = count_field
 
     return TypedBuffer
@@ -0,0 +1,145 @@
+import struct
+import pytest
+
+from binary_structs import binary_struct, binary_union, bits, le_uint8_t, le_uint16_t, le_uint32_t, le_uint64_t, \
+                           be_uint16_t, be_uint32_t, be_uint64_t, get_bits_storage
+from binary_structs.utils.binary_field.base_fields import Endianness
+from conftest import available_decorators
+
+
+@binary_struct
+class Header:
+    version: bits(4)
+    length: bits(4)
+    tos: le_uint8_t
+    flags: bits(3) = 2
+    offset: bits(13)
+
+
+def test_valid_bit_fields_storage():
+    assert list(Header.binary_fields) == ['_version_bits', 'tos', '_flags_bits']
+    assert Header._version_bits_type is le_uint8_t
+    assert Header._flags_bits_type is le_uint16_t
+    assert Header.static_size == 4
+
+
+def test_valid_bit_fields_init():
+    header = Header(4, 5, 1, offset=100)
+
+    assert (header.version, header.length, header.flags, header.offset) == (4, 5, 2, 100)
+    assert bytes(header) == struct.pack('<BBH', 4 | 5 << 4, 1, 2 | 100 << 3)
+
+
+def test_valid_bit_fields_set():
+    header = Header()
+    header.offset = 0x1fff
+    header.version = 0xff
+
+    assert header.flags == 2
+    assert header.offset == 0x1fff
+    assert header.version == 0xf
+    assert header.length == 0
+
+
+def test_valid_bit_fields_set_primitive():
+    header = Header()
+    header.length = le_uint8_t(3)
+
+    assert header.length == 3
+
+
+@pytest.mark.parametrize('decorator, endianness', available_decorators)
+def test_valid_bit_fields_serialization(decorator, endianness):
+    cls = decorator(Header)
+    header = cls(1, 2, 3, 4, 5)
+
+    assert bytes(header) == struct.pack(f'{endianness}BBH', 1 | 2 << 4, 3, 4 | 5 << 3)
+    assert cls.deserialize(bytes(header)) == header
+
+
+def test_valid_bit_fields_view():
+    buf = bytearray(4)
+    header = Header.view(buf)
+
+    header.offset = 1
+
+    assert buf == struct.pack('<BBH', 0, 0, 1 << 3)
+
+
+def test_valid_bit_fields_python_conversion():
+    header = Header(1, 2, 3, 4, 5)
+
+    assert header.to_python() == {'version': 1, 'length': 2, 'tos': 3, 'flags': 4, 'offset': 5}
+    assert dict(header)['offset'] == 5
+    assert Header.from_python(header.to_python()) == header
+    assert Header.from_python({'offset': 1}).flags == 2
+
+
+def test_valid_bit_fields_inheritance():
+    @binary_struct
+    class A(Header):
+        last: bits(1)
+
+    a = A(1, 2, 3, 4, 5, 1)
+
+    assert a.to_python() == {'version': 1, 'length': 2, 'tos': 3, 'flags': 4, 'offset': 5, 'last': 1}
+    assert bytes(a)[-1] == 1
+
+
+def test_valid_bit_fields_new_storage_unit():
+    @binary_struct
+    class A:
+        a: bits(60)
+        b: bits(8)
+
+    assert list(A.binary_fields.values()) == [le_uint64_t, le_uint8_t]
+
+
+def test_valid_bit_fields_storage_size():
+    @binary_struct
+    class A:
+        a: bits(9)
+        b: bits(9)
+
+    assert A.static_size == 4
+    assert A._a_bits_type is le_uint32_t
+
+
+def test_invalid_bit_fields_width():
+    with pytest.raises(ValueError):
+        bits(65)
+
+    with pytest.raises(ValueError):
+        bits(0)
+
+
+def test_invalid_bit_fields_default_value():
+    with pytest.raises(TypeError):
+        @binary_struct
+        class A:
+            a: bits(3) = 'Bad'
+
+
+def test_invalid_bit_fields_in_union():
+    with pytest.raises(TypeError):
+        @binary_union
+        class A:
+            a: bits(3)
+
+
+@pytest.mark.parametrize('width, little, big', [
+    (1, le_uint8_t, le_uint8_t),
+    (9, le_uint16_t, be_uint16_t),
+    (17, le_uint32_t, be_uint32_t),
+    (64, le_uint64_t, be_uint64_t)
+])
+def test_valid_bits_storage_types(width, little, big):
+    assert get_bits_storage(width, Endianness.LITTLE) is little
+    assert get_bits_storage(width, Endianness.BIG) is big
+    assert get_bits_storage(width, Endianness.NONE) is get_bits_storage(width, Endianness.HOST)
+
+
+@pytest.mark.parametrize('width', [0, 65])
+def test_invalid_bits_storage_width(width):
+    with pytest.raises(ValueError):
+        get_bits_storage(width, Endianness.LITTLE)
@@ -0,0 +1,89 @@
+import mmap
+import pytest
+
+from binary_structs import binary_struct, Dispatcher, le_uint8_t, le_uint16_t, le_uint32_t
+
+
+@binary_struct
+class Header:
+    opcode: le_uint8_t
+    length: le_uint16_t
+
+@binary_struct
+class Login:
+    user_id: le_uint32_t
+
+@binary_struct
+class Data:
+    size: le_uint8_t
+    data: [le_uint8_t, 'size']
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = Dispatcher(header=Header, key='opcode')
+    dispatcher.register(1, Login)
+    dispatcher.register(2, Data)
+
+    return dispatcher
+
+
+def test_valid_iter_messages(dispatcher):
+    messages = [(Header(1, 4), Login(1234)), (Header(2, 4), Data(3, [1, 2, 3])), (Header(1, 4), Login(5))]
+    buf = b''.join(bytes(header) + bytes(body) for header, body in messages)
+
+    assert list(dispatcher.iter_messages(buf)) == messages
+
+
+def test_valid_iter_messages_read_only(dispatcher, tmp_path):
+    messages = [(Header(1, 4), Login(1234)), (Header(2, 3), Data(2, [1, 2]))]
+    data = b''.join(bytes(header) + bytes(body) for header, body in messages)
+
+    path = tmp_path / 'messages.bin'
+    path.write_bytes(data)
+
+    assert list(dispatcher.iter_messages(memoryview(data))) == messages
+
+    # The buffer is copied once for all of the messages
+    (_, first), (_, second) = dispatcher.iter_messages(memoryview(data))
+    assert first.__dict__['_bs_origin'][0] is second.__dict__['_bs_origin'][0]
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        assert list(dispatcher.iter_messages(memory)) == messages
+
+
+def test_valid_iter_messages_share_memory(dispatcher):
+    buf = bytearray(bytes(Header(1, 4)) + bytes(Login(1234)))
+
+    _, body = next(dispatcher.iter_messages(buf))
+    buf[3:] = b'\xef\xbe\xad\xde'
+
+    assert body.user_id == 0xdeadbeef
+
+
+def test_valid_parse_message_offset(dispatcher):
+    buf = bytearray(b'\xff' * 2 + bytes(Header(1, 4)) + bytes(Login(7)))
+
+    header, body, offset = dispatcher.parse_message(buf, 2)
+
+    assert header == Header(1, 4)
+    assert body == Login(7)
+    assert offset == len(buf)
+
+
+def test_invalid_unregistered_key(dispatcher):
+    with pytest.raises(KeyError):
+        list(dispatcher.iter_messages(bytes(Header(3, 0))))
+
+
+def test_invalid_register_twice(dispatcher):
+    with pytest.raises(ValueError):
+        dispatcher.register(le_uint8_t(1), Data)
+
+
+def test_invalid_key():
+    with pytest.raises(TypeError):
+        Dispatcher(header=Header, key='nothing')
+
+    with pytest.raises(TypeError):
+        Dispatcher(header=Data, key='data')
@@ -0,0 +1,154 @@
+import pytest
+
+from binary_structs import binary_struct, big_endian, le_uint8_t, le_uint16_t, le_uint32_t
+from conftest import BufferClass
+
+
+@binary_struct
+class Record:
+    a: le_uint16_t
+    b: le_uint8_t
+
+
+@binary_struct
+class TLV:
+    length: le_uint8_t
+    value: [le_uint8_t, 'length']
+
+
+# Fixtures
+@pytest.fixture
+def CountedClassFixture():
+    @binary_struct
+    class CountedClass:
+        count: le_uint8_t
+        records: [Record, 'count']
+        magic: le_uint32_t
+
+    return CountedClass
+
+
+@pytest.fixture
+def RemainingClassFixture():
+    @binary_struct
+    class RemainingClass:
+        magic: le_uint32_t
+        records: [Record]
+
+    return RemainingClass
+
+
+@pytest.fixture
+def TLVListClassFixture():
+    @binary_struct
+    class TLVListClass:
+        count: le_uint8_t
+        tlvs: [TLV, 'count']
+        rest: [TLV]
+
+    return TLVListClass
+
+
+# Tests
+def test_valid_counted_class(CountedClassFixture):
+    a = CountedClassFixture(2, [[1, 2], {'a': 3, 'b': 4}], 0xdeadbeef)
+
+    assert bytes(a) == b'\x02\x01\x00\x02\x03\x00\x04\xef\xbe\xad\xde'
+    assert a.size_in_bytes == 11
+    assert CountedClassFixture.is_dynamic
+
+
+def test_valid_counted_class_deserialize(CountedClassFixture):
+    a = CountedClassFixture.deserialize(bytearray(b'\x02\x01\x00\x02\x03\x00\x04\xef\xbe\xad\xde\xff\xff'))
+
+    assert len(a.records) == 2
+    assert a.records[1] == Record(3, 4)
+    assert a.magic == 0xdeadbeef
+
+
+def test_valid_counted_class_deserialize_empty(CountedClassFixture):
+    a = CountedClassFixture.deserialize(bytearray(b'\x00\xef\xbe\xad\xde'))
+
+    assert len(a.records) == 0
+    assert a.magic == 0xdeadbeef
+
+
+def test_invalid_counted_class_deserialize_too_small(CountedClassFixture):
+    with pytest.raises(AssertionError):
+        CountedClassFixture.deserialize(bytearray(b'\x05\x01\x00\x02'))
+
+
+def test_valid_counted_class_deserialize_is_lazy(CountedClassFixture):
+    a = CountedClassFixture.deserialize(bytearray(b'\x02\x01\x00\x02\x03\x00\x04\xef\xbe\xad\xde'))
+
+    assert a.records[0].a == 1
+    assert list(a.records.__dict__['_elements']) == [0]
+
+
+def test_valid_remaining_class(RemainingClassFixture):
+    a = RemainingClassFixture.deserialize(bytearray(b'\x01\x00\x00\x00' + b'\x01\x00\x02' * 3 + b'\x00'))
+
+    assert len(a.records) == 3
+    assert all(record == Record(1, 2) for record in a.records)
+    assert isinstance(a.records, a.records_type)
+
+
+def test_valid_dynamic_elements(TLVListClassFixture):
+    a = TLVListClassFixture(2, [[1, b'a'], [3, b'xyz']], [[2, b'qq']])
+    data = bytes(a)
+
+    assert data == b'\x02\x01a\x03xyz\x02qq'
+    assert TLVListClassFixture.deserialize(data) == a
+    assert a.size_in_bytes == len(data)
+
+
+def test_valid_dynamic_elements_python_conversion(TLVListClassFixture):
+    a = TLVListClassFixture.deserialize(b'\x01\x02ab\x01c')
+
+    assert a.to_python() == {'count': 1,
+                             'tlvs': [{'length': 2, 'value': b'ab'}],
+                             'rest': [{'length': 1, 'value': b'c'}]}
+    assert TLVListClassFixture.from_python(a.to_python()) == a
+
+
+def test_valid_counted_inherited_count_field(CountedClassFixture):
+    @binary_struct
+    class Base:
+        count: le_uint8_t
+
+    @binary_struct
+    class A(Base):
+        records: [Record, 'count']
+
+    assert A.deserialize(bytearray(b'\x01\x01\x00\x02')).records[0] == Record(1, 2)
+
+
+def test_valid_counted_class_big_endian(CountedClassFixture):
+    cls = big_endian(CountedClassFixture)
+    a = cls.deserialize(bytearray(b'\x01\x00\x01\x02\xde\xad\xbe\xef'))
+
+    assert a.records[0].a == 1
+    assert a.magic == 0xdeadbeef
+
+
+def test_invalid_counted_class_missing_count_field():
+    with pytest.raises(TypeError):
+        @binary_struct
+        class A:
+            records: [Record, 'count']
+
+
+def test_invalid_counted_class_count_field_after():
+    with pytest.raises(TypeError):
+        @binary_struct
+        class A:
+            records: [Record, 'count']
+            count: le_uint8_t
+
+
+def test_invalid_counted_class_count_field_not_integer():
+    with pytest.raises(TypeError):
+        @binary_struct
+        class A:
+            count: BufferClass
+            records: [Record, 'count']
@@ -0,0 +1,130 @@
+import random
+import pytest
+
+from binary_structs import binary_struct, build_index, RecordIndex, RecordFile, char, cstring, le_uint32_t, \
+    le_int16_t
+from conftest import NestedClass
+
+
+@binary_struct
+class Session:
+    session_id: le_uint32_t
+    delta: le_int16_t
+    buf: [le_uint32_t, 2]
+
+
+@binary_struct
+class User:
+    name: char[8]
+    uid: le_uint32_t
+
+
+@binary_struct
+class Message:
+    text: cstring
+
+
+@pytest.fixture
+def sessions():
+    random.seed(0)
+    return [Session(random.randrange(50), random.randrange(-100, 100), [i, i]) for i in range(500)]
+
+
+@pytest.fixture
+def path(tmp_path, sessions):
+    path = tmp_path / 'sessions.bin'
+    path.write_bytes(b''.join(bytes(session) for session in sessions))
+
+    return path
+
+
+@pytest.mark.parametrize('chunk_records', [7, 64, 1000])
+def test_valid_build_index(path, sessions, chunk_records):
+    with build_index(Session, path, key='session_id', chunk_records=chunk_records) as index:
+        assert len(index) == len(sessions)
+
+        for session_id in range(50):
+            expected = [session for session in sessions if session.session_id == session_id]
+
+            assert list(index.lookup_all(session_id)) == expected
+            assert (session_id in index) == bool(expected)
+
+            if expected:
+                assert index.lookup(session_id) == expected[0]
+
+
+def test_valid_index_signed_key(path, sessions):
+    with build_index(Session, path, key='delta', chunk_records=100) as index:
+        session = sessions[123]
+
+        assert session in index.lookup_all(session.delta)
+
+
+def test_valid_index_string_key(tmp_path):
+    users = [User(name, uid) for uid, name in enumerate(['bob', 'alice', 'eve', 'bob', 'mallory', '', 'alice'])]
+    path = tmp_path / 'users.bin'
+    path.write_bytes(b''.join(bytes(user) for user in users))
+
+    with build_index(User, path, key='name', chunk_records=3) as index:
+        assert [user.uid for user in index.lookup_all('bob')] == [0, 3]
+        assert [user.uid for user in index.lookup_all(b'alice')] == [1, 6]
+        assert index.lookup(users[4].name).uid == 4
+        assert index.lookup('').uid == 5
+
+        assert 'eve' in index
+        assert 'ev' not in index
+        assert 'toolongname' not in index
+
+
+def test_valid_index_string_key_ignores_bytes_after_null(tmp_path):
+    path = tmp_path / 'users.bin'
+    path.write_bytes(b'bob\x00junk' + bytes(4) + b'bob\x00\x00\x00\x00\x00' + b'\x01' + bytes(3))
+
+    with build_index(User, path, key='name') as index:
+        assert [user.uid for user in index.lookup_all('bob')] == [0, 1]
+
+
+def test_valid_index_reopen(path, sessions):
+    build_index(Session, path, key='session_id').close()
+
+    with RecordIndex(Session, path, key='session_id') as index:
+        assert index.lookup(sessions[0].session_id).session_id == sessions[0].session_id
+
+
+def test_valid_index_empty(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.touch()
+
+    with build_index(Session, path, key='session_id') as index:
+        assert len(index) == 0
+        assert 5 not in index
+
+
+def test_invalid_index_missing_key(path):
+    with build_index(Session, path, key='session_id') as index:
+        with pytest.raises(KeyError):
+            index.lookup(1000)
+
+
+def test_invalid_index_stale(path):
+    build_index(Session, path, key='session_id').close()
+
+    with RecordFile(Session, path, 'r+') as records:
+        records.append(Session())
+
+    with pytest.raises(ValueError):
+        RecordIndex(Session, path, key='session_id')
+
+
+def test_invalid_index_key(path):
+    with pytest.raises(KeyError):
+        build_index(Session, path, key='unknown')
+
+    with pytest.raises(TypeError):
+        build_index(Session, path, key='buf')
+
+    with pytest.raises(TypeError):
+        build_index(NestedClass, path, key='buffer')
+
+    with pytest.raises(TypeError):
+        build_index(Message, path, key='text')
@@ -109,6 +109,12 @@ def test_valid_class_with_FORMAT_attribute():
         class A:
             FORMAT: uint32_t
 
+def test_invalid_class_with_offsets_attribute():
+    with pytest.raises(AttributeError):
+        @binary_struct
+        class A:
+            offsets: uint32_t
+
 # Nested Args and KWargs
 def test_valid_init_nested_args(NestedClassFixture, BufferClassFixture):
     a = NestedClassFixture(buffer=[5, range(5)])
@@ -1,4 +1,9 @@
+import gc
+import sys
+import types
 import pytest
+import weakref
+import tracemalloc
 
 from copy import deepcopy
 from conftest import BufferClass, EmptyClass, empty_decorator, test_structs
@@ -194,6 +199,56 @@ def test_valid_dict_conversion_inheritence_big(InheritedClassFixture):
     assert dict(inherited) == {'size': be_uint32_t(5), 'buf': list(range(7)) + [0] * 25, 'magic': be_uint32_t(9)}
 
 
+# Python conversion
+@pytest.mark.parametrize('decorator, cls, params', test_params)
+def test_valid_python_conversion(decorator, cls, params):
+    new_cls = decorator(cls)
+    instance = new_cls(**params)
+
+    assert new_cls.from_python(instance.to_python()) == instance
+
+
+def test_valid_to_python_nested(NestedClassFixture):
+    nested = NestedClassFixture(buffer=[5, range(3)], magic=42)
+
+    assert nested.to_python() == {'buffer': {'size': 5, 'buf': bytes(range(3)) + b'\x00' * 29}, 'magic': 42}
+
+
+def test_valid_to_python_inheritence(InheritedClassFixture):
+    inherited = big_endian(InheritedClassFixture)(5, range(7), 9)
+
+    assert inherited.to_python() == {'size': 5, 'buf': bytes(range(7)) + b'\x00' * 25, 'magic': 9}
+
+
+def test_valid_to_python_buffer_of_ints():
+    @binary_struct
+    class A:
+        buf: [be_uint32_t, 3]
+
+    assert A(range(3)).to_python() == {'buf': [0, 1, 2]}
+
+
+def test_valid_from_python_missing_fields(BufferClassFixture):
+    @binary_struct
+    class A:
+        a: le_uint8_t = 5
+        b: le_uint8_t
+
+    assert A.from_python({'b': 3}) == A(5, 3)
+    assert BufferClassFixture.from_python({}) == BufferClassFixture()
+
+
+def test_valid_from_python_dynamic(DynamicClassFixture):
+    a = DynamicClassFixture.from_python({'magic': 3, 'buf': b'abc'})
+
+    assert a == DynamicClassFixture(3, b'abc')
+    assert isinstance(a.buf, a.buf_type)
+
+
+def test_invalid_from_python_wrong_type(SimpleClassFixture):
+    with pytest.raises(TypeError):
+        SimpleClassFixture.from_python({'a': 'string'})
+
 def test_valid_class_static_size(SimpleClassFixture):
     assert SimpleClassFixture.static_size == 1
 
@@ -356,3 +411,124 @@ def test_valid_buffer_class_with_binary_struct_type_deserialize_doesnt_change_si
     buf_cls = BinaryStructBufferClass.deserialize(bytearray(b''.join(bytes(element) for element in elements_arr)))
 
     assert len(buf_cls.buf) == 10
+
+
+# Codegen namespace
+def test_valid_generated_functions_namespace_is_compact(NestedClassFixture):
+    namespace = NestedClassFixture._bs_init.__globals__
+
+    assert NestedClassFixture._bs_bytes.__globals__ is namespace
+    assert 'pytest' not in namespace
+    assert len(namespace) < 10
+
+
+def test_valid_class_is_collected():
+    @binary_struct
+    class A:
+        a: le_uint32_t
+        buf: [le_uint8_t]
+
+    ref = weakref.ref(A)
+    del A
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_valid_class_memory_overhead():
+    # Classes declared in a module with a lot of globals shouldn't pay for them
+    module = types.ModuleType('module_with_many_globals')
+    module.__dict__.update({f'global_{index}': index for index in range(5000)})
+    sys.modules[module.__name__] = module
+
+    num_of_classes = 20
+    classes = []
+
+    try:
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+
+        for _ in range(num_of_classes):
+            cls = type('A', (), {'__module__': module.__name__,
+                                 '__annotations__': {'a': le_uint32_t, 'buf': [le_uint8_t, 4]}})
+            classes.append(binary_struct(cls))
+
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+        del sys.modules[module.__name__]
+
+    assert (after - before) / num_of_classes < 64 * 1024
+
+
+def test_valid_buffer_class_with_binary_struct_python_conversion(BinaryStructBufferClass, BufferClassFixture):
+    buf_cls = BinaryStructBufferClass(buf=[[5, range(2)]])
+    as_python = buf_cls.to_python()
+
+    assert as_python['buf'][0] == BufferClassFixture(5, range(2)).to_python()
+    assert len(as_python['buf']) == 10
+    assert BinaryStructBufferClass.from_python(as_python) == buf_cls
+
+
+def test_valid_buffer_class_with_binary_struct_contiguous(BinaryStructBufferClass, BufferClassFixture):
+    buf_cls = BinaryStructBufferClass(buf=[[1, range(2)], [2, range(3)]])
+
+    assert memoryview(buf_cls.buf).nbytes == BufferClassFixture.static_size * 10
+    assert bytes(buf_cls.buf)[BufferClassFixture.static_size:][:4] == b'\x02\x00\x00\x00'
+
+
+def test_valid_buffer_class_with_binary_struct_element_cached(BinaryStructBufferClass):
+    buf_cls = BinaryStructBufferClass()
+
+    assert buf_cls.buf[3] is buf_cls.buf[3]
+    assert buf_cls.buf[-1] is buf_cls.buf[9]
+
+
+def test_valid_buffer_class_with_binary_struct_element_write_through(BinaryStructBufferClass, BufferClassFixture):
+    buf_cls = BinaryStructBufferClass()
+
+    buf_cls.buf[3].size = 7
+    buf_cls.buf[3].buf = b'abc'
+
+    assert bytes(buf_cls)[BufferClassFixture.static_size * 3:][:7] == b'\x07\x00\x00\x00abc'
+
+
+def test_valid_buffer_class_with_binary_struct_element_assignment(BinaryStructBufferClass, BufferClassFixture):
+    buf_cls = BinaryStructBufferClass()
+    element = buf_cls.buf[2]
+
+    buf_cls.buf[2] = BufferClassFixture(5, range(3))
+    buf_cls.buf[4] = [6, range(4)]
+
+    assert element == BufferClassFixture(5, range(3))
+    assert buf_cls.buf[4] == BufferClassFixture(6, range(4))
+
+
+def test_valid_buffer_class_with_binary_struct_slicing(BinaryStructBufferClass, BufferClassFixture):
+    buf_cls = BinaryStructBufferClass(buf=[[index] for index in range(10)])
+    sub_buf = buf_cls.buf[2:5]
+
+    assert len(sub_buf) == 3
+    assert [element.size.value for element in sub_buf] == [2, 3, 4]
+
+    sub_buf[0] = [0xff]
+    assert buf_cls.buf[2].size == 0xff
+
+
+def test_invalid_buffer_class_with_binary_struct_too_many_elements(BinaryStructBufferClass):
+    with pytest.raises(IndexError):
+        BinaryStructBufferClass(buf=[[0]] * 11)
+
+
+def test_valid_buffer_class_with_binary_struct_deserialize_shares_memory(BinaryStructBufferClass, BufferClassFixture):
+    buf = bytearray(BinaryStructBufferClass.static_size)
+    buf_cls = BinaryStructBufferClass.deserialize(buf)
+
+    buf_cls.buf[1].size = 0xdead
+    assert buf[BufferClassFixture.static_size:][:4] == b'\xad\xde\x00\x00'
+
+    buf[:4] = b'\x05\x00\x00\x00'
+    assert buf_cls.buf[0].size == 5
@@ -0,0 +1,116 @@
+import struct
+import pytest
+
+from functools import reduce
+from binary_structs import binary_struct, le_uint8_t, le_uint16_t, le_uint32_t, PrimitiveTypeField
+from conftest import test_structs, available_decorators, NestedClass, BufferClass, DynamicClass, SimpleClass
+
+
+def get_field(instance, path):
+    return reduce(getattr, path.split('.'), instance)
+
+
+@pytest.mark.parametrize('decorator, _', available_decorators)
+@pytest.mark.parametrize('test_struct, params', test_structs)
+def test_valid_offsets(test_struct, params, decorator, _):
+    cls = decorator(test_struct)
+    a = cls(**params)
+    memory = bytes(a)
+
+    for path, (offset, kind) in cls.offsets.items():
+        field = get_field(a, path)
+        assert isinstance(field, kind) or kind.is_dynamic
+        assert memory[offset:offset + len(bytes(field))] == bytes(field)
+
+
+@pytest.mark.parametrize('decorator, _', available_decorators)
+@pytest.mark.parametrize('test_struct, params', test_structs)
+def test_valid_peek(test_struct, params, decorator, _):
+    cls = decorator(test_struct)
+    a = cls(**params)
+    memory = bytes(a)
+
+    for path, (_, kind) in cls.offsets.items():
+        if issubclass(kind, PrimitiveTypeField):
+            assert cls.peek(memory, path) == get_field(a, path).value
+
+
+def test_valid_nested_offsets():
+    assert list(NestedClass.offsets) == ['buffer', 'buffer.size', 'buffer.buf', 'magic']
+    assert NestedClass.offsets['buffer.buf'][0] == 4
+    assert NestedClass.offsets['magic'] == (36, le_uint32_t)
+
+
+def test_valid_dynamic_offsets():
+    @binary_struct
+    class A:
+        magic: le_uint8_t
+        buf: [le_uint8_t]
+        tail: le_uint8_t
+
+    assert list(A.offsets) == ['magic', 'buf']
+
+    with pytest.raises(KeyError):
+        A.peek(b'\x00', 'tail')
+
+
+def test_valid_peek_buffer():
+    memory = bytes(NestedClass(BufferClass(3, range(32)), 5))
+
+    assert NestedClass.peek(memory, 'buffer.buf') == bytes(range(32))
+    assert NestedClass.peek(memory, 'buffer') == BufferClass(3, range(32))
+
+
+def test_valid_peek_primitive_buffer():
+    @binary_struct
+    class A:
+        magic: le_uint8_t
+        values: [le_uint16_t, 3]
+
+    memory = bytes(A(1, [1, 2, 3]))
+
+    assert A.peek(memory, 'values') == [1, 2, 3]
+
+
+def test_valid_peek_offset():
+    memory = b'\xff' * 3 + struct.pack('<BI', 7, 0xdeadbeef)
+
+    assert DynamicClass.peek(memoryview(memory)[3:], 'magic') == 7
+    assert NestedClass.peek(b'\x00' * 40, 'magic') == 0
+
+
+def test_valid_poke():
+    memory = bytearray(bytes(NestedClass()))
+
+    NestedClass.poke(memory, 'buffer.size', 5)
+    NestedClass.poke(memory, 'magic', le_uint32_t(0xdeadbeef))
+    NestedClass.poke(memory, 'buffer.buf', range(3))
+
+    assert NestedClass.deserialize(memory) == NestedClass(BufferClass(5, range(3)), 0xdeadbeef)
+
+
+def test_valid_poke_nested():
+    memory = bytearray(bytes(NestedClass()))
+
+    NestedClass.poke(memory, 'buffer', BufferClass(7, [1]))
+
+    assert NestedClass.peek(memory, 'buffer.size') == 7
+    assert NestedClass.peek(memory, 'buffer.buf')[:2] == b'\x01\x00'
+
+
+def test_invalid_poke_readonly():
+    with pytest.raises(TypeError):
+        NestedClass.poke(bytes(NestedClass()), 'magic', 5)
+
+
+def test_invalid_peek_unknown_field():
+    with pytest.raises(KeyError):
+        NestedClass.peek(bytes(NestedClass()), 'nothing')
+
+
+def test_valid_peek_struct_array_read_only():
+    @binary_struct
+    class Pairs:
+        items: [SimpleClass, 2]
+
+    assert list(Pairs.peek(bytes(Pairs([1, 2])), 'items')) == [SimpleClass(1), SimpleClass(2)]
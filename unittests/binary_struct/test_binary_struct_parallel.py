@@ -0,0 +1,75 @@
+import pytest
+
+from conftest import BufferClass, NestedClass, DynamicClass
+
+
+@pytest.fixture
+def records():
+    return [NestedClass(BufferClass(i, range(i % 32)), i) for i in range(100)]
+
+
+@pytest.fixture
+def data(records):
+    return b''.join(bytes(record) for record in records)
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3])
+def test_valid_deserialize_many_buffer(data, records, workers):
+    assert NestedClass.deserialize_many(data, workers=workers) == records
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_valid_deserialize_many_path(tmp_path, data, records, workers):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(data)
+
+    assert NestedClass.deserialize_many(path, workers=workers) == records
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_valid_deserialize_many_empty(tmp_path, workers):
+    path = tmp_path / 'empty.bin'
+    path.touch()
+
+    assert len(NestedClass.deserialize_many(b'', workers=workers)) == 0
+    assert len(NestedClass.deserialize_many(path, workers=workers)) == 0
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_invalid_deserialize_many_size(tmp_path, data, workers):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(data + b'\x00')
+
+    with pytest.raises(ValueError):
+        NestedClass.deserialize_many(data + b'\x00', workers=workers)
+
+    with pytest.raises(ValueError):
+        NestedClass.deserialize_many(path, workers=workers)
+
+
+def test_invalid_deserialize_many_dynamic():
+    with pytest.raises(TypeError):
+        DynamicClass.deserialize_many(b'', workers=2)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_valid_deserialize_many_array(tmp_path, data, records, workers):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(data)
+
+    for source in (data, path):
+        array = NestedClass.deserialize_many(source, workers=workers)
+
+        assert len(array) == len(records)
+        assert array[7] == records[7]
+        assert bytes(array) == data
+
+
+def test_valid_deserialize_many_doesnt_modify_source(tmp_path, data):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(data)
+
+    NestedClass.deserialize_many(path, workers=1)
+    NestedClass.deserialize_many(bytearray(data), workers=2)
+
+    assert path.read_bytes() == data
@@ -0,0 +1,95 @@
+import pytest
+
+from binary_structs import binary_struct, cstring, le_uint8_t, le_uint16_t, le_uint32_t
+from conftest import BufferClass, DynamicClass
+
+
+@binary_struct
+class Frame:
+    count: le_uint16_t
+    data: [le_uint8_t, 'count']
+    name: cstring
+
+
+frames = [Frame(3, [1, 2, 3], 'a'), Frame(0, [], ''), Frame(5, range(5), 'hello')]
+
+
+def fragments(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('fragment_size', [1, 2, 5, 100])
+def test_valid_parser_static(fragment_size):
+    buffers = [BufferClass(i, range(i)) for i in range(10)]
+    parser = BufferClass.parser()
+    parsed = []
+
+    for fragment in fragments(b''.join(bytes(buf) for buf in buffers), fragment_size):
+        parser.feed(fragment)
+        parsed.extend(parser)
+
+    assert parsed == buffers
+    assert parser.pending == 0
+
+
+@pytest.mark.parametrize('fragment_size', [1, 3, 7, 100])
+def test_valid_parser_dynamic(fragment_size):
+    parser = Frame.parser()
+    parsed = []
+
+    for fragment in fragments(b''.join(bytes(frame) for frame in frames), fragment_size):
+        parser.feed(fragment)
+        parsed.extend(parser)
+
+    assert parsed == frames
+
+
+def test_valid_parser_partial():
+    parser = Frame.parser()
+    data = bytes(frames[0])
+
+    parser.feed(data[:-1])
+
+    assert list(parser) == []
+    assert parser.pending == len(data) - 1
+
+    parser.feed(data[-1:])
+
+    assert list(parser) == [frames[0]]
+
+
+def test_valid_parser_buffer_growth():
+    buffers = [BufferClass(i, range(32)) for i in range(100)]
+    parser = BufferClass.parser(buffer_size=40)
+    parsed = []
+
+    for buf in buffers:
+        parser.feed(bytes(buf)[:10])
+        parsed.extend(parser)
+        parser.feed(bytes(buf)[10:])
+        parsed.extend(parser)
+
+    # Parsed instances keep their memory after the buffer was replaced
+    assert parsed == buffers
+
+
+def test_valid_parser_big_fragment():
+    data = b''.join(bytes(BufferClass(i)) for i in range(1000))
+    parser = BufferClass.parser(buffer_size=16)
+    parser.feed(data)
+
+    assert [buf.size.value for buf in parser] == list(range(1000))
+
+
+def test_invalid_parser_undelimited_struct():
+    with pytest.raises(TypeError):
+        DynamicClass.parser()
+
+
+def test_invalid_parser_empty_struct():
+    @binary_struct
+    class A:
+        pass
+
+    with pytest.raises(TypeError):
+        A.parser()
@@ -0,0 +1,132 @@
+import copy
+import pickle
+import pytest
+
+from binary_structs import binary_struct, binary_union, big_endian, bits, char, cstring, varint, \
+                           le_uint8_t, le_uint16_t, le_uint32_t
+from binary_structs.utils import new_binary_buffer, new_typed_buffer
+from conftest import test_structs, BufferClass, NestedClass, DynamicClass
+
+
+@big_endian
+@binary_struct
+class MixedClass:
+    name: char[8]
+    label: cstring
+    flags: bits(3)
+    kind: bits(5)
+    items: [BufferClass, 2]
+    count: varint
+    values: [le_uint16_t]
+
+
+@binary_struct
+class DynamicElementClass:
+    size: varint
+    values: [le_uint8_t, 2]
+
+
+@binary_struct
+class DynamicListClass:
+    elements: [DynamicElementClass]
+
+
+@binary_struct
+class CustomBytesClass:
+    x: le_uint8_t
+
+    def __bytes__(self):
+        return b'hdr' + CustomBytesClass._bs_bytes(self)
+
+
+@binary_union
+class PickledUnion:
+    raw: [le_uint8_t, 4]
+    value: le_uint32_t
+
+
+def _round_trip(value):
+    return pickle.loads(pickle.dumps(value))
+
+
+@pytest.mark.parametrize('cls, cls_params', test_structs)
+def test_valid_pickle_struct(cls, cls_params):
+    instance = cls(**cls_params)
+    restored = _round_trip(instance)
+
+    assert type(restored) is cls
+    assert restored == instance
+    assert bytes(restored) == bytes(instance)
+
+
+def test_valid_pickle_mixed_fields():
+    instance = MixedClass('name', 'label', 5, 17, [{'size': 1, 'buf': [2]}], 300, [1, 2, 3])
+    restored = _round_trip(instance)
+
+    assert restored == instance
+    assert restored.kind == 17
+    assert restored.label == 'label'
+
+
+def test_valid_pickle_dynamic_struct_list():
+    instance = DynamicListClass([DynamicElementClass(1000, [1, 2]), DynamicElementClass(1, [3, 4])])
+
+    assert _round_trip(instance) == instance
+    assert _round_trip(instance.elements) == instance.elements
+
+
+def test_valid_pickle_view_is_copied():
+    buf = bytearray(bytes(NestedClass(magic=5)))
+    view = NestedClass.deserialize(buf)
+    restored = _round_trip(view)
+
+    buf[-4:] = b'\x00' * 4
+
+    assert view.magic == 0
+    assert restored.magic == 5
+
+
+def test_valid_pickle_keeps_attributes():
+    instance = NestedClass(magic=5)
+    instance.extra = [1, 2]
+
+    assert _round_trip(instance).extra == [1, 2]
+    assert copy.copy(instance).extra is instance.extra
+    assert copy.deepcopy(instance).extra == [1, 2]
+    assert copy.deepcopy(instance).extra is not instance.extra
+    assert copy.deepcopy(instance) == instance
+
+
+def test_valid_pickle_is_compact():
+    instance = DynamicClass(1, range(200))
+
+    assert len(pickle.dumps(instance)) < bytes(instance).__len__() + 100
+
+
+def test_valid_pickle_custom_bytes():
+    restored = _round_trip(CustomBytesClass(5))
+
+    assert restored.x == 5
+    assert bytes(restored) == b'hdr\x05'
+
+
+def test_valid_pickle_union():
+    payload = PickledUnion(value=0x01020304)
+    restored = _round_trip(payload)
+
+    assert type(restored) is PickledUnion
+    assert restored.value == 0x01020304
+
+
+@pytest.mark.parametrize('buffer', [
+    new_binary_buffer(le_uint32_t, 3)(1, 2, 3),
+    new_binary_buffer(BufferClass, 2)(BufferClass(5)),
+    new_typed_buffer(le_uint16_t)(1, 2, 3, 4),
+    new_typed_buffer(BufferClass)(BufferClass(1), BufferClass(2)),
+    char[4]('abc')
+])
+def test_valid_pickle_buffers(buffer):
+    restored = _round_trip(buffer)
+
+    assert type(restored) is type(buffer)
+    assert bytes(restored) == bytes(buffer)
@@ -0,0 +1,121 @@
+import io
+import pytest
+
+from binary_structs import RecordFile
+from conftest import BufferClass, NestedClass, DynamicClass
+
+
+@pytest.fixture
+def records():
+    return [NestedClass(BufferClass(i, range(i)), i) for i in range(10)]
+
+
+@pytest.fixture
+def path(tmp_path, records):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(b''.join(bytes(record) for record in records))
+
+    return path
+
+
+def test_valid_record_file_read(path, records):
+    with RecordFile(NestedClass, path) as record_file:
+        assert len(record_file) == len(records)
+        assert record_file[3] == records[3]
+        assert record_file[-1] == records[-1]
+        assert record_file[2:8:3] == records[2:8:3]
+        assert list(record_file) == records
+
+
+def test_valid_record_file_empty(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.touch()
+
+    with RecordFile(NestedClass, path, 'r+') as record_file:
+        assert len(record_file) == 0
+        assert list(record_file) == []
+
+        record_file.append(NestedClass(magic=7))
+        assert record_file[0].magic == 7
+
+
+def test_valid_record_file_append(path, records):
+    with RecordFile(NestedClass, path, 'r+') as record_file:
+        first = record_file[0]
+        record_file.append(NestedClass(magic=100))
+
+        assert len(record_file) == len(records) + 1
+        assert record_file[-1].magic == 100
+        assert first == records[0]
+
+    assert len(RecordFile(NestedClass, path)) == len(records) + 1
+
+
+def test_valid_record_file_append_doesnt_modify_the_record(path, records):
+    record = NestedClass(magic=100)
+    buffer = record.buffer
+
+    with RecordFile(NestedClass, path, 'r+') as record_file:
+        record_file.append(record)
+        buffer.size = 7
+
+        assert record.buffer is buffer
+        assert record_file[-1] == NestedClass(magic=100)
+
+
+def test_valid_record_file_write_through(path, records):
+    with RecordFile(NestedClass, path, 'r+') as record_file:
+        record_file[4].magic = 1234
+        record_file[4].buffer.buf[0] = 99
+        record_file.flush()
+
+    with RecordFile(NestedClass, path) as record_file:
+        assert record_file[4].magic == 1234
+        assert record_file[4].buffer.buf[0] == 99
+
+
+def test_valid_record_file_read_is_private(path, records):
+    with RecordFile(NestedClass, path) as record_file:
+        record_file[4].magic = 1234
+
+    with RecordFile(NestedClass, path) as record_file:
+        assert record_file[4] == records[4]
+
+
+def test_invalid_record_file_index(path, records):
+    with RecordFile(NestedClass, path) as record_file:
+        with pytest.raises(IndexError):
+            record_file[len(records)]
+
+        with pytest.raises(IndexError):
+            record_file[-len(records) - 1]
+
+
+def test_invalid_record_file_append_read_only(path):
+    with RecordFile(NestedClass, path) as record_file:
+        with pytest.raises(io.UnsupportedOperation):
+            record_file.append(NestedClass())
+
+
+def test_invalid_record_file_append_type(path):
+    with RecordFile(NestedClass, path, 'r+') as record_file:
+        with pytest.raises(TypeError):
+            record_file.append(BufferClass())
+
+
+def test_invalid_record_file_size(path):
+    with open(path, 'ab') as f:
+        f.write(b'\x00')
+
+    with pytest.raises(ValueError):
+        RecordFile(NestedClass, path)
+
+
+def test_invalid_record_file_dynamic(path):
+    with pytest.raises(TypeError):
+        RecordFile(DynamicClass, path)
+
+
+def test_invalid_record_file_mode(path):
+    with pytest.raises(ValueError):
+        RecordFile(NestedClass, path, 'w')
@@ -0,0 +1,127 @@
+import socket
+import pytest
+
+from binary_structs import BufferPool
+from conftest import BufferClass, DynamicClass
+
+
+@pytest.fixture
+def stream():
+    first, second = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with first, second:
+        yield first, second
+
+
+@pytest.fixture
+def datagram():
+    first, second = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    with first, second:
+        yield first, second
+
+
+def test_valid_recv_stream(stream):
+    sender, receiver = stream
+    sender.sendall(bytes(BufferClass(5, range(5))))
+
+    assert BufferClass.recv(receiver) == BufferClass(5, range(5))
+
+
+def test_valid_recv_short_reads(stream):
+    sender, receiver = stream
+    data = bytes(BufferClass(5, range(5)))
+
+    for i in range(0, len(data), 3):
+        sender.send(data[i:i + 3])
+
+    assert BufferClass.recv(receiver) == BufferClass(5, range(5))
+
+
+def test_invalid_recv_closed(stream):
+    sender, receiver = stream
+    sender.sendall(b'\x00' * 3)
+    sender.close()
+
+    with pytest.raises(ConnectionError):
+        BufferClass.recv(receiver)
+
+
+def test_valid_recv_pool(datagram):
+    sender, receiver = datagram
+    pool = BufferPool.for_struct(BufferClass, capacity=2)
+
+    sender.send(bytes(BufferClass(1)))
+    first = BufferClass.recv(receiver, pool=pool)
+    slab = first.as_memoryview().obj
+
+    assert first == BufferClass(1)
+    assert pool.available == 1
+
+    pool.release(first)
+    sender.send(bytes(BufferClass(2)))
+    second = BufferClass.recv(receiver, pool=pool)
+
+    # The slab was reused
+    assert second.as_memoryview().obj is slab
+    assert second == BufferClass(2)
+
+
+def test_invalid_recv_short_datagram(datagram):
+    sender, receiver = datagram
+    pool = BufferPool.for_struct(BufferClass, capacity=1)
+    sender.send(b'\x00' * 3)
+
+    with pytest.raises(ValueError):
+        BufferClass.recv(receiver, pool=pool)
+
+    assert pool.available == 1
+
+
+def test_valid_recv_dynamic_datagram(datagram):
+    sender, receiver = datagram
+    sender.send(bytes(DynamicClass(1, range(10))))
+
+    assert DynamicClass.recv(receiver) == DynamicClass(1, range(10))
+
+
+def test_invalid_recv_dynamic_stream(stream):
+    with pytest.raises(TypeError):
+        DynamicClass.recv(stream[1])
+
+
+def test_valid_pool_acquire_and_release():
+    pool = BufferPool(16, capacity=1)
+
+    slab = pool.acquire()
+    extra = pool.acquire()
+    pool.release(slab)
+    pool.release(extra)
+
+    assert len(extra) == 16
+    assert pool.available == 1
+    assert pool.acquire() is slab
+
+
+def test_invalid_pool_release():
+    with pytest.raises(ValueError):
+        BufferPool(16).release(bytearray(8))
+
+
+def test_invalid_pool_double_release():
+    pool = BufferPool(16, capacity=2)
+    slab = pool.acquire()
+    pool.release(slab)
+
+    with pytest.raises(ValueError):
+        pool.release(slab)
+
+    assert pool.acquire() is slab
+    assert pool.acquire() is not slab
+
+
+def test_invalid_recv_small_pool_releases_slab(stream):
+    pool = BufferPool(4, capacity=1)
+
+    with pytest.raises(ValueError):
+        BufferClass.recv(stream[1], pool=pool)
+
+    assert pool.available == 1
@@ -0,0 +1,171 @@
+import pytest
+
+from binary_structs import binary_struct, binary_union, big_endian, le_uint8_t, le_uint16_t, le_uint32_t
+from conftest import BufferClass, NestedClass, DynamicClass
+
+
+@big_endian
+@binary_struct
+class Header:
+    opcode: le_uint8_t
+    seq: le_uint32_t
+
+
+@binary_struct
+class Packet:
+    hdr: Header
+    ts: le_uint32_t
+    data: [le_uint16_t, 2]
+
+
+@pytest.fixture
+def packets():
+    return [Packet(Header(i % 3, i), 1000 + i, [i, i + 1]) for i in range(30)]
+
+
+@pytest.fixture
+def data(packets):
+    return b''.join(bytes(packet) for packet in packets)
+
+
+def test_valid_scan_fields(data, packets):
+    result = list(Packet.scan(data, where={'hdr.opcode': 1}, fields=['hdr.seq', 'ts', 'data']))
+
+    assert result == [{'hdr.seq': p.hdr.seq.value, 'ts': p.ts.value, 'data': [p.data[0], p.data[1]]}
+                      for p in packets if p.hdr.opcode == 1]
+
+
+def test_valid_scan_records(data, packets):
+    assert list(Packet.scan(data, where={'hdr.opcode': 2})) == [p for p in packets if p.hdr.opcode == 2]
+
+
+def test_valid_scan_records_dont_modify_the_source():
+    data = bytearray(bytes(Packet()) * 3)
+    for packet in Packet.scan(data):
+        packet.ts = 5
+        assert packet.ts == 5
+
+    assert data == bytes(Packet()) * 3
+
+
+@pytest.mark.parametrize('condition', [{0, 2}, range(0, 3, 2), lambda opcode: opcode != 1])
+def test_valid_scan_conditions(data, packets, condition):
+    result = list(Packet.scan(data, where={'hdr.opcode': condition}, fields=['hdr.seq']))
+
+    assert result == [{'hdr.seq': p.hdr.seq.value} for p in packets if p.hdr.opcode != 1]
+
+
+def test_valid_scan_multiple_conditions(data):
+    result = list(Packet.scan(data, where={'hdr.opcode': 0, 'ts': lambda ts: ts > 1020}, fields=['hdr.seq']))
+
+    assert result == [{'hdr.seq': 21}, {'hdr.seq': 24}, {'hdr.seq': 27}]
+
+
+def test_valid_scan_file(tmp_path, data, packets):
+    path = tmp_path / 'packets.bin'
+    path.write_bytes(data)
+
+    assert list(Packet.scan(path, where={'hdr.seq': 7})) == [packets[7]]
+
+    with open(path, 'rb') as f:
+        assert list(Packet.scan(f, where={'hdr.seq': 8}, fields=['ts'])) == [{'ts': 1008}]
+
+
+def test_valid_scan_empty(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.touch()
+
+    assert list(Packet.scan(path)) == []
+    assert list(Packet.scan(b'')) == []
+
+
+def test_valid_scan_stop_early(tmp_path, data):
+    path = tmp_path / 'packets.bin'
+    path.write_bytes(data)
+
+    scan = Packet.scan(path)
+    next(scan)
+    scan.close()
+
+
+def test_valid_scan_nested_buffer():
+    data = b''.join(bytes(NestedClass(BufferClass(i, b'abc'), i)) for i in range(3))
+
+    assert list(NestedClass.scan(data, where={'magic': 1}, fields=['buffer.buf'])) == \
+        [{'buffer.buf': b'abc' + b'\x00' * 29}]
+
+
+def test_invalid_scan_unknown_field(data):
+    with pytest.raises(KeyError):
+        list(Packet.scan(data, where={'hdr.kind': 1}))
+
+
+def test_invalid_scan_struct_field(data):
+    with pytest.raises(TypeError):
+        list(Packet.scan(data, fields=['hdr']))
+
+
+def test_invalid_scan_size(data):
+    with pytest.raises(ValueError):
+        list(Packet.scan(data + b'\x00'))
+
+
+def test_invalid_scan_dynamic():
+    with pytest.raises(TypeError):
+        list(DynamicClass.scan(b''))
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_valid_sort_records(data, packets, reverse):
+    result = Packet.sort_records(data, key='hdr.opcode', reverse=reverse)
+    expected = sorted(packets, key=lambda packet: packet.hdr.opcode.value, reverse=reverse)
+
+    assert isinstance(result, bytearray)
+    assert result == b''.join(bytes(packet) for packet in expected)
+
+
+def test_valid_sort_records_file(tmp_path, data, packets):
+    path = tmp_path / 'packets.bin'
+    path.write_bytes(bytes(Packet.sort_records(data, key='ts', reverse=True)))
+
+    assert Packet.sort_records(path, key='hdr.seq') == data
+
+
+def test_valid_group_records(data, packets):
+    groups = Packet.group_records(data, key='hdr.opcode')
+
+    assert list(groups) == [0, 1, 2]
+    assert groups[1] == [index for index, packet in enumerate(packets) if packet.hdr.opcode == 1]
+
+
+def test_valid_group_records_buffer(data):
+    groups = Packet.group_records(data, key='data')
+
+    assert groups[(3, 4)] == [3]
+
+
+def test_invalid_sort_records_struct_field(data):
+    with pytest.raises(TypeError):
+        Packet.sort_records(data, key='hdr')
+
+
+@binary_union
+class Payload:
+    raw: [le_uint8_t, 4]
+    value: le_uint32_t
+    low: le_uint16_t
+
+
+@binary_struct
+class UnionPacket:
+    kind: le_uint8_t
+    payload: Payload
+    ts: le_uint32_t
+
+
+def test_valid_scan_overlapping_fields():
+    data = b''.join(bytes(UnionPacket(i, Payload(value=0x01020300 + i), 1000 + i)) for i in range(3))
+    result = list(UnionPacket.scan(data, where={'payload.low': 0x0301},
+                                   fields=['payload.raw', 'payload.value', 'ts', 'kind']))
+
+    assert result == [{'payload.raw': b'\x01\x03\x02\x01', 'payload.value': 0x01020301, 'ts': 1001, 'kind': 1}]
@@ -0,0 +1,128 @@
+import gc
+import pickle
+import struct
+import weakref
+import pytest
+
+from binary_structs import make_struct, char, le_uint8_t, le_uint32_t, be_uint32_t, Endianness
+from conftest import BufferClass
+
+
+def test_valid_make_struct():
+    cls = make_struct('A', [('magic', le_uint32_t), ('buf', [le_uint8_t, 4])])
+    a = cls(0xdeadbeef, range(4))
+
+    assert bytes(a) == struct.pack('<I4s', 0xdeadbeef, bytes(range(4)))
+    assert cls.static_size == 8
+
+
+def test_valid_make_struct_type_names():
+    cls = make_struct('A', [('magic', 'uint32_t'), ('buf', ['uint8_t'])])
+
+    assert cls.magic_type is le_uint32_t
+    assert cls.buf_type.element_type is le_uint8_t
+
+
+def test_invalid_make_struct_type_name():
+    with pytest.raises(TypeError):
+        make_struct('A', [('magic', 'not_a_type')])
+
+
+def test_valid_make_struct_default_value():
+    cls = make_struct('A', [('magic', le_uint32_t, 5)])
+
+    assert cls().magic == 5
+
+
+def test_valid_make_struct_cached():
+    cls1 = make_struct('A', [('magic', le_uint32_t), ('buf', ['uint8_t', 4], range(2))])
+    cls2 = make_struct('A', (('magic', 'uint32_t'), ('buf', [le_uint8_t, 4], range(2))))
+
+    assert cls1 is cls2
+
+
+def test_valid_make_struct_cache_different_schemas():
+    cls1 = make_struct('A', [('magic', le_uint32_t)])
+
+    assert make_struct('B', [('magic', le_uint32_t)]) is not cls1
+    assert make_struct('A', [('magic', le_uint32_t, 1)]) is not cls1
+    assert make_struct('A', [('magic', le_uint32_t)], endian=Endianness.BIG) is not cls1
+    assert make_struct('A', [('magic', le_uint32_t)], bases=(BufferClass, )) is not cls1
+
+
+def test_valid_make_struct_cache_tags_value_types():
+    cls1 = make_struct('A', [('buf', [le_uint8_t, 4], [1])])
+    cls2 = make_struct('A', [('magic', le_uint32_t, 1)])
+
+    assert make_struct('A', [('buf', [le_uint8_t, 4], (1, ))]) is not cls1
+    assert make_struct('A', [('magic', le_uint32_t, True)]) is not cls2
+
+
+def test_valid_make_struct_cache_is_weak():
+    cls = make_struct('Unused', [('magic', le_uint32_t)])
+    cls_ref = weakref.ref(cls)
+
+    del cls
+    gc.collect()
+
+    assert cls_ref() is None
+
+
+def test_valid_make_struct_bases():
+    cls = make_struct('A', [('magic', le_uint32_t)], bases=(BufferClass, ))
+    a = cls(5, range(3), 0xcafebabe)
+
+    assert isinstance(a, BufferClass)
+    assert a.size_in_bytes == BufferClass.static_size + 4
+
+
+def test_valid_make_struct_nested():
+    cls = make_struct('A', [('nested', BufferClass), ('magic', le_uint32_t)])
+    a = cls([5, range(3)], 7)
+
+    assert a.nested == BufferClass(5, range(3))
+
+
+def test_valid_make_struct_big_endian():
+    cls = make_struct('A', [('magic', le_uint32_t)], endian=Endianness.BIG)
+
+    assert cls.magic_type is be_uint32_t
+    assert bytes(cls(1)) == b'\x00\x00\x00\x01'
+
+
+def test_valid_make_struct_pickle():
+    cls = make_struct('Pickled', [('size', 'uint32_t'), ('data', ['uint8_t', 4])], endian=Endianness.BIG)
+    instance = cls(3, [1, 2, 3, 4])
+    instance.extra = 'extra'
+
+    restored = pickle.loads(pickle.dumps(instance))
+
+    assert type(restored) is cls
+    assert restored == instance
+    assert restored.extra == 'extra'
+    assert pickle.loads(pickle.dumps(cls)) is cls
+
+
+def test_valid_make_struct_pickle_builds_the_class():
+    data = pickle.dumps(make_struct('Rebuilt', [('magic', 'uint32_t')])(7))
+    gc.collect()
+
+    restored = pickle.loads(data)
+
+    assert restored.magic == 7
+    assert type(restored) is make_struct('Rebuilt', [('magic', 'uint32_t')])
+
+
+def test_valid_make_struct_pickle_by_reference():
+    cls = make_struct('Named', [('name', char[4])])
+    instance = cls('abc')
+
+    assert pickle.loads(pickle.dumps(instance)) == instance
+    assert pickle.loads(pickle.dumps(cls)) is cls
+
+
+def test_valid_make_struct_deserialize_many():
+    cls = make_struct('Sample', [('magic', le_uint32_t)])
+    data = b''.join(bytes(cls(i)) for i in range(8))
+
+    assert cls.deserialize_many(data, workers=2) == [cls(i) for i in range(8)]
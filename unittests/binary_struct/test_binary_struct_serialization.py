@@ -1,6 +1,9 @@
+import sys
+import socket
 import struct
 import pytest
 
+from binary_structs import binary_struct, cstring, le_uint8_t, le_uint32_t
 from conftest import EmptyClass, available_decorators, test_structs
 
 # List of struct.pack format, and fitting arguements for the test_structs list
@@ -76,3 +79,285 @@ def test_serialization_and_deserialization(decorator, endianness, cls, cls_param
     binary_struct = new_cls.deserialize(bytearray(bytes(original_struct)))
 
     assert binary_struct == original_struct
+
+
+@pytest.mark.parametrize('decorator, endianness, cls, cls_params, struct_format, struct_params', test_params)
+def test_deserialization_bytes(decorator, endianness, cls, cls_params, struct_format, struct_params):
+    new_cls = decorator(cls)
+    deserialized = new_cls.deserialize(struct.pack(f'{endianness}{struct_format}', *struct_params))
+
+    assert deserialized == new_cls(**cls_params)
+
+
+@pytest.mark.parametrize('decorator, endianness, cls, cls_params, struct_format, struct_params', test_params)
+def test_deserialization_offset(decorator, endianness, cls, cls_params, struct_format, struct_params):
+    new_cls = decorator(cls)
+    buf = bytearray(b'\xff' * 7 + struct.pack(f'{endianness}{struct_format}', *struct_params))
+
+    assert new_cls.deserialize(buf, 7) == new_cls(**cls_params)
+
+
+def test_deserialization_shares_memory(NestedClassFixture):
+    buf = bytearray(NestedClassFixture.static_size)
+    nested = NestedClassFixture.deserialize(buf)
+
+    buf[-4:] = struct.pack('<I', 0xdeadbeef)
+
+    assert nested.magic == 0xdeadbeef
+
+
+def test_deserialization_is_copy_on_assign(NestedClassFixture):
+    buf = bytearray(NestedClassFixture.static_size)
+    nested = NestedClassFixture.deserialize(buf)
+
+    nested.magic = 0xdeadbeef
+    nested.buffer.size = 5
+    nested.buffer = {'buf': b'abc'}
+
+    assert buf == bytes(NestedClassFixture.static_size)
+    assert bytes(nested) == struct.pack('<I32sI', 0, b'abc', 0xdeadbeef)
+
+
+def test_deserialization_copies_only_the_record_from_read_only_memory(NestedClassFixture):
+    data = bytes(1 << 20) + bytes(NestedClassFixture(magic=5))
+    nested = NestedClassFixture.deserialize(memoryview(data), 1 << 20)
+
+    assert nested.magic == 5
+    assert len(nested.__dict__['_bs_origin'][0]) == NestedClassFixture.static_size
+
+
+def test_deserialization_default_value_zero(DefaultValueClassFixture):
+    assert DefaultValueClassFixture.deserialize(bytearray(b'\x00')).default_value == 0
+
+
+@pytest.mark.parametrize('decorator, endianness, cls, cls_params, struct_format, struct_params', test_params)
+def test_iter_buffers(decorator, endianness, cls, cls_params, struct_format, struct_params):
+    binary_struct = decorator(cls)(**cls_params)
+
+    assert b''.join(binary_struct.iter_buffers()) == bytes(binary_struct)
+
+
+def test_iter_buffers_zero_copy():
+    @binary_struct
+    class Blob:
+        size: le_uint32_t
+        kind: le_uint8_t
+        data: [le_uint8_t, 4096]
+        crc: le_uint32_t
+
+    blob = Blob(4096, 1, b'\xaa' * 4096, 5)
+    buffers = list(blob.iter_buffers())
+
+    assert [len(buf) for buf in buffers] == [5, 4096, 4]
+    assert buffers[1].obj is blob.data
+
+
+def test_iter_buffers_nested_and_dynamic():
+    @binary_struct
+    class Payload:
+        data: [le_uint8_t, 1024]
+
+    @binary_struct
+    class Message:
+        count: le_uint8_t
+        payloads: [Payload, 'count']
+        names: [cstring]
+
+    message = Message(2, [Payload(b'\x01'), Payload(b'\x02')], ['a', 'b'])
+
+    assert b''.join(message.iter_buffers()) == bytes(message)
+    assert [len(buf) for buf in message.iter_buffers()] == [1, 2048, 4]
+
+
+def test_iter_buffers_sendmsg():
+    @binary_struct
+    class Blob:
+        size: le_uint32_t
+        data: [le_uint8_t, 1024]
+
+    blob = Blob(1024, b'\x01' * 1024)
+    first, second = socket.socketpair()
+
+    with first, second:
+        first.sendmsg(blob.iter_buffers())
+
+        assert second.recv(2048) == bytes(blob)
+
+
+def test_iter_buffers_custom_bytes():
+    @binary_struct
+    class A:
+        a: le_uint8_t
+
+        def __bytes__(self):
+            return b'Hello' + self._bs_bytes()
+
+    assert b''.join(A(1).iter_buffers()) == b'Hello\x01'
+
+
+def test_iter_buffers_inherited_and_nested_custom_bytes():
+    @binary_struct
+    class A:
+        a: le_uint8_t
+
+        def __bytes__(self):
+            return b'Hello' + A._bs_bytes(self)
+
+    @binary_struct
+    class B(A):
+        b: le_uint8_t
+
+    @binary_struct
+    class C:
+        nested: A
+        c: le_uint8_t
+
+    assert b''.join(B(1, 2).iter_buffers()) == bytes(B(1, 2)) == b'Hello\x01\x02'
+    assert b''.join(C(A(1), 2).iter_buffers()) == bytes(C(A(1), 2)) == b'Hello\x01\x02'
+
+
+@pytest.mark.parametrize('decorator, endianness, cls, cls_params, struct_format, struct_params', test_params)
+def test_as_memoryview(decorator, endianness, cls, cls_params, struct_format, struct_params):
+    binary_struct = decorator(cls)(**cls_params)
+
+    assert binary_struct.as_memoryview() == bytes(binary_struct)
+    assert binary_struct.__buffer__(0) == bytes(binary_struct)
+
+
+def test_as_memoryview_deserialized_is_zero_copy(NestedClassFixture):
+    buf = bytearray(b'\xff' * 3 + bytes(NestedClassFixture(magic=5)))
+    nested = NestedClassFixture.deserialize(buf, 3)
+
+    memory = nested.as_memoryview()
+
+    assert memory.obj is buf
+    assert memory == bytes(nested)
+
+
+def test_as_memoryview_after_assignment(NestedClassFixture):
+    buf = bytearray(bytes(NestedClassFixture(magic=5)))
+    nested = NestedClassFixture.deserialize(buf)
+
+    nested.buffer.size = 6
+
+    assert nested.as_memoryview().obj is not buf
+    assert nested.as_memoryview() == bytes(NestedClassFixture([6], 5))
+
+
+def test_as_memoryview_doesnt_modify_the_struct(NestedClassFixture):
+    nested = NestedClassFixture(magic=5)
+    buffer = nested.buffer
+
+    memory = nested.as_memoryview()
+    buffer.size = 7
+
+    assert nested.buffer is buffer
+    assert memory == bytes(NestedClassFixture(magic=5))
+    assert nested.as_memoryview() == bytes(NestedClassFixture([7], 5))
+
+
+def test_as_memoryview_dynamic(DynamicClassFixture):
+    dynamic = DynamicClassFixture(1, range(3))
+
+    assert dynamic.as_memoryview() == b'\x01\x00\x01\x02'
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason='__buffer__ is used starting from python 3.12')
+def test_buffer_protocol(NestedClassFixture):
+    nested = NestedClassFixture(magic=5)
+
+    assert bytes(memoryview(nested)) == bytes(nested)
+
+
+@pytest.mark.parametrize('decorator, endianness, cls, cls_params, struct_format, struct_params', test_params)
+def test_deserialize_into(decorator, endianness, cls, cls_params, struct_format, struct_params):
+    new_cls = decorator(cls)
+    if new_cls.is_dynamic:
+        return
+
+    instance = new_cls()
+    returned = new_cls.deserialize_into(instance, struct.pack(f'{endianness}{struct_format}', *struct_params))
+
+    assert returned is instance
+    assert instance == new_cls(**cls_params)
+
+
+def test_deserialize_into_reuses_fields(NestedClassFixture):
+    records = [NestedClassFixture([i, range(i)], i) for i in range(5)]
+    buf = b''.join(bytes(record) for record in records)
+
+    instance = NestedClassFixture()
+    NestedClassFixture.deserialize_into(instance, buf)
+    buffer = instance.buffer
+
+    for index, record in enumerate(records):
+        NestedClassFixture.deserialize_into(instance, buf, index * NestedClassFixture.static_size)
+
+        assert instance == record
+        assert instance.buffer is buffer
+
+
+def test_deserialize_into_copies(NestedClassFixture):
+    buf = bytearray(bytes(NestedClassFixture(magic=5)))
+    instance = NestedClassFixture.deserialize_into(NestedClassFixture(), buf)
+
+    buf[-4:] = b'\x00' * 4
+
+    assert instance.magic == 5
+
+
+def test_deserialize_into_doesnt_modify_the_source(NestedClassFixture):
+    data = bytearray(b''.join(bytes(NestedClassFixture(magic=i)) for i in range(3)))
+    original = bytes(data)
+
+    instance = NestedClassFixture.deserialize(data)
+    for index in (1, 2):
+        NestedClassFixture.deserialize_into(instance, data, index * NestedClassFixture.static_size)
+
+    assert instance.magic == 2
+    assert data == original
+
+
+def test_deserialize_into_released_instance(NestedClassFixture):
+    data = bytearray(bytes(NestedClassFixture(magic=1)))
+    NestedClassFixture.release(NestedClassFixture.deserialize(data))
+
+    instance = NestedClassFixture.deserialize_into(NestedClassFixture.acquire(), bytes(NestedClassFixture(magic=2)))
+
+    assert instance.magic == 2
+    assert data == bytes(NestedClassFixture(magic=1))
+
+
+def test_deserialize_into_custom_bytes():
+    @binary_struct
+    class A:
+        x: le_uint8_t
+
+        def __bytes__(self):
+            return b'hdr' + A._bs_bytes(self)
+
+    instance = A.deserialize_into(A(), b'\x05')
+
+    assert instance.x == 5
+    assert bytes(instance) == b'hdr\x05'
+
+
+def test_invalid_deserialize_into_too_small(NestedClassFixture):
+    with pytest.raises(ValueError):
+        NestedClassFixture.deserialize_into(NestedClassFixture(), b'\x00' * 4)
+
+
+def test_invalid_deserialize_into_dynamic(DynamicClassFixture):
+    with pytest.raises(TypeError):
+        DynamicClassFixture.deserialize_into(DynamicClassFixture(), b'\x00' * 4)
+
+
+def test_acquire_and_release(NestedClassFixture, BufferClassFixture):
+    instance = NestedClassFixture.acquire()
+    NestedClassFixture.release(instance)
+
+    assert NestedClassFixture.acquire() is instance
+    assert NestedClassFixture.acquire() is not instance
+
+    with pytest.raises(TypeError):
+        BufferClassFixture.release(instance)
@@ -0,0 +1,144 @@
+import struct
+import pytest
+
+from binary_structs import binary_struct, binary_union, big_endian, le_uint8_t, le_uint16_t, le_uint32_t, \
+                           le_uint64_t
+from conftest import available_decorators
+
+
+@binary_struct
+class Pair:
+    low: le_uint16_t
+    high: le_uint16_t
+
+@binary_union
+class Payload:
+    raw: [le_uint8_t, 8]
+    words: [le_uint32_t, 2]
+    pair: Pair
+    value: le_uint64_t
+
+
+def test_valid_union_size():
+    assert Payload.static_size == 8
+    assert Payload().size_in_bytes == 8
+    assert bytes(Payload()) == b'\x00' * 8
+
+
+def test_valid_union_shared_memory():
+    payload = Payload(raw=range(8))
+
+    assert payload.words == [0x03020100, 0x07060504]
+    assert payload.pair == Pair(0x0100, 0x0302)
+    assert payload.value.value == 0x0706050403020100
+
+
+def test_valid_union_member_write_through():
+    payload = Payload()
+    words = payload.words
+
+    payload.pair.high = 0xbeef
+    payload.raw[0] = 1
+
+    assert words[0] == 0xbeef0001
+    assert bytes(payload) == struct.pack('<HHI', 1, 0xbeef, 0)
+
+
+def test_valid_union_assign_smaller_member():
+    payload = Payload(raw=b'\xff' * 8)
+    payload.pair = Pair(1, 2)
+
+    assert bytes(payload) == struct.pack('<HH', 1, 2) + b'\xff' * 4
+
+
+def test_valid_union_members_are_cached():
+    payload = Payload()
+
+    assert payload.pair is payload.pair
+    assert 'words' not in payload.__dict__
+
+
+def test_valid_union_positional_init():
+    assert Payload(b'\x01' * 8).value.value == 0x0101010101010101
+
+
+def test_invalid_union_init():
+    with pytest.raises(TypeError):
+        Payload(raw=b'', value=5)
+
+    with pytest.raises(TypeError):
+        Payload(nothing=5)
+
+
+def test_valid_union_default_value():
+    @binary_union
+    class A:
+        a: le_uint32_t
+        b: le_uint8_t = 5
+
+    assert bytes(A()) == b'\x05\x00\x00\x00'
+
+
+def test_invalid_union_dynamic_member():
+    with pytest.raises(TypeError):
+        @binary_union
+        class A:
+            a: [le_uint8_t]
+
+
+def test_valid_union_deserialize_view():
+    buf = bytearray(b'\xff' * 2 + b'\x00' * 8)
+    payload = Payload.deserialize(buf, 2)
+
+    payload.value = 0xdeadbeef
+
+    assert buf[2:] == struct.pack('<Q', 0xdeadbeef)
+    assert Payload.deserialize(bytes(buf), 2) == payload
+
+
+def test_valid_union_python_conversion():
+    payload = Payload(value=0x1122334455667788)
+
+    assert Payload.from_python(payload.to_python()) == payload
+    assert payload.to_python()['pair'] == {'low': 0x7788, 'high': 0x5566}
+
+
+@pytest.mark.parametrize('decorator, endianness', available_decorators)
+def test_valid_nested_union(decorator, endianness):
+    @binary_struct
+    class A:
+        tag: le_uint8_t
+        payload: Payload
+
+    cls = decorator(A)
+    a = cls(1, {'value': 7})
+
+    assert bytes(a) == struct.pack(f'{endianness}BQ', 1, 7)
+    assert cls.deserialize(bytes(a)) == a
+    assert cls.offsets['payload.pair.high'][0] == 3
+
+
+def test_valid_nested_union_write_through():
+    @binary_struct
+    class A:
+        tag: le_uint8_t
+        payload: Payload
+
+    buf = bytearray(9)
+    a = A.view(buf)
+    a.payload = Payload(value=9)
+
+    assert buf == b'\x00' + struct.pack('<Q', 9)
+
+
+def test_valid_union_endianness():
+    payload = big_endian(Payload)(value=1)
+
+    assert bytes(payload) == struct.pack('>Q', 1)
+    assert payload.pair.high.value == 0
+
+
+def test_valid_union_peek():
+    buf = bytes(Payload(value=0x1122334455667788))
+
+    assert Payload.peek(buf, 'pair.high') == 0x5566
@@ -0,0 +1,99 @@
+import mmap
+import pytest
+
+from binary_structs import binary_struct, bits, RecordFile
+from conftest import BufferClass, NestedClass, DynamicClass
+
+
+@binary_struct
+class StructArrayClass:
+    items: [BufferClass, 3]
+    flags: bits(3)
+    kind: bits(5)
+
+
+def test_valid_view_nested_fields():
+    buf = bytearray(bytes(NestedClass(BufferClass(3, range(3)), 9)))
+    view = NestedClass.view(buf)
+
+    view.magic = 5
+    view.buffer.size = 7
+    view.buffer.buf[1:3] = [10, 11]
+
+    assert NestedClass.deserialize(bytes(buf)) == NestedClass(BufferClass(7, [0, 10, 11]), 5)
+
+
+def test_valid_view_differs_from_deserialize():
+    buf = bytearray(bytes(NestedClass(BufferClass(3, range(3)), 9)))
+
+    deserialized = NestedClass.deserialize(buf)
+    deserialized.magic = 5
+    deserialized.buffer.size = 7
+
+    assert buf == bytes(NestedClass(BufferClass(3, range(3)), 9))
+
+    view = NestedClass.view(buf)
+    view.magic = 5
+    view.buffer.size = 7
+
+    assert buf == bytes(NestedClass(BufferClass(7, range(3)), 5))
+
+
+def test_valid_view_nested_struct_assignment():
+    buf = bytearray(bytes(NestedClass(BufferClass(3, range(3)), 9)))
+    view = NestedClass.view(buf)
+    buffer = view.buffer
+
+    view.buffer = BufferClass(1, [1])
+
+    assert buffer.size == 1
+    assert NestedClass.deserialize(bytes(buf)) == NestedClass(BufferClass(1, [1]), 9)
+
+
+def test_valid_view_struct_array_slice():
+    buf = bytearray(bytes(StructArrayClass()))
+    view = StructArrayClass.view(buf)
+    first = view.items[0]
+
+    view.items[0:2] = [BufferClass(4), BufferClass(5)]
+    view.items[2].buf[0] = 6
+    view.kind = 9
+
+    assert first.size == 4
+    assert StructArrayClass.deserialize(bytes(buf)).items == [BufferClass(4), BufferClass(5), BufferClass(0, [6])]
+    assert StructArrayClass.deserialize(bytes(buf)).kind == 9
+
+
+def test_invalid_struct_array_slice_size():
+    instance = StructArrayClass()
+
+    with pytest.raises(ValueError):
+        instance.items[0:2] = [BufferClass(4)]
+
+
+def test_valid_view_dynamic():
+    buf = bytearray(bytes(DynamicClass(1, [1, 2, 3])))
+    view = DynamicClass.view(buf)
+
+    view.buf[2] = 9
+
+    assert buf == bytearray(b'\x01\x01\x02\x09')
+
+
+def test_valid_view_mmap(tmp_path):
+    path = tmp_path / 'records.bin'
+    path.write_bytes(bytes(NestedClass()) * 4)
+
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as memory:
+        view = NestedClass.view(memory, 2 * NestedClass.static_size)
+        view.magic = 1234
+        del view
+
+    with RecordFile(NestedClass, path) as record_file:
+        assert [record.magic for record in record_file] == [0, 0, 1234, 0]
+
+
+@pytest.mark.parametrize('buf', [bytes(NestedClass()), memoryview(bytes(NestedClass()))])
+def test_invalid_view_read_only(buf):
+    with pytest.raises(TypeError):
+        NestedClass.view(buf)
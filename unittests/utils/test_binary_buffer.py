@@ -1,6 +1,7 @@
 import pytest
 
 from os import urandom
+from array import array
 
 from binary_structs.utils import *
 
@@ -59,6 +60,71 @@ def test_valid_slicing_empty():
     assert sub_buf == []
 
 
+def test_valid_slicing_shares_memory():
+    bin_buf = new_binary_buffer(uint32_t, 10)(*range(10))
+    sub_buf = bin_buf[2:5]
+
+    assert isinstance(sub_buf, new_binary_buffer(uint32_t, 3))
+    assert sub_buf == [2, 3, 4]
+
+    sub_buf[0] = 0xff
+    assert bin_buf[2] == 0xff
+
+
+def test_valid_slicing_with_step():
+    bin_buf = new_binary_buffer(uint8_t, 10)(*range(10))
+    sub_buf = bin_buf[::3]
+
+    assert sub_buf == [0, 3, 6, 9]
+
+    sub_buf[0] = 0xff
+    assert bin_buf[0] == 0
+
+
+@pytest.mark.parametrize('value', [b'\x01\x02\x03', bytearray(b'\x01\x02\x03'), memoryview(b'\x01\x02\x03')])
+def test_valid_slice_assignment_bytes_like(value):
+    bin_buf = new_binary_buffer(uint8_t, 5)()
+    bin_buf[1:4] = value
+
+    assert bytes(bin_buf) == b'\x00\x01\x02\x03\x00'
+
+
+def test_valid_slice_assignment_elements():
+    bin_buf = new_binary_buffer(be_uint16_t, 4)()
+    bin_buf[1:3] = [0x1234, 0x5678]
+
+    assert bytes(bin_buf) == b'\x00\x00\x12\x34\x56\x78\x00\x00'
+
+    # Bytes are elements when their layout is different
+    bin_buf[0:2] = b'\x01\x02'
+    assert bin_buf == [1, 2, 0x5678, 0]
+
+
+def test_valid_slice_assignment_same_buffer_type():
+    src = new_binary_buffer(be_uint16_t, 2)(0x1234, 0x5678)
+    bin_buf = new_binary_buffer(be_uint16_t, 4)()
+
+    bin_buf[2:] = src
+    assert bin_buf == [0, 0, 0x1234, 0x5678]
+
+
+def test_invalid_slice_assignment_size_mismatch():
+    bin_buf = new_binary_buffer(uint8_t, 5)()
+
+    with pytest.raises(ValueError):
+        bin_buf[1:4] = b'\x01'
+
+
+def test_valid_init_bytes_like():
+    assert bytes(new_binary_buffer(uint8_t, 5)(b'abc')) == b'abc\x00\x00'
+    assert new_binary_buffer(uint32_t, 2)(array('I', [7, 8])) == [7, 8]
+
+
+def test_invalid_init_bytes_like_too_big():
+    with pytest.raises(IndexError):
+        new_binary_buffer(uint8_t, 2)(b'abc')
+
+
 def test_valid_serialization():
     a = new_binary_buffer(uint8_t, 10)(*[0x41] * 10)
 
@@ -114,6 +180,13 @@ def test_valid_deserialization_non_empty():
     assert a == [0xff] * 4
 
 
+def test_valid_deserialization_read_only():
+    buf = b'\x01\x02\x03\x04'
+    a = new_binary_buffer(uint8_t, 2).deserialize(buf, 2)
+
+    assert a == [3, 4]
+
+
 def test_valid_deserialization_buffer_too_big():
     a = new_binary_buffer(uint8_t, 8).deserialize(bytearray(b'\xde' * 10))
 
@@ -147,3 +220,82 @@ def test_valid_deserialize_ignore_suffix(underlying_type, buf):
     arr = new_binary_buffer(underlying_type, size).deserialize(bytearray(buf))
 
     assert bytes(arr) == buf[:-1]
+
+
+# Python conversion
+@pytest.mark.parametrize('underlying_type', binary_fields)
+def test_valid_to_python(underlying_type):
+    buf = new_binary_buffer(underlying_type, 5)(*range(5))
+
+    if underlying_type in (le_uint8_t, be_uint8_t):
+        assert buf.to_python() == bytes(range(5))
+
+    else:
+        assert buf.to_python() == list(range(5))
+
+
+@pytest.mark.parametrize('underlying_type', binary_fields)
+def test_valid_from_python(underlying_type):
+    buf_type = new_binary_buffer(underlying_type, 5)
+
+    assert buf_type.from_python(range(3)) == [0, 1, 2, 0, 0]
+
+
+def test_valid_typed_buffer_from_python():
+    buf = new_typed_buffer(uint8_t).from_python(b'abc')
+
+    assert isinstance(buf, new_binary_buffer(uint8_t, 3))
+    assert buf.to_python() == b'abc'
+
+
+# Bitwise operations
+@pytest.mark.parametrize('underlying_type', binary_fields)
+def test_valid_bitwise_inplace_int(underlying_type):
+    buf = new_binary_buffer(underlying_type, 5)(*range(5))
+    original_buf = buf
+
+    buf ^= 0x7f
+    assert buf is original_buf
+    assert buf == [x ^ 0x7f for x in range(5)]
+
+    buf &= 0x0f
+    assert buf == [(x ^ 0x7f) & 0x0f for x in range(5)]
+
+    buf |= 0x30
+    assert buf == [((x ^ 0x7f) & 0x0f) | 0x30 for x in range(5)]
+
+
+def test_valid_bitwise_inplace_buffer():
+    buf = new_binary_buffer(uint8_t, 4)(*b'\x0f\xf0\xff\x00')
+    buf ^= b'\xff\xff\x0f\x00'
+
+    assert bytes(buf) == b'\xf0\x0f\xf0\x00'
+
+    buf &= new_binary_buffer(uint8_t, 4)(*b'\xff\x00\xff\x00')
+    assert bytes(buf) == b'\xf0\x00\xf0\x00'
+
+
+def test_valid_bitwise_large_buffer():
+    payload = urandom(64 * 1024)
+    mask = urandom(64 * 1024)
+
+    buf = new_binary_buffer(uint8_t, len(payload)).deserialize(bytearray(payload))
+    buf ^= mask
+
+    assert bytes(buf) == bytes(a ^ b for a, b in zip(payload, mask))
+
+
+def test_valid_bitwise_not_inplace():
+    buf = new_binary_buffer(uint16_t, 2)(0x00ff, 0x1234)
+    result = ~buf
+
+    assert result == [0xff00, 0xedcb]
+    assert buf == [0x00ff, 0x1234]
+    assert (buf ^ 0xffff) == result
+
+
+def test_invalid_bitwise_size_mismatch():
+    buf = new_binary_buffer(uint8_t, 4)()
+
+    with pytest.raises(ValueError):
+        buf ^= b'\xff'
@@ -103,6 +103,13 @@ def test_eq_operator(underlying_type, default_value, size, buf):
     assert a == default_value
     assert a != default_value + 1
 
+@pytest.mark.parametrize('underlying_type, default_value, size, buf', test_buffer)
+def test_valid_python_conversion(underlying_type, default_value, size, buf):
+    a = underlying_type.from_python(default_value)
+
+    assert isinstance(a, underlying_type)
+    assert a.to_python() == default_value
+
 # Bitwise tests
 bw_op = ['__and__', '__xor__', '__or__']
 two_operands_list = [(kind1, kind2, op) for kind1 in binary_fields for kind2 in binary_fields for op in bw_op]
@@ -115,24 +122,55 @@ def test_bitwise_not(field_type):
     buf = _get_random_bytes_buffer(field_type.static_size, field_type.static_size)
     num = field_type.deserialize(buf)
 
-    assert ~num == bytes(~x & 0xff for x in buf)
+    assert isinstance(~num, field_type)
+    assert (~num).memory == bytes(~x & 0xff for x in buf)
 
 @pytest.mark.parametrize('type1, type2, operand', two_operands_list)
 def test_bitwise_operator2(type1, type2, operand):
-    num1 = type1()
-    num2 = type2()
+    num1 = type1.deserialize(_get_random_bytes_buffer(type1.static_size, type1.static_size))
+    num2 = type2.deserialize(_get_random_bytes_buffer(type2.static_size, type2.static_size))
 
-    bigger_num_size = max(num1.size_in_bytes, num2.size_in_bytes)
-    buf1 = _get_random_bytes_buffer(num1.size_in_bytes, bigger_num_size)
-    buf2 = _get_random_bytes_buffer(num2.size_in_bytes, bigger_num_size)
+    result = getattr(num1, operand)(num2)
+    reflected_result = getattr(num2, f'__r{operand[2:]}')(num1)
 
-    num1 = type1.deserialize(buf1[:num1.size_in_bytes])
-    num2 = type2.deserialize(buf2[:num2.size_in_bytes])
+    assert isinstance(result, type1)
+    assert isinstance(reflected_result, type2)
+    assert result == type1(getattr(int, operand)(num1.value, num2.value))
+    assert reflected_result == type2(getattr(int, operand)(num1.value, num2.value))
 
-    bitwised_buf = bytes(getattr(int, operand)(a, b) for (a, b) in zip(buf1, buf2))
+@pytest.mark.parametrize('field_type', binary_fields)
+def test_bitwise_operator_int(field_type):
+    num = field_type(0x55)
+
+    assert num & 0x0f == 0x05
+    assert num | 0x0f == 0x5f
+    assert num ^ 0xff == field_type(0xaa)
+    assert isinstance(0xff ^ num, field_type)
 
-    assert getattr(type1, operand)(num1, num2) == getattr(type2, operand)(num2, num1)
-    assert bitwised_buf == getattr(type1, operand)(num1, num2)
+# Arithmetic tests
+@pytest.mark.parametrize('field_type', binary_fields)
+def test_arithmetic_operators(field_type):
+    num = field_type(6)
+
+    assert num + 3 == 9
+    assert num - 4 == 2
+    assert 10 - num == 4
+    assert num * num == 36
+    assert num // 4 == 1
+    assert num % 4 == 2
+    assert num << 2 == 24
+    assert num >> 1 == 3
+    assert isinstance(num + 1, field_type)
+
+@pytest.mark.parametrize('field_type', binary_fields)
+def test_arithmetic_operators_overflow(field_type):
+    max_value = (1 << (field_type.static_size * 8 - int(field_type.signed))) - 1
+
+    assert field_type(max_value) + 1 == (-max_value - 1 if field_type.signed else 0)
+
+def test_invalid_arithmetic_operators_type():
+    with pytest.raises(TypeError):
+        le_uint8_t(5) + '5'
 
 # Compatible init test
 incompatible_type = [(type1, type2) for type1 in binary_fields for type2 in binary_fields if type1 != type2]
@@ -0,0 +1,151 @@
+import pytest
+
+from binary_structs import binary_struct, big_endian
+from binary_structs.utils import *
+
+
+# char[N]
+def test_valid_fixed_string_build():
+    name = char[8]('core')
+
+    assert bytes(name) == b'core' + b'\x00' * 4
+    assert name.string == 'core'
+    assert name == 'core'
+    assert name == b'core'
+    assert char[8].static_size == 8
+
+
+def test_valid_fixed_string_full_width():
+    assert char[4]('abcd').string == 'abcd'
+
+
+def test_invalid_fixed_string_too_long():
+    with pytest.raises(ValueError):
+        char[4]('abcde')
+
+
+def test_valid_fixed_string_type_is_cached():
+    assert char[8] is char[8]
+
+
+def test_valid_fixed_string_view():
+    buf = bytearray(b'ab\x00\x00')
+    name = char[4].deserialize(buf)
+
+    assert name.string == 'ab'
+
+    buf[2] = ord('c')
+
+    assert name.string == 'abc'
+
+
+def test_valid_fixed_string_python_conversion():
+    name = char[8].from_python('של')
+
+    assert name.to_python() == 'של'
+
+
+# cstring
+def test_valid_cstring_build():
+    string = cstring('hello')
+
+    assert bytes(string) == b'hello\x00'
+    assert string.size_in_bytes == 6
+    assert string == 'hello'
+    assert string == b'hello'
+
+
+def test_invalid_cstring_null_byte():
+    with pytest.raises(ValueError):
+        cstring(b'a\x00b')
+
+
+@pytest.mark.parametrize('buf_type', [bytes, bytearray])
+def test_valid_cstring_deserialize(buf_type):
+    buf = buf_type(b'\xffhello\x00world\x00')
+
+    string = cstring.deserialize(buf, 1)
+
+    assert string.raw == b'hello'
+    assert string.size_in_bytes == 6
+    assert cstring.deserialize(buf, 7) == 'world'
+
+
+def test_valid_cstring_deserialize_memoryview():
+    assert cstring.deserialize(memoryview(b'ab\x00')) == 'ab'
+
+
+@pytest.mark.parametrize('length', [0, 63, 64, 65, 1000])
+def test_valid_cstring_deserialize_memoryview_long(length):
+    buf = memoryview(b'\xff' + b'a' * length + b'\x00' + b'b' * 5000)
+
+    assert cstring.deserialize(buf, 1).raw == b'a' * length
+
+
+def test_invalid_cstring_deserialize_memoryview_no_terminator():
+    with pytest.raises(ValueError):
+        cstring.deserialize(memoryview(b'a' * 1000))
+
+
+def test_valid_fixed_string_deserialize_read_only():
+    assert char[4].deserialize(b'\xffab\x00\x00', 1) == 'ab'
+    assert char[4].deserialize(memoryview(b'abcd')) == 'abcd'
+
+
+def test_invalid_cstring_deserialize_no_terminator():
+    with pytest.raises(ValueError):
+        cstring.deserialize(b'hello')
+
+
+def test_valid_cstring_lazy_decode():
+    string = cstring.deserialize(b'hello\x00')
+
+    assert string._string is None
+    assert str(string) == 'hello'
+    assert string.string is string.string
+
+
+# binary structs
+@binary_struct
+class LogRecord:
+    level: uint8_t
+    name: char[8]
+    message: cstring
+    line: le_uint16_t
+
+
+def test_valid_string_fields_struct():
+    record = LogRecord(1, 'core', 'started', 7)
+
+    assert bytes(record) == b'\x01core\x00\x00\x00\x00started\x00\x07\x00'
+    assert record.size_in_bytes == 19
+    assert LogRecord.deserialize(bytes(record)) == record
+    assert list(LogRecord.offsets) == ['level', 'name', 'message']
+
+
+def test_valid_string_fields_peek_read_only():
+    assert LogRecord.peek(bytes(LogRecord(1, 'core', 'started', 7)), 'name') == 'core'
+
+
+def test_valid_string_fields_python_conversion():
+    record = LogRecord(1, 'core', 'started', 7)
+
+    assert record.to_python() == {'level': 1, 'name': 'core', 'message': 'started', 'line': 7}
+    assert LogRecord.from_python(record.to_python()) == record
+
+
+def test_valid_string_fields_assignment():
+    buf = bytearray(bytes(LogRecord(1, 'core', 'started', 7)))
+    record = LogRecord.view(buf)
+
+    record.name = 'io'
+    record.message = 'stopped'
+
+    assert buf[1:9] == b'io' + b'\x00' * 6
+    assert record.message == 'stopped'
+
+
+def test_valid_string_fields_endianness():
+    record = big_endian(LogRecord)(1, 'core', 'started', 7)
+
+    assert bytes(record) == b'\x01core\x00\x00\x00\x00started\x00\x00\x07'
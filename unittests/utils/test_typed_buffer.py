@@ -20,3 +20,16 @@ def test_valid_typed_buffer_deserialize(field_type, buffer):
 
     assert bytes(typed_buf_instance) == buffer
     assert isinstance(typed_buf_instance, new_binary_buffer(field_type, len(buffer) // field_type.static_size))
+
+
+def test_valid_typed_buffer_deserialize_read_only():
+    typed_buf_instance = new_typed_buffer(uint16_t).deserialize(b'\x01\x00\x02\x00')
+
+    assert list(typed_buf_instance) == [1, 2]
+
+
+def test_valid_typed_buffer_build_bytes_like():
+    typed_buf_instance = new_typed_buffer(uint8_t)(b'abcd')
+
+    assert isinstance(typed_buf_instance, new_binary_buffer(uint8_t, 4))
+    assert bytes(typed_buf_instance) == b'abcd'
@@ -0,0 +1,122 @@
+import random
+import pytest
+
+from binary_structs import binary_struct, big_endian
+from binary_structs.utils import *
+
+
+varint_values = [0, 1, 127, 128, 300, 624485, 2 ** 63, 2 ** 120 + 5]
+svarint_values = [0, 1, -1, 63, -64, 64, -65, -123456, 2 ** 70, -2 ** 70]
+
+
+@pytest.mark.parametrize('value, encoded', [(0, b'\x00'), (127, b'\x7f'), (300, b'\xac\x02'),
+                                            (624485, b'\xe5\x8e\x26')])
+def test_valid_varint_encoding(value, encoded):
+    assert bytes(varint(value)) == encoded
+    assert varint.deserialize(encoded) == value
+    assert varint(value).size_in_bytes == len(encoded)
+
+
+@pytest.mark.parametrize('value, encoded', [(2, b'\x02'), (-2, b'\x7e'), (127, b'\xff\x00'),
+                                            (-123456, b'\xc0\xbb\x78')])
+def test_valid_svarint_encoding(value, encoded):
+    assert bytes(svarint(value)) == encoded
+    assert svarint.deserialize(encoded) == value
+
+
+@pytest.mark.parametrize('value', varint_values)
+def test_valid_varint_round_trip(value):
+    assert varint.deserialize(bytes(varint(value))).value == value
+
+
+@pytest.mark.parametrize('value', svarint_values)
+def test_valid_svarint_round_trip(value):
+    assert svarint.deserialize(bytes(svarint(value))).value == value
+
+
+def test_invalid_varint_negative():
+    with pytest.raises(ValueError):
+        varint(-1)
+
+
+def test_invalid_varint_unterminated():
+    with pytest.raises(ValueError):
+        varint.deserialize(b'\x80\x80')
+
+
+def test_valid_varint_deserialize_offset():
+    value = varint.deserialize(bytearray(b'\xff\xac\x02'), 1)
+
+    assert value == 300
+    assert value.size_in_bytes == 2
+
+
+def test_valid_varint_size_changes_with_value():
+    value = varint(1)
+    value.value = 300
+
+    assert value.size_in_bytes == 2
+
+
+def test_valid_decode_varints():
+    values = [random.getrandbits(random.randint(1, 140)) for _ in range(1000)]
+    buf = b''.join(encode_varint(value) for value in values)
+
+    assert decode_varints(buf) == (values, len(buf))
+
+
+def test_valid_decode_svarints():
+    values = [random.randint(-2 ** 80, 2 ** 80) for _ in range(1000)]
+    buf = b''.join(encode_varint(value, signed=True) for value in values)
+
+    assert decode_varints(buf, signed=True) == (values, len(buf))
+
+
+def test_valid_decode_varints_count():
+    buf = b'\xff' + b'\x01\xac\x02\x03' + b'\xff\xff'
+
+    assert decode_varints(buf, 1, count=2) == ([1, 300], 4)
+
+
+def test_invalid_decode_varints():
+    with pytest.raises(ValueError):
+        decode_varints(b'\x01\x80')
+
+    with pytest.raises(ValueError):
+        decode_varints(b'\x01', count=2)
+
+
+# binary structs
+@binary_struct
+class Message:
+    count: varint
+    ids: [varint, 'count']
+    delta: svarint
+    flags: uint8_t
+
+
+def test_valid_varint_struct():
+    message = Message(3, [1, 300, 5], -2, 9)
+
+    assert bytes(message) == b'\x03\x01\xac\x02\x05\x7e\x09'
+    assert message.size_in_bytes == 7
+    assert Message.is_dynamic
+    assert Message.deserialize(bytes(message)) == message
+
+
+def test_valid_varint_struct_python_conversion():
+    message = Message(3, [1, 300, 5], -2, 9)
+
+    assert message.to_python() == {'count': 3, 'ids': [1, 300, 5], 'delta': -2, 'flags': 9}
+    assert Message.from_python(message.to_python()) == message
+
+
+def test_valid_varint_struct_assignment():
+    message = Message()
+    message.count = 300
+
+    assert bytes(message) == b'\xac\x02\x00\x00'
+
+
+def test_valid_varint_struct_endianness():
+    assert bytes(big_endian(Message)(1, [2], -1, 3)) == b'\x01\x02\x7f\x03'